@@ -0,0 +1,51 @@
+"""add award full-text search
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import JSON, TSVECTOR
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+AWARD_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(description, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(recipient_name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(awarding_agency, '')), 'C')"
+)
+
+def upgrade():
+    # Generated column keeps the search document in sync with every insert/update
+    op.add_column(
+        'awards',
+        sa.Column('search_vector', TSVECTOR, sa.Computed(AWARD_SEARCH_DOCUMENT, persisted=True), nullable=True)
+    )
+    op.create_index('ix_awards_search_vector', 'awards', ['search_vector'], unique=False, postgresql_using='gin')
+
+    # Award search windows covered by local ingestion
+    op.create_table(
+        'award_ingestion_windows',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.DateTime(), nullable=True),
+        sa.Column('end_date', sa.DateTime(), nullable=True),
+        sa.Column('min_amount', sa.Float(), nullable=True),
+        sa.Column('award_types', JSON, nullable=True),
+        sa.Column('award_count', sa.Integer(), nullable=True),
+        sa.Column('completed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_award_ingestion_windows_id'), 'award_ingestion_windows', ['id'], unique=False)
+    op.create_index(op.f('ix_award_ingestion_windows_start_date'), 'award_ingestion_windows', ['start_date'], unique=False)
+    op.create_index(op.f('ix_award_ingestion_windows_end_date'), 'award_ingestion_windows', ['end_date'], unique=False)
+
+def downgrade():
+    op.drop_table('award_ingestion_windows')
+    op.drop_index('ix_awards_search_vector', table_name='awards')
+    op.drop_column('awards', 'search_vector')
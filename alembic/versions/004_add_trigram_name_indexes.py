@@ -0,0 +1,38 @@
+"""add trigram name indexes
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Trigram GIN indexes serve both ILIKE '%name%' and similarity (%) lookups
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_subawards_recipient_name_trgm',
+        'subawards',
+        ['recipient_name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'recipient_name': 'gin_trgm_ops'}
+    )
+    op.create_index(
+        'ix_company_filings_company_name_trgm',
+        'company_filings',
+        ['company_name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'company_name': 'gin_trgm_ops'}
+    )
+
+def downgrade():
+    op.drop_index('ix_company_filings_company_name_trgm', table_name='company_filings')
+    op.drop_index('ix_subawards_recipient_name_trgm', table_name='subawards')
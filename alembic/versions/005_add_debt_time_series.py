@@ -0,0 +1,55 @@
+"""add debt time series tables
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # Daily Debt to the Penny records
+    op.create_table(
+        'debt_records',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('record_date', sa.DateTime(), nullable=True),
+        sa.Column('total_debt', sa.Float(), nullable=True),
+        sa.Column('debt_held_public', sa.Float(), nullable=True),
+        sa.Column('intragov_holdings', sa.Float(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_debt_records_id'), 'debt_records', ['id'], unique=False)
+    op.create_index(op.f('ix_debt_records_record_date'), 'debt_records', ['record_date'], unique=True)
+
+    # Downsampled rollups
+    op.create_table(
+        'debt_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('resolution', sa.String(), nullable=True),
+        sa.Column('period_start', sa.DateTime(), nullable=True),
+        sa.Column('period_end', sa.DateTime(), nullable=True),
+        sa.Column('total_debt', sa.Float(), nullable=True),
+        sa.Column('debt_held_public', sa.Float(), nullable=True),
+        sa.Column('intragov_holdings', sa.Float(), nullable=True),
+        sa.Column('avg_total_debt', sa.Float(), nullable=True),
+        sa.Column('min_total_debt', sa.Float(), nullable=True),
+        sa.Column('max_total_debt', sa.Float(), nullable=True),
+        sa.Column('record_count', sa.Integer(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('resolution', 'period_start', name='uq_debt_rollups_resolution_period')
+    )
+    op.create_index(op.f('ix_debt_rollups_id'), 'debt_rollups', ['id'], unique=False)
+
+def downgrade():
+    op.drop_table('debt_rollups')
+    op.drop_index(op.f('ix_debt_records_record_date'), table_name='debt_records')
+    op.drop_index(op.f('ix_debt_records_id'), table_name='debt_records')
+    op.drop_table('debt_records')
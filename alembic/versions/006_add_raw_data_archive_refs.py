@@ -0,0 +1,26 @@
+"""add raw data archive pointers
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+ARCHIVED_TABLES = ['awards', 'subawards', 'company_filings', 'company_financials']
+
+def upgrade():
+    # Pointer to the archived payload once raw_data has been moved to cold storage
+    for table in ARCHIVED_TABLES:
+        op.add_column(table, sa.Column('raw_data_ref', sa.String(), nullable=True))
+
+def downgrade():
+    for table in ARCHIVED_TABLES:
+        op.drop_column(table, 'raw_data_ref')
@@ -0,0 +1,82 @@
+"""add dimension tables
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+# dimension table -> key column
+DIMENSIONS = {
+    'dim_agencies': 'name',
+    'dim_recipients': 'name',
+    'dim_locations': 'state_code',
+    'dim_award_types': 'code',
+}
+
+# (fact table, key column, source column, dimension table)
+FACT_KEYS = [
+    ('awards', 'awarding_agency_id', 'awarding_agency', 'dim_agencies'),
+    ('awards', 'funding_agency_id', 'funding_agency', 'dim_agencies'),
+    ('awards', 'recipient_id', 'recipient_name', 'dim_recipients'),
+    ('awards', 'award_type_id', 'award_type', 'dim_award_types'),
+    ('awards', 'recipient_state_id', 'recipient_state', 'dim_locations'),
+    ('subawards', 'recipient_id', 'recipient_name', 'dim_recipients'),
+    ('contract_opportunities', 'agency_id', 'agency', 'dim_agencies'),
+]
+
+INDEXED_KEYS = {
+    ('awards', 'awarding_agency_id'),
+    ('awards', 'recipient_id'),
+    ('awards', 'recipient_state_id'),
+    ('subawards', 'recipient_id'),
+    ('contract_opportunities', 'agency_id'),
+}
+
+def upgrade():
+    for table, key in DIMENSIONS.items():
+        op.create_table(
+            table,
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column(key, sa.String(), nullable=False),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint(key)
+        )
+
+    for fact, column, source, dimension in FACT_KEYS:
+        key = DIMENSIONS[dimension]
+        op.add_column(fact, sa.Column(column, sa.Integer(), nullable=True))
+        op.create_foreign_key(f'fk_{fact}_{column}', fact, dimension, [column], ['id'])
+
+        # Backfill dimension values and keys from the existing free-text columns
+        op.execute(f"""
+            INSERT INTO {dimension} ({key})
+            SELECT DISTINCT {source} FROM {fact} WHERE {source} IS NOT NULL AND {source} <> ''
+            ON CONFLICT ({key}) DO NOTHING
+        """)
+        op.execute(f"""
+            UPDATE {fact} SET {column} = d.id
+            FROM {dimension} d
+            WHERE d.{key} = {fact}.{source}
+        """)
+
+        if (fact, column) in INDEXED_KEYS:
+            op.create_index(f'ix_{fact}_{column}', fact, [column], unique=False)
+
+def downgrade():
+    for fact, column, _, _ in reversed(FACT_KEYS):
+        if (fact, column) in INDEXED_KEYS:
+            op.drop_index(f'ix_{fact}_{column}', table_name=fact)
+        op.drop_constraint(f'fk_{fact}_{column}', fact, type_='foreignkey')
+        op.drop_column(fact, column)
+
+    for table in reversed(list(DIMENSIONS)):
+        op.drop_table(table)
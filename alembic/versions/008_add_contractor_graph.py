@@ -0,0 +1,69 @@
+"""add contractor graph
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-19 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+# Matches app.services.storage.contractor_graph.recipient_key for rows without a UEI
+NAME_KEY = "'name:' || upper(regexp_replace(btrim(recipient_name), '\\s+', ' ', 'g'))"
+
+def upgrade():
+    for table in ('awards', 'subawards'):
+        op.add_column(table, sa.Column('recipient_key', sa.String(), nullable=True))
+        op.execute(
+            f"UPDATE {table} SET recipient_key = {NAME_KEY} "
+            "WHERE recipient_name IS NOT NULL AND btrim(recipient_name) <> ''"
+        )
+        op.create_index(op.f(f'ix_{table}_recipient_key'), table, ['recipient_key'], unique=False)
+
+    op.create_table(
+        'contractor_edges',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_key', sa.String(), nullable=False),
+        sa.Column('target_key', sa.String(), nullable=False),
+        sa.Column('source_name', sa.String(), nullable=True),
+        sa.Column('target_name', sa.String(), nullable=True),
+        sa.Column('total_amount', sa.Float(), nullable=True),
+        sa.Column('award_count', sa.Integer(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source_key', 'target_key', name='uq_contractor_edges_source_target')
+    )
+    op.create_index(op.f('ix_contractor_edges_id'), 'contractor_edges', ['id'], unique=False)
+    op.create_index('ix_contractor_edges_source_amount', 'contractor_edges', ['source_key', 'total_amount'], unique=False)
+    op.create_index('ix_contractor_edges_target_amount', 'contractor_edges', ['target_key', 'total_amount'], unique=False)
+
+    # Initial edges from existing subawards
+    op.execute(
+        """
+        INSERT INTO contractor_edges
+            (source_key, target_key, source_name, target_name, total_amount, award_count, updated_at)
+        SELECT a.recipient_key, s.recipient_key, max(a.recipient_name), max(s.recipient_name),
+               coalesce(sum(s.amount), 0), count(*), now()
+        FROM subawards s
+        JOIN awards a ON a.award_id = s.prime_award_id
+        WHERE a.recipient_key IS NOT NULL
+          AND s.recipient_key IS NOT NULL
+          AND a.recipient_key <> s.recipient_key
+        GROUP BY a.recipient_key, s.recipient_key
+        """
+    )
+
+def downgrade():
+    op.drop_index('ix_contractor_edges_target_amount', table_name='contractor_edges')
+    op.drop_index('ix_contractor_edges_source_amount', table_name='contractor_edges')
+    op.drop_index(op.f('ix_contractor_edges_id'), table_name='contractor_edges')
+    op.drop_table('contractor_edges')
+    for table in ('subawards', 'awards'):
+        op.drop_index(op.f(f'ix_{table}_recipient_key'), table_name=table)
+        op.drop_column(table, 'recipient_key')
@@ -0,0 +1,39 @@
+"""add stored award details
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    # USAspending's award key, used by its detail endpoint; search rows carry it as generated_internal_id.
+    # Rows whose raw_data was already archived (006) only have raw_data_ref and are filled by
+    # scripts/backfill_award_keys.py; until then their detail lookups fall back to the award ID.
+    op.add_column('awards', sa.Column('generated_unique_award_id', sa.String(), nullable=True))
+    op.execute(
+        "UPDATE awards SET generated_unique_award_id = raw_data->>'generated_internal_id' "
+        "WHERE raw_data IS NOT NULL"
+    )
+    op.create_index(
+        op.f('ix_awards_generated_unique_award_id'), 'awards', ['generated_unique_award_id'], unique=False
+    )
+
+    # Detail payload, kept apart from the search-row payload in raw_data. It is not archived:
+    # payloads past AWARD_DETAIL_MAX_AGE are refetched anyway, so the archive job clears them.
+    op.add_column('awards', sa.Column('detail_data', sa.JSON(), nullable=True))
+    op.add_column('awards', sa.Column('detail_fetched_at', sa.DateTime(), nullable=True))
+
+def downgrade():
+    op.drop_column('awards', 'detail_fetched_at')
+    op.drop_column('awards', 'detail_data')
+    op.drop_index(op.f('ix_awards_generated_unique_award_id'), table_name='awards')
+    op.drop_column('awards', 'generated_unique_award_id')
@@ -1,72 +1,91 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.ext.asyncio import AsyncSession
+from fastapi import APIRouter, HTTPException, Query
 
-from app.core.database import get_db
-from app.services.analysis.patterns import PatternAnalyzer
-from app.services.analysis.anomalies import AnomalyDetector
+from app.services.analysis.engine import AnalyticsEngine
 
 router = APIRouter()
 
+ANALYTICS_NOT_EXPORTED = "Analytics store is not available yet; run scripts/export_parquet.py"
+
 @router.get("/spending-trends/", response_model=dict)
 async def get_spending_trends(
     fiscal_year: Optional[int] = None,
     agency: Optional[str] = None,
-    category: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    category: Optional[str] = None
 ):
     """Analyze spending trends with optional filters"""
-    # Implementation here
-    pass
+    try:
+        return await AnalyticsEngine().spending_trends(
+            fiscal_year=fiscal_year,
+            agency=agency,
+            category=category
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail=ANALYTICS_NOT_EXPORTED)
 
 @router.get("/anomalies/", response_model=List[dict])
 async def detect_anomalies(
     fiscal_year: int,
     threshold: float = Query(2.0, description="Standard deviations from mean to consider anomalous"),
-    category: str = Query("amount", description="Category to analyze (amount, frequency, duration)"),
-    db: AsyncSession = Depends(get_db)
+    category: str = Query("amount", description="Category to analyze (amount, frequency, duration)")
 ):
     """Detect anomalous spending patterns"""
-    # Implementation here
-    pass
+    try:
+        return await AnalyticsEngine().anomalies(
+            fiscal_year=fiscal_year,
+            threshold=threshold,
+            category=category
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail=ANALYTICS_NOT_EXPORTED)
 
 @router.get("/contractor-analysis/{duns}", response_model=dict)
 async def analyze_contractor(
     duns: str,
-    fiscal_year: Optional[int] = None,
-    db: AsyncSession = Depends(get_db)
+    fiscal_year: Optional[int] = None
 ):
     """Analyze contractor spending patterns and relationships"""
-    # Implementation here
-    pass
+    # The analytics store has no recipient identifiers to look a DUNS up by
+    raise HTTPException(status_code=501, detail="Contractor analysis is not implemented yet")
 
 @router.get("/geographic-analysis/", response_model=dict)
 async def analyze_geographic_distribution(
     fiscal_year: int,
-    category: str = Query("contracts", description="Category to analyze (contracts, grants, total)"),
-    db: AsyncSession = Depends(get_db)
+    category: str = Query("contracts", description="Category to analyze (contracts, grants, total)")
 ):
     """Analyze geographic distribution of spending"""
-    # Implementation here
-    pass
+    try:
+        return await AnalyticsEngine().geographic_distribution(fiscal_year=fiscal_year, category=category)
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail=ANALYTICS_NOT_EXPORTED)
 
 @router.get("/seasonal-patterns/", response_model=dict)
 async def analyze_seasonal_patterns(
-    years: int = Query(5, description="Number of years to analyze"),
-    category: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    years: int = Query(5, ge=1, le=50, description="Number of years to analyze"),
+    category: Optional[str] = None
 ):
     """Analyze seasonal spending patterns"""
-    # Implementation here
-    pass
+    try:
+        return await AnalyticsEngine().seasonal_patterns(years=years, category=category)
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail=ANALYTICS_NOT_EXPORTED)
 
 @router.get("/agency-comparison/", response_model=dict)
 async def compare_agencies(
     fiscal_year: int,
     agencies: List[str] = Query(..., description="List of agency IDs to compare"),
     metric: str = Query("total_spending", description="Metric to compare"),
-    db: AsyncSession = Depends(get_db)
 ):
     """Compare spending patterns between agencies"""
-    # Implementation here
-    pass
+    try:
+        return await AnalyticsEngine().agency_comparison(
+            fiscal_year=fiscal_year,
+            agencies=agencies,
+            metric=metric
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError:
+        raise HTTPException(status_code=503, detail=ANALYTICS_NOT_EXPORTED)
@@ -0,0 +1,104 @@
+"""Chunked CSV, NDJSON and Parquet encoders for streamed exports"""
+import csv
+import io
+import zlib
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Sequence
+
+import orjson
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Boolean, Column, Date, DateTime, Float, Integer, Numeric
+
+from app.api.responses import encode_row
+
+# wbits for zlib streams with a gzip header and trailer
+GZIP_WBITS = 31
+
+Chunks = AsyncIterable[List[Dict[str, Any]]]
+
+async def csv_chunks(chunks: Chunks, columns: Sequence[str]) -> AsyncIterator[bytes]:
+    """Header row, then one block of CSV rows per chunk"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(columns), extrasaction="ignore")
+    writer.writeheader()
+    yield buffer.getvalue().encode()
+    async for rows in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
+
+async def ndjson_chunks(chunks: Chunks) -> AsyncIterator[bytes]:
+    """One JSON object per line"""
+    async for rows in chunks:
+        yield "".join(encode_row(row) + "\n" for row in rows).encode()
+
+def arrow_type(column: Column) -> pa.DataType:
+    """Arrow type for a table column; unmapped types are exported as strings"""
+    column_type = column.type
+    if isinstance(column_type, Boolean):
+        return pa.bool_()
+    if isinstance(column_type, Integer):
+        return pa.int64()
+    if isinstance(column_type, (Float, Numeric)):
+        return pa.float64()
+    if isinstance(column_type, DateTime):
+        return pa.timestamp("us")
+    if isinstance(column_type, Date):
+        return pa.date32()
+    return pa.string()
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back what was written since the last drain"""
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        self._buffer += data
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = bytes(self._buffer)
+        self._buffer.clear()
+        return data
+
+def _arrow_value(value: Any, data_type: pa.DataType) -> Any:
+    if value is None or not pa.types.is_string(data_type) or isinstance(value, str):
+        return value
+    return orjson.dumps(value, default=str).decode()
+
+async def parquet_chunks(chunks: Chunks, columns: Sequence[Column]) -> AsyncIterator[bytes]:
+    """A Parquet file written one row group per chunk, streamed as each group is flushed"""
+    schema = pa.schema([(column.key, arrow_type(column)) for column in columns])
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression="zstd")
+    try:
+        async for rows in chunks:
+            arrays = [
+                pa.array([_arrow_value(row.get(field.name), field.type) for row in rows], type=field.type)
+                for field in schema
+            ]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    # Footer
+    yield sink.drain()
+
+async def gzip_stream(data: AsyncIterable[bytes], level: int = 6) -> AsyncIterator[bytes]:
+    """Compress a byte stream into a single gzip member"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+    async for block in data:
+        compressed = compressor.compress(block)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,88 @@
+"""Column-projected, streamed JSON responses for database-backed routes"""
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, AsyncIterable, AsyncIterator, Dict, List, Optional
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Column
+from sqlalchemy.sql import Select
+
+from app.db.streaming import DEFAULT_CHUNK_SIZE, iter_row_chunks
+from app.services.storage.archive import hydrate_rows
+
+# Large payload columns that are only loaded when a caller asks for them
+DEFERRED_COLUMNS = {"raw_data"}
+
+def project_columns(
+    model: Any,
+    fields: Optional[List[str]] = None,
+    include_raw: bool = False
+) -> List[Column]:
+    """Resolve the requested field names to table columns, deferring raw payloads"""
+    table = model.__table__
+    if fields:
+        unknown = [name for name in fields if name not in table.c]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields for {table.name}: {', '.join(unknown)}"
+            )
+        names = list(dict.fromkeys(fields))
+    else:
+        names = [name for name in table.c.keys() if name not in DEFERRED_COLUMNS]
+
+    if include_raw:
+        names.extend(name for name in DEFERRED_COLUMNS if name in table.c and name not in names)
+
+    # Archived payloads are loaded through their pointer
+    if "raw_data" in names and "raw_data_ref" in table.c and "raw_data_ref" not in names:
+        names.append("raw_data_ref")
+
+    return [table.c[name] for name in names]
+
+def _json_default(value: Any) -> Any:
+    """Encode values the standard JSON encoder does not handle"""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def encode_row(row: Dict[str, Any]) -> str:
+    """Serialize a single result mapping to JSON"""
+    return json.dumps(row, default=_json_default)
+
+async def _json_array(
+    query: Select,
+    params: Optional[Dict[str, Any]],
+    chunk_size: int
+) -> AsyncIterator[str]:
+    """Stream query results as a single JSON array"""
+    yield "["
+    first = True
+    async for rows in iter_row_chunks(query, chunk_size, params):
+        await hydrate_rows(rows)
+        body = ",".join(encode_row(row) for row in rows)
+        if not body:
+            continue
+        yield body if first else "," + body
+        first = False
+    yield "]"
+
+def stream_rows(
+    query: Select,
+    params: Optional[Dict[str, Any]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> StreamingResponse:
+    """Build a streaming JSON array response for a Core select"""
+    return StreamingResponse(_json_array(query, params, chunk_size), media_type="application/json")
+
+async def _ndjson(items: AsyncIterable[Dict[str, Any]]) -> AsyncIterator[str]:
+    async for item in items:
+        yield encode_row(item) + "\n"
+
+def stream_ndjson(items: AsyncIterable[Dict[str, Any]]) -> StreamingResponse:
+    """Build a newline-delimited JSON response, one line per item as it is produced"""
+    return StreamingResponse(_ndjson(items), media_type="application/x-ndjson")
@@ -0,0 +1,174 @@
+from typing import Any, AsyncIterator, Dict, List, Optional
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import Column
+
+from app.api.export_formats import csv_chunks, gzip_stream, ndjson_chunks, parquet_chunks
+from app.api.responses import project_columns
+from app.db.query_builder import FilteredQuery
+from app.db.streaming import iter_row_chunks
+from app.models.awards import Award
+from app.models.government_data import EconomicIndicator, Subaward
+from app.utils.helpers import fiscal_year_bounds
+
+router = APIRouter()
+
+FORMAT_PATTERN = "^(csv|ndjson|parquet)$"
+FORMAT_DESCRIPTION = "File format: csv, ndjson, or parquet"
+GZIP_DESCRIPTION = "Gzip the csv or ndjson output"
+FIELDS_DESCRIPTION = "Columns to export (defaults to all exportable columns)"
+FISCAL_YEAR_DESCRIPTION = "Federal fiscal year, October 1 through September 30"
+
+MEDIA_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Rows read from the server-side cursor per chunk; Parquet writes one row group per chunk
+EXPORT_CHUNK_SIZE = 2000
+PARQUET_ROW_GROUP_SIZE = 20000
+
+# Search internals, source payloads and archive pointers are not exported
+EXPORT_EXCLUDED = {"search_vector", "raw_data", "raw_data_ref", "detail_data"}
+
+AWARD_EXPORT = FilteredQuery(Award, {
+    "award_type": (Award.award_type, "eq"),
+    "agency": (Award.awarding_agency, "eq"),
+    "recipient_state": (Award.recipient_state, "eq"),
+    "start_date": (Award.start_date, "gte"),
+    "end_date": (Award.start_date, "lte"),
+    "fiscal_year_start": (Award.start_date, "gte"),
+    "fiscal_year_end": (Award.start_date, "lt"),
+})
+
+SUBAWARD_EXPORT = FilteredQuery(Subaward, {
+    "prime_award_id": (Subaward.prime_award_id, "eq"),
+    "start_date": (Subaward.period_of_performance_start, "gte"),
+    "end_date": (Subaward.period_of_performance_start, "lte"),
+    "fiscal_year_start": (Subaward.period_of_performance_start, "gte"),
+    "fiscal_year_end": (Subaward.period_of_performance_start, "lt"),
+})
+
+INDICATOR_EXPORT = FilteredQuery(EconomicIndicator, {
+    "series_id": (EconomicIndicator.series_id, "eq"),
+    "indicator_type": (EconomicIndicator.indicator_type, "eq"),
+    "start_date": (EconomicIndicator.date, "gte"),
+    "end_date": (EconomicIndicator.date, "lte"),
+})
+
+def export_columns(model: Any, fields: Optional[List[str]]) -> List[Column]:
+    """Requested columns, or every exportable column of the table"""
+    excluded = sorted(EXPORT_EXCLUDED.intersection(fields or []))
+    if excluded:
+        raise HTTPException(status_code=400, detail=f"Fields are not exportable: {', '.join(excluded)}")
+    return [column for column in project_columns(model, fields) if column.key not in EXPORT_EXCLUDED]
+
+def _fiscal_year_filters(fiscal_year: Optional[int]) -> Dict[str, Any]:
+    if fiscal_year is None:
+        return {}
+    start, end = fiscal_year_bounds(fiscal_year)
+    return {"fiscal_year_start": start, "fiscal_year_end": end}
+
+def export_response(
+    name: str,
+    builder: FilteredQuery,
+    columns: List[Column],
+    values: Dict[str, Any],
+    file_format: str,
+    gzip: bool
+) -> StreamingResponse:
+    """Stream a filtered table from a server-side cursor as a downloadable file"""
+    if gzip and file_format == "parquet":
+        raise HTTPException(status_code=400, detail="Parquet exports are already compressed; gzip applies to csv and ndjson")
+
+    query, params = builder.build(columns, values)
+    chunk_size = PARQUET_ROW_GROUP_SIZE if file_format == "parquet" else EXPORT_CHUNK_SIZE
+    chunks = iter_row_chunks(query, chunk_size, params)
+
+    body: AsyncIterator[bytes]
+    if file_format == "csv":
+        body = csv_chunks(chunks, [column.key for column in columns])
+    elif file_format == "ndjson":
+        body = ndjson_chunks(chunks)
+    else:
+        body = parquet_chunks(chunks, columns)
+
+    filename = f"{name}.{file_format}"
+    media_type = MEDIA_TYPES[file_format]
+    if gzip:
+        body = gzip_stream(body)
+        filename += ".gz"
+        media_type = "application/gzip"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@router.get("/awards")
+async def export_awards(
+    format: str = Query("csv", pattern=FORMAT_PATTERN, description=FORMAT_DESCRIPTION),
+    gzip: bool = Query(False, description=GZIP_DESCRIPTION),
+    fiscal_year: Optional[int] = Query(None, description=FISCAL_YEAR_DESCRIPTION),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    award_type: Optional[str] = None,
+    agency: Optional[str] = None,
+    recipient_state: Optional[str] = None,
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Export stored awards"""
+    values = {
+        "award_type": award_type,
+        "agency": agency,
+        "recipient_state": recipient_state,
+        "start_date": start_date,
+        "end_date": end_date,
+        **_fiscal_year_filters(fiscal_year),
+    }
+    name = f"awards_fy{fiscal_year}" if fiscal_year else "awards"
+    return export_response(name, AWARD_EXPORT, export_columns(Award, fields), values, format, gzip)
+
+@router.get("/subawards")
+async def export_subawards(
+    format: str = Query("csv", pattern=FORMAT_PATTERN, description=FORMAT_DESCRIPTION),
+    gzip: bool = Query(False, description=GZIP_DESCRIPTION),
+    fiscal_year: Optional[int] = Query(None, description=FISCAL_YEAR_DESCRIPTION),
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    prime_award_id: Optional[str] = None,
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Export stored subawards"""
+    values = {
+        "prime_award_id": prime_award_id,
+        "start_date": start_date,
+        "end_date": end_date,
+        **_fiscal_year_filters(fiscal_year),
+    }
+    name = f"subawards_fy{fiscal_year}" if fiscal_year else "subawards"
+    return export_response(name, SUBAWARD_EXPORT, export_columns(Subaward, fields), values, format, gzip)
+
+@router.get("/economic-indicators")
+async def export_economic_indicators(
+    format: str = Query("csv", pattern=FORMAT_PATTERN, description=FORMAT_DESCRIPTION),
+    gzip: bool = Query(False, description=GZIP_DESCRIPTION),
+    series_id: Optional[str] = None,
+    indicator_type: Optional[str] = None,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+):
+    """Export stored economic indicator observations"""
+    values = {
+        "series_id": series_id,
+        "indicator_type": indicator_type,
+        "start_date": start_date,
+        "end_date": end_date,
+    }
+    return export_response(
+        "economic_indicators", INDICATOR_EXPORT, export_columns(EconomicIndicator, fields), values, format, gzip
+    )
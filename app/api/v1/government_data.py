@@ -4,7 +4,10 @@ from fastapi import APIRouter, Depends, Query, HTTPException
 from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from app.api.responses import project_columns, stream_rows
+from app.db.query_builder import FilteredQuery
 from app.db.session import get_db
+from app.services.storage.contractor_graph import ADJACENCY_LIMIT, MAX_DEPTH, traverse
 from app.models.government_data import (
     ContractOpportunity,
     Subaward,
@@ -15,6 +18,55 @@ from app.models.government_data import (
 
 router = APIRouter()
 
+FIELDS_DESCRIPTION = "Columns to return (defaults to all columns except raw_data)"
+INCLUDE_RAW_DESCRIPTION = "Whether to include the raw source payload"
+NAME_MATCH_DESCRIPTION = "Name matching: substring, or fuzzy for typo-tolerant similarity ranking"
+NAME_MATCH_PATTERN = "^(substring|fuzzy)$"
+
+# Name match mode -> filter operator
+NAME_MATCH_OPERATORS = {"substring": "contains", "fuzzy": "similar"}
+
+# Statements are cached per set of active filters; see FilteredQuery
+OPPORTUNITY_QUERY = FilteredQuery(ContractOpportunity, {
+    "agency": (ContractOpportunity.agency, "eq"),
+    "status": (ContractOpportunity.status, "eq"),
+    "naics_code": (ContractOpportunity.naics_code, "eq"),
+    "min_value": (ContractOpportunity.estimated_value, "gte"),
+    "max_value": (ContractOpportunity.estimated_value, "lte"),
+    "posted_after": (ContractOpportunity.posted_date, "gte"),
+    "posted_before": (ContractOpportunity.posted_date, "lte"),
+})
+
+SUBAWARD_QUERY = FilteredQuery(Subaward, {
+    "prime_award_id": (Subaward.prime_award_id, "eq"),
+    "recipient_name": (Subaward.recipient_name, "contains"),
+    "min_amount": (Subaward.amount, "gte"),
+    "max_amount": (Subaward.amount, "lte"),
+    "performance_start_after": (Subaward.period_of_performance_start, "gte"),
+    "performance_start_before": (Subaward.period_of_performance_start, "lte"),
+})
+
+INDICATOR_QUERY = FilteredQuery(EconomicIndicator, {
+    "series_id": (EconomicIndicator.series_id, "eq"),
+    "indicator_type": (EconomicIndicator.indicator_type, "eq"),
+    "start_date": (EconomicIndicator.date, "gte"),
+    "end_date": (EconomicIndicator.date, "lte"),
+})
+
+FILING_QUERY = FilteredQuery(CompanyFiling, {
+    "cik": (CompanyFiling.cik, "eq"),
+    "company_name": (CompanyFiling.company_name, "contains"),
+    "filing_type": (CompanyFiling.filing_type, "eq"),
+    "start_date": (CompanyFiling.filing_date, "gte"),
+    "end_date": (CompanyFiling.filing_date, "lte"),
+    "fiscal_year": (CompanyFiling.fiscal_year, "eq"),
+})
+
+FINANCIAL_QUERY = FilteredQuery(CompanyFinancial, {
+    "filing_id": (CompanyFinancial.filing_id, "eq"),
+    "metric_name": (CompanyFinancial.metric_name, "eq"),
+})
+
 @router.get("/contract-opportunities", response_model=List[dict])
 async def get_contract_opportunities(
     agency: Optional[str] = None,
@@ -24,29 +76,23 @@ async def get_contract_opportunities(
     max_value: Optional[float] = None,
     posted_after: Optional[datetime] = None,
     posted_before: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    include_raw: bool = Query(False, description=INCLUDE_RAW_DESCRIPTION),
 ):
     """Get contract opportunities with optional filters"""
-    query = select(ContractOpportunity)
-    
-    if agency:
-        query = query.where(ContractOpportunity.agency == agency)
-    if status:
-        query = query.where(ContractOpportunity.status == status)
-    if naics_code:
-        query = query.where(ContractOpportunity.naics_code == naics_code)
-    if min_value:
-        query = query.where(ContractOpportunity.estimated_value >= min_value)
-    if max_value:
-        query = query.where(ContractOpportunity.estimated_value <= max_value)
-    if posted_after:
-        query = query.where(ContractOpportunity.posted_date >= posted_after)
-    if posted_before:
-        query = query.where(ContractOpportunity.posted_date <= posted_before)
-    
-    result = await db.execute(query)
-    opportunities = result.scalars().all()
-    return [opp.__dict__ for opp in opportunities]
+    query, params = OPPORTUNITY_QUERY.build(
+        project_columns(ContractOpportunity, fields, include_raw),
+        {
+            "agency": agency,
+            "status": status,
+            "naics_code": naics_code,
+            "min_value": min_value,
+            "max_value": max_value,
+            "posted_after": posted_after,
+            "posted_before": posted_before,
+        }
+    )
+    return stream_rows(query, params)
 
 @router.get("/subawards", response_model=List[dict])
 async def get_subawards(
@@ -56,27 +102,24 @@ async def get_subawards(
     max_amount: Optional[float] = None,
     performance_start_after: Optional[datetime] = None,
     performance_start_before: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    name_match: str = Query("substring", pattern=NAME_MATCH_PATTERN, description=NAME_MATCH_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    include_raw: bool = Query(False, description=INCLUDE_RAW_DESCRIPTION),
 ):
     """Get subawards with optional filters"""
-    query = select(Subaward)
-    
-    if prime_award_id:
-        query = query.where(Subaward.prime_award_id == prime_award_id)
-    if recipient_name:
-        query = query.where(Subaward.recipient_name.ilike(f"%{recipient_name}%"))
-    if min_amount:
-        query = query.where(Subaward.amount >= min_amount)
-    if max_amount:
-        query = query.where(Subaward.amount <= max_amount)
-    if performance_start_after:
-        query = query.where(Subaward.period_of_performance_start >= performance_start_after)
-    if performance_start_before:
-        query = query.where(Subaward.period_of_performance_start <= performance_start_before)
-    
-    result = await db.execute(query)
-    subawards = result.scalars().all()
-    return [sub.__dict__ for sub in subawards]
+    query, params = SUBAWARD_QUERY.build(
+        project_columns(Subaward, fields, include_raw),
+        {
+            "prime_award_id": prime_award_id,
+            "recipient_name": recipient_name,
+            "min_amount": min_amount,
+            "max_amount": max_amount,
+            "performance_start_after": performance_start_after,
+            "performance_start_before": performance_start_before,
+        },
+        operators={"recipient_name": NAME_MATCH_OPERATORS[name_match]}
+    )
+    return stream_rows(query, params)
 
 @router.get("/economic-indicators", response_model=List[dict])
 async def get_economic_indicators(
@@ -84,23 +127,20 @@ async def get_economic_indicators(
     indicator_type: Optional[str] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
-    db: Session = Depends(get_db),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    include_raw: bool = Query(False, description=INCLUDE_RAW_DESCRIPTION),
 ):
     """Get economic indicators with optional filters"""
-    query = select(EconomicIndicator)
-    
-    if series_id:
-        query = query.where(EconomicIndicator.series_id == series_id)
-    if indicator_type:
-        query = query.where(EconomicIndicator.indicator_type == indicator_type)
-    if start_date:
-        query = query.where(EconomicIndicator.date >= start_date)
-    if end_date:
-        query = query.where(EconomicIndicator.date <= end_date)
-    
-    result = await db.execute(query)
-    indicators = result.scalars().all()
-    return [ind.__dict__ for ind in indicators]
+    query, params = INDICATOR_QUERY.build(
+        project_columns(EconomicIndicator, fields, include_raw),
+        {
+            "series_id": series_id,
+            "indicator_type": indicator_type,
+            "start_date": start_date,
+            "end_date": end_date,
+        }
+    )
+    return stream_rows(query, params)
 
 @router.get("/company-filings", response_model=List[dict])
 async def get_company_filings(
@@ -110,43 +150,55 @@ async def get_company_filings(
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
     fiscal_year: Optional[int] = None,
-    db: Session = Depends(get_db),
+    name_match: str = Query("substring", pattern=NAME_MATCH_PATTERN, description=NAME_MATCH_DESCRIPTION),
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    include_raw: bool = Query(False, description=INCLUDE_RAW_DESCRIPTION),
 ):
     """Get company filings with optional filters"""
-    query = select(CompanyFiling)
-    
-    if cik:
-        query = query.where(CompanyFiling.cik == cik)
-    if company_name:
-        query = query.where(CompanyFiling.company_name.ilike(f"%{company_name}%"))
-    if filing_type:
-        query = query.where(CompanyFiling.filing_type == filing_type)
-    if start_date:
-        query = query.where(CompanyFiling.filing_date >= start_date)
-    if end_date:
-        query = query.where(CompanyFiling.filing_date <= end_date)
-    if fiscal_year:
-        query = query.where(CompanyFiling.fiscal_year == fiscal_year)
-    
-    result = await db.execute(query)
-    filings = result.scalars().all()
-    return [filing.__dict__ for filing in filings]
+    query, params = FILING_QUERY.build(
+        project_columns(CompanyFiling, fields, include_raw),
+        {
+            "cik": cik,
+            "company_name": company_name,
+            "filing_type": filing_type,
+            "start_date": start_date,
+            "end_date": end_date,
+            "fiscal_year": fiscal_year,
+        },
+        operators={"company_name": NAME_MATCH_OPERATORS[name_match]}
+    )
+    return stream_rows(query, params)
 
 @router.get("/company-financials/{filing_id}", response_model=List[dict])
 async def get_company_financials(
     filing_id: int,
     metric_name: Optional[str] = None,
+    fields: Optional[List[str]] = Query(None, description=FIELDS_DESCRIPTION),
+    include_raw: bool = Query(False, description=INCLUDE_RAW_DESCRIPTION),
     db: Session = Depends(get_db),
 ):
     """Get financial metrics for a specific filing"""
-    query = select(CompanyFinancial).where(CompanyFinancial.filing_id == filing_id)
-    
-    if metric_name:
-        query = query.where(CompanyFinancial.metric_name == metric_name)
+    values = {"filing_id": filing_id, "metric_name": metric_name}
+    query, params = FINANCIAL_QUERY.build(
+        project_columns(CompanyFinancial, fields, include_raw), values
+    )
     
-    result = await db.execute(query)
-    financials = result.scalars().all()
-    if not financials:
+    # Check for matching rows up front; a streamed response can't change its status later
+    exists_query, _ = FINANCIAL_QUERY.build([CompanyFinancial.id], values)
+    found = await db.scalar(select(exists_query.exists()), params)
+    if not found:
         raise HTTPException(status_code=404, detail="Filing not found")
     
-    return [fin.__dict__ for fin in financials] 
\ No newline at end of file
+    return stream_rows(query, params)
+
+@router.get("/contractor-graph/{recipient_key:path}", response_model=dict)
+async def get_contractor_graph(
+    recipient_key: str,
+    depth: int = Query(2, ge=1, le=MAX_DEPTH, description="Number of hops to traverse"),
+    direction: str = Query("out", pattern="^(out|in|both)$", description="out: subcontractors, in: primes, both"),
+    max_neighbors: int = Query(25, ge=1, le=ADJACENCY_LIMIT, description="Heaviest edges followed per node"),
+    min_amount: float = Query(0, ge=0, description="Minimum total subaward dollars per edge"),
+    db: Session = Depends(get_db),
+):
+    """Get the subcontracting neighborhood of a recipient (keys look like uei:..., duns:... or name:...)"""
+    return await traverse(db, recipient_key, depth, direction, max_neighbors, min_amount)
@@ -1,48 +1,57 @@
-from fastapi import APIRouter, Query
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import get_db
 from app.services.scrapers.treasury import TreasuryClient
-from app.core.cache import get_cache, set_cache, generate_cache_key
-from app.core.logger import logger
+from app.services.storage.debt_series import DebtSeriesStore
+from app.core.cache import cache_tag, cached
 
-router = APIRouter(prefix="/treasury", tags=["Treasury"])
+router = APIRouter(tags=["Treasury"])
+
+# Daily points the upstream fallback returns in one page
+UPSTREAM_HISTORY_DAYS = 366
+
+def treasury_tags(arguments: dict) -> list:
+    """Debt responses are refreshed whenever the collector syncs new Treasury records"""
+    return [cache_tag("source", "treasury")]
 
 @router.get("/debt/current")
+@cached("current_debt", soft_ttl=600, hard_ttl=3600, tags=treasury_tags)
 async def get_current_debt():
     """Get the current national debt information"""
-    # Try to get from cache first
-    cache_key = "current_debt"
-    cached_data = await get_cache(cache_key)
-    if cached_data:
-        logger.info("Returning cached debt data")
-        return cached_data
-    
-    # Fetch fresh data
     client = TreasuryClient()
-    data = await client.get_debt_to_penny()
-    
-    if "error" not in data:
-        # Cache for 1 hour
-        await set_cache(cache_key, data, expire=3600)
-    
-    return data
+    return await client.get_debt_to_penny()
 
 @router.get("/debt/historical")
+@cached("historical_debt", soft_ttl=3600, hard_ttl=6 * 3600, tags=treasury_tags)
 async def get_historical_debt(
-    days: int = Query(365, description="Number of days of historical data to retrieve", ge=1, le=366)
+    days: int = Query(365, description="Number of days of historical data to retrieve", ge=1, le=36500),
+    start_date: Optional[date] = Query(None, description="Start of the range (overrides days)"),
+    end_date: Optional[date] = Query(None, description="End of the range (defaults to today)"),
+    resolution: str = Query(
+        "auto",
+        pattern="^(auto|day|week|month|fiscal_year)$",
+        description="Point resolution; auto picks the finest that fits max_points"
+    ),
+    max_points: int = Query(500, ge=2, le=10000, description="Maximum number of points to return"),
+    db: AsyncSession = Depends(get_db)
 ):
     """Get historical national debt information"""
-    # Try to get from cache first
-    cache_key = generate_cache_key("historical_debt", days=days)
-    cached_data = await get_cache(cache_key)
-    if cached_data:
-        logger.info("Returning cached historical debt data")
-        return cached_data
-    
-    # Fetch fresh data
-    client = TreasuryClient()
-    data = await client.get_debt_historical(days=days)
+    end = datetime.combine(end_date or date.today(), time.max)
+    start = datetime.combine(start_date, time.min) if start_date else end - timedelta(days=days)
     
-    if "error" not in data:
-        # Cache for 1 hour
-        await set_cache(cache_key, data, expire=3600)
+    # Serve from the local time series once it has been synced
+    store = DebtSeriesStore()
+    if await store.has_records(db):
+        return await store.get_series(db, start, end, resolution=resolution, max_points=max_points)
     
-    return data 
\ No newline at end of file
+    # Fall back to the upstream API, which serves at most a year of daily points
+    if (end - start).days > UPSTREAM_HISTORY_DAYS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Ranges over {UPSTREAM_HISTORY_DAYS} days are served once the debt series has been synced"
+        )
+    client = TreasuryClient()
+    return await client.get_debt_historical(start_date=start, end_date=end)
+ 
\ No newline at end of file
@@ -1,21 +1,39 @@
+import asyncio
 from typing import Optional, List
-from fastapi import APIRouter, Query, Depends
+from fastapi import APIRouter, Body, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta
 from sqlalchemy import select
 
 from app.services.scrapers.usaspending import USSpendingClient
-from app.core.cache import get_cache, set_cache, generate_cache_key
+from app.core.cache import cached
 from app.db.session import get_db
 from app.models.awards import Award
 from app.core.config import settings
 from app.core.logger import logger
-from app.services.ai.smart_search import process_search_query, get_search_suggestions
+from app.api.responses import stream_ndjson
+from app.services.ai.query_cache import query_cache_stats
+from app.services.ai.smart_search import (
+    process_search_query_within,
+    result_within,
+    start_search_suggestions
+)
+from app.services.cache.invalidation import award_response_tags
 from app.services.scrapers.data_collector import DataCollector
+from app.services.search.awards import is_window_ingested, search_local_awards
+from app.services.search.result_cache import search_with_subsumption
+from app.services.storage.archive import resolve_raw_data
+from app.services.storage.award_details import (
+    MAX_BATCH_SIZE,
+    get_award_details as get_award_detail_record,
+    iter_award_details
+)
+from app.services.storage.award_dossier import build_dossier
 
-router = APIRouter(prefix="/usaspending", tags=["USAspending.gov"])
+router = APIRouter(tags=["USAspending.gov"])
 
 @router.get("/awards/recent")
+@cached("recent_awards", soft_ttl=300, hard_ttl=3600, tags=award_response_tags)
 async def get_recent_awards(
     days: int = Query(30, description="Number of days to look back"),
     limit: int = Query(100, description="Number of awards to return"),
@@ -48,7 +66,9 @@ async def get_recent_awards(
         if awards:
             logger.info(f"Retrieved {len(awards)} awards from database")
             return {
-                "results": [award.raw_data for award in awards],
+                "results": await resolve_raw_data(
+                    [(award.raw_data, award.raw_data_ref) for award in awards]
+                ),
                 "page": page,
                 "has_more": len(awards) == limit
             }
@@ -56,11 +76,13 @@ async def get_recent_awards(
         # If no data in database, fetch from API
         logger.info("No data in database, fetching from API...")
         collector = DataCollector()
-        awards = await collector.collect_recent_awards(days=days, min_amount=min_amount)
+        awards, complete = await collector.collect_recent_awards(days=days, min_amount=min_amount)
         
         if awards:
             # Store in database for future use
-            await collector.store_awards(awards)
+            stored = await collector.store_awards(awards)
+            if complete and stored == len(awards):
+                await collector.record_ingestion_window(days, min_amount, stored)
             
             # Return paginated results
             start_idx = (page - 1) * limit
@@ -110,6 +132,7 @@ async def get_state_spending(
     )
 
 @router.get("/search")
+@cached("award_search", soft_ttl=300, hard_ttl=3600, tags=award_response_tags)
 async def search_awards(
     keyword: str = Query(..., description="Search keyword"),
     days: int = Query(365, description="Number of days to look back"),
@@ -117,14 +140,37 @@ async def search_awards(
     award_types: List[str] = Query(["A", "B", "C", "D"], description="Award type codes"),
     agency: Optional[str] = Query(None, description="Agency code to filter by"),
     state: Optional[str] = Query(None, description="State code to filter by"),
-    min_amount: float = Query(0, description="Minimum award amount")
+    min_amount: float = Query(0, description="Minimum award amount"),
+    source: str = Query(
+        "auto",
+        pattern="^(auto|local|upstream)$",
+        description="Where to search: local data, upstream API, or local first when the window is ingested"
+    ),
+    db: AsyncSession = Depends(get_db)
 ):
     """Search for specific awards"""
-    client = USSpendingClient()
-    
     end_date = datetime.now()
     start_date = end_date - timedelta(days=days)
     
+    if source == "local" or (
+        source == "auto"
+        and await is_window_ingested(db, start_date, end_date, award_types, min_amount)
+    ):
+        logger.info(f"Searching local awards with keyword: {keyword}, min_amount: ${min_amount:,.2f}")
+        return await search_local_awards(
+            db,
+            keyword=keyword,
+            start_date=start_date,
+            end_date=end_date,
+            award_types=award_types,
+            min_amount=min_amount,
+            agency=agency,
+            state=state,
+            limit=limit
+        )
+    
+    client = USSpendingClient()
+    
     time_period = {
         "start_date": start_date.strftime("%Y-%m-%d"),
         "end_date": end_date.strftime("%Y-%m-%d")
@@ -149,61 +195,60 @@ async def search_awards(
         filters["agencies"] = [{"type": "awarding", "tier": "toptier", "name": agency}]
     
     logger.info(f"Searching awards with keyword: {keyword}, min_amount: ${min_amount:,.2f}")
-    return await client.search_awards(
+    
+    async def fetch(fetch_limit: int):
+        return await client.search_awards(
+            keyword=keyword,
+            time_period=time_period,
+            award_type=award_types,
+            limit=fetch_limit,
+            filters=filters
+        )
+    
+    return await search_with_subsumption(
+        fetch,
         keyword=keyword,
-        time_period=time_period,
-        award_type=award_types,
-        limit=limit,
-        filters=filters
+        award_types=award_types,
+        start_date=start_date,
+        end_date=end_date,
+        min_amount=min_amount,
+        agency=agency,
+        state=state,
+        limit=limit
     )
 
+@router.post("/awards/batch")
+async def get_award_details_batch(
+    award_ids: List[str] = Body(..., embed=True, description="Award IDs to resolve")
+):
+    """Stream details for many awards as NDJSON, in the order they resolve"""
+    award_ids = list(dict.fromkeys(award_ids))
+    if not award_ids or len(award_ids) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Provide between 1 and {MAX_BATCH_SIZE} award IDs"
+        )
+    return stream_ndjson(iter_award_details(award_ids))
+
 @router.get("/awards/{award_id}")
 async def get_award_details(award_id: str):
     """Get detailed information about a specific award"""
-    client = USSpendingClient()
     try:
         logger.info(f"Fetching details for award {award_id}")
-        data = await client.get_award_details(award_id)
-        
-        if "error" in data:
-            logger.error(f"Error fetching award {award_id}: {data['error']}")
-            return {"error": data["error"]}
-            
-        # Format the response data
-        formatted_data = {
-            "award_id": award_id,
-            "description": data.get("description", "No description available"),
-            "amount": float(data.get("total_obligation", 0)),
-            "award_type": data.get("type", "Unknown"),
-            "period_of_performance_start_date": data.get("period_of_performance_start_date"),
-            "period_of_performance_end_date": data.get("period_of_performance_end_date"),
-            "status": data.get("status", "Unknown"),
-            
-            # Agency information
-            "awarding_agency_name": data.get("awarding_agency", {}).get("name", "Unknown"),
-            "funding_agency_name": data.get("funding_agency", {}).get("name", "Unknown"),
-            "awarding_sub_agency_name": data.get("awarding_agency", {}).get("subtier_agency", {}).get("name", "Unknown"),
-            
-            # Recipient information
-            "recipient_name": data.get("recipient", {}).get("recipient_name", "Unknown"),
-            "recipient_duns": data.get("recipient", {}).get("duns", "Unknown"),
-            "recipient_business_type": data.get("recipient", {}).get("business_types_description", "Unknown"),
-            "recipient_city": data.get("recipient", {}).get("location", {}).get("city_name", "Unknown"),
-            "recipient_state": data.get("recipient", {}).get("location", {}).get("state_code", "Unknown"),
-            "recipient_zip": data.get("recipient", {}).get("location", {}).get("zip5", "Unknown"),
-            "recipient_congressional_district": data.get("recipient", {}).get("location", {}).get("congressional_code", "Unknown"),
-            
-            # Additional details
-            "naics": data.get("naics", ""),
-            "psc": data.get("psc", "")
-        }
-        
-        return formatted_data
+        details = await get_award_detail_record(award_id)
+        if "error" in details:
+            return {"error": details["error"]}
+        return details
         
     except Exception as e:
         logger.error(f"Error processing award {award_id}: {str(e)}")
         return {"error": str(e)}
 
+@router.get("/awards/{award_id}/dossier")
+async def get_award_dossier(award_id: str):
+    """Award details with subawards, recipient profile, SAM entity and related filings"""
+    return await build_dossier(award_id)
+
 @router.post("/smart-search")
 async def smart_search(
     query: str = Query(..., description="Natural language search query"),
@@ -213,11 +258,15 @@ async def smart_search(
     Process a natural language search query and return matching contracts
     """
     try:
-        # Process the natural language query
-        search_params = await process_search_query(query)
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.SMART_SEARCH_DEADLINE
+        
+        # Suggestions only depend on the query, so they run alongside parse-then-search
+        suggestions_task = start_search_suggestions(query) if include_suggestions else None
         
-        # Get suggestions if requested
-        suggestions = await get_search_suggestions(query) if include_suggestions else None
+        # Process the natural language query, never past the overall deadline
+        parse_budget = min(settings.SMART_SEARCH_PARSE_BUDGET, max(0.0, deadline - loop.time()))
+        search_params = await process_search_query_within(query, parse_budget)
         
         # Convert min_amount to actual value
         min_amount = 0
@@ -230,15 +279,27 @@ async def smart_search(
             }
             min_amount = amount_map.get(search_params["min_amount"], 0)
         
-        # Perform the actual search
-        client = USSpendingClient()
-        results = await search_awards(
-            keyword=search_params.get("keyword", ""),
-            days=search_params.get("days", 365),
-            limit=50,
-            agency=search_params.get("agency", ""),
-            min_amount=min_amount
-        )
+        # Perform the actual search in what is left of the deadline. The cached
+        # search opens its own session, so a fetch that outlives the deadline
+        # can finish in the background and fill the cache.
+        try:
+            results = await asyncio.wait_for(
+                search_awards(
+                    keyword=search_params.get("keyword", ""),
+                    days=search_params.get("days", 365),
+                    limit=50,
+                    award_types=["A", "B", "C", "D"],
+                    agency=search_params.get("agency", ""),
+                    state=search_params.get("state") or None,
+                    min_amount=min_amount,
+                    source="auto",
+                    db=None
+                ),
+                timeout=max(0.0, deadline - loop.time())
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"Smart search exceeded its deadline: {query}")
+            results = {"results": [], "error": "Search timed out"}
         
         # Return combined results
         response = {
@@ -246,11 +307,21 @@ async def smart_search(
             "results": results
         }
         
-        if suggestions:
-            response["suggestions"] = suggestions
+        if suggestions_task:
+            suggestions = await result_within(suggestions_task, deadline - loop.time())
+            if suggestions is not None:
+                response["suggestions"] = suggestions
+            else:
+                # Still running; the next request for this query is served from cache
+                response["suggestions_pending"] = True
             
         return response
         
     except Exception as e:
         logger.error(f"Error in smart search: {str(e)}")
-        return {"error": str(e)} 
\ No newline at end of file
+        return {"error": str(e)}
+
+@router.get("/smart-search/cache-stats")
+async def smart_search_cache_stats():
+    """Hit rates of the cached query parameters and suggestions"""
+    return await query_cache_stats()
@@ -1,33 +1,577 @@
-import json
-from typing import Optional, Any
+import asyncio
+import functools
+import hashlib
+import inspect
+import math
+import random
+import time
+import uuid
+from collections import OrderedDict, defaultdict
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+import orjson
 from redis.asyncio import Redis
+from starlette.responses import Response
+from app.core.cache_codec import decode, encode, hash_params
 from app.core.config import settings
+from app.core.logger import logger
+from app.db.session import AsyncSessionLocal
+from app.utils.helpers import agency_slug
 
-# Create Redis connection pool
-redis = Redis.from_url(settings.REDIS_URL, decode_responses=True)
+# Create Redis connection pool; values are binary, see app.core.cache_codec
+redis = Redis.from_url(settings.REDIS_URL)
 
-async def set_cache(key: str, value: Any, expire: Optional[int] = None) -> None:
-    """Set a cache value with optional expiration"""
+# Key prefix -> seconds an entry may be served from process memory (0 skips the local tier).
+# Keys without a policy use settings.CACHE_L1_TTL.
+CACHE_POLICIES: Dict[str, int] = {
+    "current_debt": 60,
+    "historical_debt": 300,
+    "contractor_adjacency": 300,
+    "search_params": 3600,
+    "search_suggestions": 3600,
+}
+
+# Redis sets holding the keys that carry a tag are stored under this prefix
+TAG_KEY_PREFIX = "tag:"
+
+# Counters bumped on every invalidation of a tag, used as data version stamps
+VERSION_KEY_PREFIX = "version:"
+
+# Sorted set of sampled (prefix, arguments) call counts
+ACCESS_COUNTS_KEY = "cache:access"
+
+# Arguments that never distinguish cached results
+CACHE_KEY_EXCLUDE = {"self", "cls", "db"}
+
+# Per-request validator state shared with app.core.http_cache.ConditionalResponseMiddleware:
+# "if_none_match" (request entity tags) in, "etag" and "modified" out
+response_validator: ContextVar[Optional[Dict[str, Any]]] = ContextVar("response_validator", default=None)
+
+# Identifies this process in invalidation messages so it can skip its own
+INSTANCE_ID = uuid.uuid4().hex
+
+class LocalCache:
+    """Size-bounded in-process LRU cache with per-entry expiry and per-prefix counters.
+
+    Values are returned as stored, so callers must not mutate them.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (found, value) for a key"""
+        stats = self._stats[key_prefix(key)]
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            stats["misses"] += 1
+            return False, None
+        self._entries.move_to_end(key)
+        stats["hits"] += 1
+        return True, entry[1]
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store a value for ttl seconds, evicting the least recently used entries"""
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Drop a key if present"""
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Hit and miss counters per key prefix"""
+        return {prefix: dict(counts) for prefix, counts in self._stats.items()}
+
+local_cache = LocalCache(settings.CACHE_L1_MAX_ENTRIES)
+_redis_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+def key_prefix(key: str) -> str:
+    """Policy prefix of a cache key"""
+    return key.split(":", 1)[0]
+
+def local_ttl(key: str, expire: Optional[int] = None) -> int:
+    """Seconds a key may live in the local tier, never longer than its Redis expiry"""
+    ttl = CACHE_POLICIES.get(key_prefix(key), settings.CACHE_L1_TTL)
+    return min(ttl, expire) if expire else ttl
+
+def cache_tag(kind: str, value: Any) -> str:
+    """Tag for something cached values depend on, e.g. cache_tag("agency", name)"""
+    return f"{kind}:{agency_slug(str(value))}"
+
+async def set_cache(
+    key: str,
+    value: Any,
+    expire: Optional[int] = None,
+    tags: Optional[Iterable[str]] = None
+) -> None:
+    """Set a cache value with optional expiration and invalidation tags"""
     expire = expire or settings.CACHE_TTL
-    await redis.set(key, json.dumps(value), ex=expire)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.set(key, encode(value), ex=expire)
+        for tag in set(tags or ()):
+            pipe.sadd(f"{TAG_KEY_PREFIX}{tag}", key)
+            pipe.expire(f"{TAG_KEY_PREFIX}{tag}", max(expire, settings.CACHE_TAG_TTL))
+        pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{INSTANCE_ID}:{key}")
+        await pipe.execute()
+    local_cache.set(key, value, local_ttl(key, expire))
 
 async def get_cache(key: str) -> Optional[Any]:
-    """Get a cached value"""
+    """Get a cached value, from process memory when possible"""
+    found, value = local_cache.get(key)
+    if found:
+        return value
+
     data = await redis.get(key)
+    stats = _redis_stats[key_prefix(key)]
     if data:
-        return json.loads(data)
+        stats["hits"] += 1
+        value = decode(data)
+        # Remaining Redis TTL is not fetched; the local policy keeps staleness bounded
+        local_cache.set(key, value, local_ttl(key))
+        return value
+    stats["misses"] += 1
     return None
 
+async def get_many(keys: Iterable[str]) -> Dict[str, Any]:
+    """Get several cached values in one Redis round-trip; missing keys are left out"""
+    found: Dict[str, Any] = {}
+    remote = []
+    for key in dict.fromkeys(keys):
+        hit, value = local_cache.get(key)
+        if hit:
+            found[key] = value
+        else:
+            remote.append(key)
+    if not remote:
+        return found
+
+    for key, data in zip(remote, await redis.mget(remote)):
+        stats = _redis_stats[key_prefix(key)]
+        if data:
+            stats["hits"] += 1
+            found[key] = decode(data)
+            local_cache.set(key, found[key], local_ttl(key))
+        else:
+            stats["misses"] += 1
+    return found
+
+async def set_many(
+    values: Dict[str, Any],
+    expire: Optional[int] = None,
+    tags: Optional[Iterable[str]] = None
+) -> None:
+    """Set several cache values with one pipelined round-trip"""
+    if not values:
+        return
+    expire = expire or settings.CACHE_TTL
+    tags = set(tags or ())
+    async with redis.pipeline(transaction=False) as pipe:
+        for key, value in values.items():
+            pipe.set(key, encode(value), ex=expire)
+            for tag in tags:
+                pipe.sadd(f"{TAG_KEY_PREFIX}{tag}", key)
+            pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{INSTANCE_ID}:{key}")
+        for tag in tags:
+            pipe.expire(f"{TAG_KEY_PREFIX}{tag}", max(expire, settings.CACHE_TAG_TTL))
+        await pipe.execute()
+    for key, value in values.items():
+        local_cache.set(key, value, local_ttl(key, expire))
+
 async def delete_cache(key: str) -> None:
     """Delete a cached value"""
-    await redis.delete(key)
+    local_cache.delete(key)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.delete(key)
+        pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{INSTANCE_ID}:{key}")
+        await pipe.execute()
+
+async def invalidate_tags(tags: Iterable[str]) -> int:
+    """Delete every key carrying any of the tags, in Redis and in all workers"""
+    tags = set(tags)
+    tag_keys = [f"{TAG_KEY_PREFIX}{tag}" for tag in set(tags)]
+    if not tag_keys:
+        return 0
+
+    async with redis.pipeline(transaction=False) as pipe:
+        for tag_key in tag_keys:
+            pipe.smembers(tag_key)
+        members = await pipe.execute()
+    keys = {member.decode() for group in members for member in group}
+
+    async with redis.pipeline(transaction=False) as pipe:
+        if keys:
+            pipe.delete(*keys)
+        pipe.delete(*tag_keys)
+        for tag in tags:
+            pipe.incr(f"{VERSION_KEY_PREFIX}{tag}")
+        for key in keys:
+            pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{INSTANCE_ID}:{key}")
+        await pipe.execute()
+    for key in keys:
+        local_cache.delete(key)
+    return len(keys)
+
+async def delete_many(keys: Iterable[str]) -> None:
+    """Delete several cached values with one pipelined round-trip"""
+    keys = list(dict.fromkeys(keys))
+    if not keys:
+        return
+    for key in keys:
+        local_cache.delete(key)
+    async with redis.pipeline(transaction=False) as pipe:
+        pipe.delete(*keys)
+        for key in keys:
+            pipe.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{INSTANCE_ID}:{key}")
+        await pipe.execute()
+
+async def data_versions(tags: Iterable[str]) -> List[int]:
+    """Current version stamp of each tag; a tag never invalidated is at version 0"""
+    tags = list(tags)
+    values = await redis.mget([f"{VERSION_KEY_PREFIX}{tag}" for tag in tags])
+    return [int(value) if value else 0 for value in values]
 
 async def clear_cache() -> None:
     """Clear all cached values"""
+    local_cache.clear()
     await redis.flushdb()
+    await redis.publish(settings.CACHE_INVALIDATION_CHANNEL, f"{INSTANCE_ID}:*")
 
 def generate_cache_key(prefix: str, **kwargs) -> str:
-    """Generate a cache key from prefix and parameters"""
-    params = sorted(kwargs.items())
-    param_str = "_".join(f"{k}:{v}" for k, v in params)
-    return f"{prefix}:{param_str}" 
\ No newline at end of file
+    """Generate a cache key from prefix and a hash of the canonicalized parameters"""
+    return f"{prefix}:{hash_params(kwargs)}"
+
+def cache_stats() -> Dict[str, Any]:
+    """Local and Redis hit/miss counters per key prefix"""
+    return {
+        "local_entries": len(local_cache),
+        "local": local_cache.stats(),
+        "redis": {prefix: dict(counts) for prefix, counts in _redis_stats.items()},
+    }
+
+def handle_invalidation(message: Union[bytes, str]) -> None:
+    """Apply an invalidation message published by another process"""
+    if isinstance(message, bytes):
+        message = message.decode()
+    sender, _, key = message.partition(":")
+    if sender == INSTANCE_ID:
+        return
+    if key == "*":
+        local_cache.clear()
+    else:
+        local_cache.delete(key)
+
+async def listen_for_invalidations() -> None:
+    """Evict local entries changed by other processes until cancelled"""
+    while True:
+        pubsub = redis.pubsub()
+        try:
+            await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+            # Messages may have been missed while disconnected
+            local_cache.clear()
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    handle_invalidation(message["data"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Cache invalidation listener error: {str(e)}")
+            local_cache.clear()
+            await asyncio.sleep(1)
+        finally:
+            await pubsub.aclose()
+
+class CachedUpstreamError(Exception):
+    """Raised while an upstream failure is negatively cached"""
+
+# Cache key -> fetch in progress, so concurrent misses and refreshes share one upstream call
+_inflight: Dict[str, "asyncio.Task[Any]"] = {}
+
+def payload_hash(value: Any) -> str:
+    """Strong validator for a cached payload"""
+    return hashlib.blake2b(encode(value), digest_size=16).hexdigest()
+
+def _is_error(value: Any) -> bool:
+    return isinstance(value, dict) and "error" in value
+
+def _is_envelope(value: Any) -> bool:
+    return isinstance(value, dict) and "t" in value and "e" in value
+
+async def _store(key: str, envelope: Dict[str, Any], expire: int, tags: List[str]) -> None:
+    """Write an envelope; a cache outage must not fail the upstream call"""
+    try:
+        await set_cache(key, envelope, expire=expire, tags=tags)
+    except Exception as e:
+        logger.warning(f"Could not cache {key}: {str(e)}")
+
+# Deletes a lock only if it still holds the caller's token
+RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+async def _acquire_lock(key: str) -> Optional[str]:
+    """Take the recompute lock for a key.
+
+    Returns a token, "" when Redis is unavailable (compute without a lock), or
+    None when another worker holds the lock.
+    """
+    token = uuid.uuid4().hex
+    try:
+        acquired = await redis.set(f"lock:{key}", token, nx=True, px=settings.CACHE_LOCK_TTL_MS)
+    except Exception as e:
+        logger.warning(f"Could not lock {key}: {str(e)}")
+        return ""
+    return token if acquired else None
+
+async def _release_lock(key: str, token: str) -> None:
+    if not token:
+        return
+    try:
+        await redis.eval(RELEASE_LOCK_SCRIPT, 1, f"lock:{key}", token)
+    except Exception as e:
+        logger.warning(f"Could not release lock on {key}: {str(e)}")
+
+async def _wait_for_envelope(key: str) -> Optional[Dict[str, Any]]:
+    """Poll for the value another worker is computing, up to the lock TTL"""
+    deadline = time.monotonic() + settings.CACHE_LOCK_TTL_MS / 1000
+    while time.monotonic() < deadline:
+        await asyncio.sleep(settings.CACHE_LOCK_POLL_INTERVAL)
+        try:
+            envelope = await get_cache(key)
+        except Exception:
+            return None
+        if _is_envelope(envelope):
+            return envelope
+    return None
+
+def _should_refresh_early(envelope: Dict[str, Any], now: float) -> bool:
+    """XFetch: refresh before expiry with a probability that grows as expiry nears.
+
+    Keys that take longer to compute (delta "d") start refreshing earlier.
+    """
+    delta = envelope.get("d") or 0
+    if delta <= 0:
+        return False
+    return now - delta * settings.CACHE_XFETCH_BETA * math.log(1.0 - random.random()) >= envelope["e"]
+
+async def _fetch_and_store(
+    key: str,
+    fetch: Callable[[], Awaitable[Any]],
+    soft_ttl: int,
+    hard_ttl: int,
+    error_ttl: int,
+    tags: List[str],
+    stale: Optional[Dict[str, Any]]
+) -> Any:
+    """Call upstream under the recompute lock and write the result envelope.
+
+    Only the lock holder calls upstream. Refreshes that lose the lock keep the
+    stale value, and misses wait for the holder's result. Failures are cached
+    for error_ttl. When a stale value exists it is kept and its next refresh is
+    pushed back by error_ttl instead.
+    """
+    token = await _acquire_lock(key)
+    if token is None:
+        if stale is not None:
+            return stale["v"]
+        envelope = await _wait_for_envelope(key)
+        if envelope is not None:
+            if "x" in envelope:
+                raise CachedUpstreamError(envelope["x"])
+            return envelope["v"]
+        # The lock holder did not finish in time; compute the value here
+        token = ""
+
+    try:
+        now = time.time()
+        try:
+            value = await fetch()
+            error = None if not _is_error(value) else value
+        except Exception as e:
+            value, error = None, e
+        delta = time.time() - now
+
+        if error is None:
+            envelope = {"v": value, "t": now, "e": now + soft_ttl, "d": delta, "h": payload_hash(value)}
+            await _store(key, envelope, hard_ttl, tags)
+            return value
+
+        if stale is not None:
+            remaining = int(hard_ttl - (now - stale["t"]))
+            if remaining > 0:
+                await _store(key, {**stale, "e": now + error_ttl}, remaining, tags)
+        elif isinstance(error, Exception):
+            await _store(key, {"v": None, "x": str(error), "t": now, "e": now + error_ttl}, error_ttl, tags)
+        else:
+            await _store(key, {"v": value, "t": now, "e": now + error_ttl}, error_ttl, tags)
+
+        if isinstance(error, Exception):
+            raise error
+        return value
+    finally:
+        await _release_lock(key, token)
+
+# Fire-and-forget tasks are referenced here until they finish
+_background: Set["asyncio.Task[Any]"] = set()
+
+def _start_background(coroutine: Awaitable[Any]) -> None:
+    task = asyncio.ensure_future(coroutine)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+def _start_fetch(key: str, fetch: Callable[[], Awaitable[Any]], *options: Any) -> "asyncio.Task[Any]":
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_fetch_and_store(key, fetch, *options))
+        _inflight[key] = task
+
+        def done(finished: "asyncio.Task[Any]") -> None:
+            _inflight.pop(key, None)
+            if not finished.cancelled() and finished.exception():
+                logger.warning(f"Cache refresh for {key} failed: {finished.exception()}")
+
+        task.add_done_callback(done)
+    return task
+
+async def _call_with_own_session(func: Callable[..., Awaitable[Any]], bound: inspect.BoundArguments) -> Any:
+    """Call func on a session of its own.
+
+    Cached fetches can outlive the request (background refreshes, shielded
+    misses, callers waiting on another request's fetch), so they never use the
+    request's session.
+    """
+    async with AsyncSessionLocal() as session:
+        bound.arguments["db"] = session
+        return await func(*bound.args, **bound.kwargs)
+
+# Prefix -> cached function without a self argument, for warming
+_cached_functions: Dict[str, Callable[..., Awaitable[Any]]] = {}
+
+def cached_functions() -> Dict[str, Callable[..., Awaitable[Any]]]:
+    """Cached functions that can be called directly to warm their entries"""
+    return dict(_cached_functions)
+
+async def _record_access(prefix: str, arguments: Dict[str, Any]) -> None:
+    """Count a sampled call so the warmer can find the most requested shapes"""
+    member = orjson.dumps({"p": prefix, "a": arguments}, option=orjson.OPT_SORT_KEYS, default=str)
+    try:
+        await redis.zincrby(ACCESS_COUNTS_KEY, 1, member)
+    except Exception as e:
+        logger.warning(f"Could not record cache access: {str(e)}")
+
+async def top_accessed(limit: int) -> List[Tuple[str, Dict[str, Any]]]:
+    """Most requested (prefix, arguments) shapes, trimming the rest"""
+    members = await redis.zrevrange(ACCESS_COUNTS_KEY, 0, limit - 1)
+    await redis.zremrangebyrank(ACCESS_COUNTS_KEY, 0, -(settings.CACHE_ACCESS_TRACKED + 1))
+    shapes = [orjson.loads(member) for member in members]
+    return [(shape["p"], shape["a"]) for shape in shapes]
+
+def cached(
+    prefix: str,
+    soft_ttl: int,
+    hard_ttl: Optional[int] = None,
+    error_ttl: int = 60,
+    tags: Optional[Callable[[Dict[str, Any]], Iterable[str]]] = None
+) -> Callable:
+    """Stale-while-revalidate caching for async route and client functions.
+
+    Values younger than soft_ttl are served directly. Older values are served
+    immediately while a background task refreshes them, until hard_ttl drops
+    them from Redis. Hot keys may start that refresh shortly before soft_ttl,
+    and a Redis lock keeps one recompute per key across workers. Results with
+    an "error" key and raised exceptions are cached for error_ttl. self, cls and
+    db arguments are left out of the key, and a db argument is replaced by a
+    session the fetch opens itself. tags, if given, maps the call's
+    arguments to invalidation tags. The wrapper's refresh() recomputes and
+    stores a value regardless of what is cached.
+    """
+    hard_ttl = hard_ttl or settings.CACHE_TTL
+
+    def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+        signature = inspect.signature(func)
+        warmable = "self" not in signature.parameters
+        uses_session = "db" in signature.parameters
+
+        def prepare(args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[str, Dict[str, Any], Callable, Tuple]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = {
+                name: value for name, value in bound.arguments.items()
+                if name not in CACHE_KEY_EXCLUDE
+            }
+            key = generate_cache_key(prefix, **arguments)
+            if uses_session:
+                # Drop the caller's session so the fetch cannot hold on to it
+                bound.arguments["db"] = None
+                fetch = functools.partial(_call_with_own_session, func, bound)
+            else:
+                fetch = functools.partial(func, *args, **kwargs)
+            options = (soft_ttl, hard_ttl, error_ttl, list(tags(arguments)) if tags else [])
+            return key, arguments, fetch, options
+
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> Any:
+            key, arguments, fetch, options = prepare(args, kwargs)
+            if warmable and random.random() < settings.CACHE_ACCESS_SAMPLE_RATE:
+                _start_background(_record_access(prefix, arguments))
+
+            # The outermost cached route in a request provides its HTTP validators
+            validator = response_validator.get()
+            if validator is None or not warmable or "owner" in validator:
+                validator = None
+            else:
+                validator["owner"] = key
+
+            try:
+                envelope = await get_cache(key)
+            except Exception as e:
+                logger.warning(f"Cache read for {key} failed: {str(e)}")
+                envelope = None
+
+            if _is_envelope(envelope):
+                if "x" in envelope:
+                    raise CachedUpstreamError(envelope["x"])
+                now = time.time()
+                if now >= envelope["e"] or _should_refresh_early(envelope, now):
+                    _start_fetch(key, fetch, *options, envelope)
+                if validator is not None and "h" in envelope:
+                    validator.update(etag=envelope["h"], modified=envelope["t"])
+                    requested = validator.get("if_none_match", ())
+                    if envelope["h"] in requested or "*" in requested:
+                        # Skip serializing a payload the client already has
+                        return Response(status_code=304)
+                return envelope["v"]
+
+            value = await asyncio.shield(_start_fetch(key, fetch, *options, None))
+            if validator is not None and not _is_error(value):
+                validator.update(etag=payload_hash(value), modified=time.time())
+            return value
+
+        async def refresh(*args: Any, **kwargs: Any) -> Any:
+            key, _, fetch, options = prepare(args, kwargs)
+            return await _fetch_and_store(key, fetch, *options, None)
+
+        wrapper.refresh = refresh
+        if warmable:
+            _cached_functions[prefix] = wrapper
+        return wrapper
+
+    return decorator
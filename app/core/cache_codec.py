@@ -0,0 +1,65 @@
+"""Versioned binary encoding for cached values"""
+import hashlib
+import json
+from decimal import Decimal
+from typing import Any, Callable, Dict
+
+import orjson
+import zstandard
+
+from app.core.config import settings
+
+# Leading byte of every encoded value; entries written before versioning are plain JSON
+VERSION_ORJSON = 0x01
+VERSION_ORJSON_ZSTD = 0x02
+
+_compressor = zstandard.ZstdCompressor(level=settings.CACHE_COMPRESS_LEVEL)
+_decompressor = zstandard.ZstdDecompressor()
+
+def _default(value: Any) -> Any:
+    """Encode values orjson does not handle natively"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def _dumps(value: Any) -> bytes:
+    return orjson.dumps(value, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+# Version byte -> decoder of the payload that follows it
+DECODERS: Dict[int, Callable[[bytes], Any]] = {
+    VERSION_ORJSON: orjson.loads,
+    VERSION_ORJSON_ZSTD: lambda data: orjson.loads(_decompressor.decompress(data)),
+}
+
+def encode(value: Any) -> bytes:
+    """Serialize a value, compressing it above the configured size threshold"""
+    payload = _dumps(value)
+    if len(payload) < settings.CACHE_COMPRESS_THRESHOLD:
+        return bytes([VERSION_ORJSON]) + payload
+    return bytes([VERSION_ORJSON_ZSTD]) + _compressor.compress(payload)
+
+def decode(data: bytes) -> Any:
+    """Deserialize a value written by encode or by the legacy JSON encoder"""
+    decoder = DECODERS.get(data[0]) if data else None
+    if decoder is None:
+        return json.loads(data)
+    return decoder(data[1:])
+
+def _canonical(value: Any) -> Any:
+    """Normalize arguments so equivalent calls encode identically.
+
+    Lists, tuples and sets are treated as unordered filter values and sorted.
+    """
+    if isinstance(value, dict):
+        return {str(key): _canonical(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        items = [_canonical(item) for item in value]
+        return sorted(items, key=lambda item: orjson.dumps(item, option=orjson.OPT_SORT_KEYS, default=str))
+    return value
+
+def hash_params(params: Dict[str, Any]) -> str:
+    """Stable digest of keyword arguments for use in cache keys"""
+    canonical = orjson.dumps(_canonical(params), option=orjson.OPT_SORT_KEYS, default=str)
+    return hashlib.blake2b(canonical, digest_size=16).hexdigest()
@@ -1,4 +1,4 @@
-from typing import List
+from typing import Any, Dict, List
 from pydantic_settings import BaseSettings
 from functools import lru_cache
 from typing import Optional
@@ -18,6 +18,8 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "opendoge"
     DATABASE_URL: str = f"postgresql://{POSTGRES_USER}:{POSTGRES_PASSWORD}@{POSTGRES_SERVER}/{POSTGRES_DB}"
+    DB_QUERY_CACHE_SIZE: int = 1200  # Compiled statements kept by SQLAlchemy per engine
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 500  # Prepared statements kept by asyncpg per connection
     
     # Redis settings
     REDIS_HOST: str = "localhost"
@@ -25,6 +27,28 @@ class Settings(BaseSettings):
     REDIS_DB: int = 0
     REDIS_URL: str = f"redis://{REDIS_HOST}:{REDIS_PORT}/{REDIS_DB}"
     
+    # Cache settings
+    CACHE_TTL: int = 3600  # Default Redis expiry in seconds
+    CACHE_L1_MAX_ENTRIES: int = 10000  # In-process entries kept per worker
+    CACHE_L1_TTL: int = 30  # Default seconds a value is served from process memory
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    CACHE_COMPRESS_THRESHOLD: int = 1024  # Encoded bytes above which values are zstd-compressed
+    CACHE_COMPRESS_LEVEL: int = 3
+    CACHE_TAG_TTL: int = 86400  # Lifetime of tag membership sets; at least the longest entry TTL
+    CACHE_LOCK_TTL_MS: int = 15000  # Recompute lock lifetime; waiters give up after this long
+    CACHE_LOCK_POLL_INTERVAL: float = 0.05  # Seconds between waiter polls
+    CACHE_XFETCH_BETA: float = 1.0  # Higher values refresh hot keys earlier
+    DIMENSION_CACHE_MAX_ENTRIES: int = 50000  # Dimension keys kept in process memory, per dimension
+    CACHE_ACCESS_SAMPLE_RATE: float = 0.05  # Share of cached calls counted for warming
+    CACHE_ACCESS_TRACKED: int = 1000  # Query shapes kept in the access counts
+    CACHE_WARM_TOP_N: int = 20  # Most requested shapes warmed after each collection cycle
+    # Always warmed, whatever the access counts say: the dashboard's first-paint queries
+    CACHE_WARM_QUERIES: List[Dict[str, Any]] = [
+        {"prefix": "recent_awards", "args": {"limit": 50, "days": 30, "min_amount": 1000000}},
+        {"prefix": "current_debt", "args": {}},
+        {"prefix": "historical_debt", "args": {"days": 30}},
+    ]
+    
     # USAspending API settings
     USASPENDING_API_URL: str = "https://api.usaspending.gov/api/v2"
     TREASURY_API_URL: str = "https://api.fiscaldata.treasury.gov/services/api/fiscal_service/v1"
@@ -47,10 +71,36 @@ class Settings(BaseSettings):
     SEC_EDGAR_API_URL: str = "https://data.sec.gov/api"
     SEC_USER_AGENT: str = "OpenDOGE/1.0.0"
     
+    # XAI API settings
+    XAI_API_URL: str = "https://api.xai.com/v1"
+    XAI_API_KEY: str = ""
+    XAI_TIMEOUT: float = 10.0  # Per-request ceiling; smart search budgets its own calls tighter
+    XAI_MAX_CONNECTIONS: int = 20
+    
+    # Award detail settings
+    AWARD_DETAIL_CONCURRENCY: int = 10  # Upstream detail fetches in flight per batch request
+    AWARD_DETAIL_MAX_AGE: int = 7 * 86400  # Stored detail payloads older than this are refetched
+    AWARD_DOSSIER_DEADLINE: float = 4.0  # Seconds a dossier waits for its related sections
+    
+    # Smart search settings
+    SMART_SEARCH_DEADLINE: float = 5.0  # Seconds a smart search may take end to end
+    SMART_SEARCH_PARSE_BUDGET: float = 2.0  # Seconds of the deadline the model gets to parse the query
+    SMART_SEARCH_PARSER_CONFIDENCE: float = 0.8  # Local parses at or above this skip the model
+    SMART_SEARCH_CACHE_TTL: int = 7 * 86400  # Lifetime of cached model responses
+    SMART_SEARCH_CACHE_MAX_ENTRIES: int = 50000  # Least recently used queries beyond this are evicted
+    
     # Data collection settings
     COLLECTION_INTERVAL: int = 3600  # 1 hour in seconds
     MAX_RETRIES: int = 3
     RETRY_DELAY: int = 300  # 5 minutes in seconds
+    
+    # Columnar analytics settings
+    PARQUET_DATA_DIR: str = "data/processed"
+    
+    # Raw payload archival settings
+    RAW_DATA_ARCHIVE_DIR: str = "data/archive"
+    RAW_DATA_HOT_DAYS: int = 90  # Payloads untouched for longer are moved to the archive
+    RAW_DATA_ARCHIVE_LEVEL: int = 10  # zstd compression level
 
     class Config:
         env_file = ".env"
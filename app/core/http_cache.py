@@ -0,0 +1,118 @@
+"""ETag, Last-Modified and Cache-Control handling for cacheable API routes"""
+import hashlib
+from email.utils import formatdate
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import cache_tag, data_versions, response_validator
+from app.core.logger import logger
+
+# Path prefix -> (Cache-Control, data version tags). Routes without tags get their
+# validators from the cached decorator; tagged routes are stamped with the versions
+# the collector bumps, so a 304 is answered before the route runs.
+ROUTE_POLICIES: Sequence[Tuple[str, str, Tuple[str, ...]]] = (
+    ("/api/v1/treasury/debt/", "public, max-age=60, stale-while-revalidate=600", ()),
+    ("/api/v1/usaspending/awards/recent", "public, max-age=60, stale-while-revalidate=300", ()),
+    ("/api/v1/usaspending/search", "public, max-age=60, stale-while-revalidate=300", ()),
+    ("/api/v1/government-data/contract-opportunities", "public, max-age=300",
+     (cache_tag("source", "fbo"),)),
+    ("/api/v1/government-data/subawards", "public, max-age=300",
+     (cache_tag("source", "fsrs"),)),
+    ("/api/v1/government-data/economic-indicators", "public, max-age=300",
+     (cache_tag("source", "fred"),)),
+    ("/api/v1/government-data/company-", "public, max-age=300",
+     (cache_tag("source", "sec"),)),
+    ("/api/v1/government-data/contractor-graph/", "public, max-age=300",
+     (cache_tag("source", "fsrs"), cache_tag("source", "usaspending"))),
+)
+
+def parse_if_none_match(value: Optional[str]) -> Set[str]:
+    """Opaque tags from an If-None-Match header, ignoring weak markers"""
+    if not value:
+        return set()
+    tags = set()
+    for item in value.split(","):
+        item = item.strip()
+        if item.startswith("W/"):
+            item = item[2:]
+        tags.add(item.strip('"'))
+    return tags
+
+class ConditionalResponseMiddleware:
+    """Adds validators and Cache-Control to GET responses and answers If-None-Match with 304"""
+
+    def __init__(self, app: ASGIApp, policies: Sequence[Tuple[str, str, Tuple[str, ...]]] = ROUTE_POLICIES):
+        self.app = app
+        self.policies = policies
+
+    def _policy(self, path: str) -> Optional[Tuple[str, Tuple[str, ...]]]:
+        for prefix, cache_control, tags in self.policies:
+            if path.startswith(prefix):
+                return cache_control, tags
+        return None
+
+    async def _versioned_etag(self, scope: Scope, tags: Tuple[str, ...]) -> Optional[str]:
+        try:
+            versions = await data_versions(tags)
+        except Exception as e:
+            logger.warning(f"Could not read data versions: {str(e)}")
+            return None
+        material = b"|".join([
+            scope["path"].encode(),
+            scope.get("query_string", b""),
+            ",".join(str(version) for version in versions).encode(),
+        ])
+        return hashlib.blake2b(material, digest_size=16).hexdigest()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("GET", "HEAD"):
+            await self.app(scope, receive, send)
+            return
+        policy = self._policy(scope["path"])
+        if policy is None:
+            await self.app(scope, receive, send)
+            return
+
+        cache_control, tags = policy
+        validator: Dict[str, Any] = {
+            "if_none_match": parse_if_none_match(Headers(scope=scope).get("if-none-match"))
+        }
+        if tags:
+            etag = await self._versioned_etag(scope, tags)
+            if etag:
+                validator["etag"] = etag
+                # Claimed so cached functions called by the route do not override it
+                validator["owner"] = scope["path"]
+                requested = validator["if_none_match"]
+                if etag in requested or "*" in requested:
+                    await self._send_not_modified(send, cache_control, etag)
+                    return
+
+        async def send_with_validators(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] in (200, 304):
+                headers = MutableHeaders(scope=message)
+                headers["Cache-Control"] = cache_control
+                if validator.get("etag"):
+                    headers["ETag"] = f'"{validator["etag"]}"'
+                if validator.get("modified"):
+                    headers["Last-Modified"] = formatdate(validator["modified"], usegmt=True)
+            await send(message)
+
+        token = response_validator.set(validator)
+        try:
+            await self.app(scope, receive, send_with_validators)
+        finally:
+            response_validator.reset(token)
+
+    async def _send_not_modified(self, send: Send, cache_control: str, etag: str) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": 304,
+            "headers": [
+                (b"cache-control", cache_control.encode()),
+                (b"etag", f'"{etag}"'.encode()),
+            ],
+        })
+        await send({"type": "http.response.body", "body": b""})
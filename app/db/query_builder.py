@@ -0,0 +1,75 @@
+"""Cached select statements for routes with optional filters"""
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from sqlalchemy import Column, bindparam, func, select
+from sqlalchemy.sql import Select
+
+# Filter operator -> builder of the WHERE clause for a bound parameter
+OPERATORS = {
+    "eq": lambda column, param: column == param,
+    "gte": lambda column, param: column >= param,
+    "lte": lambda column, param: column <= param,
+    "lt": lambda column, param: column < param,
+    "contains": lambda column, param: column.ilike(param),
+    # pg_trgm similarity; served by the trigram GIN indexes
+    "similar": lambda column, param: column.op("%")(param),
+}
+
+class FilteredQuery:
+    """Builds a select per combination of active filters and reuses it across requests.
+
+    Filter values are passed as bound parameters, so requests with the same filter
+    shape share one statement object. SQLAlchemy then skips rebuilding and
+    recompiling it, and the driver can reuse its prepared statement.
+    """
+
+    def __init__(self, model: Any, filters: Dict[str, Tuple[Column, str]], max_size: int = 256):
+        self.model = model
+        self.filters = filters
+        self.max_size = max_size
+        self._statements: "OrderedDict[Tuple, Select]" = OrderedDict()
+
+    def _build(self, columns: Sequence[Column], active: Tuple[Tuple[str, str], ...]) -> Select:
+        query = select(*columns)
+        for name, operator in active:
+            column = self.filters[name][0]
+            param = bindparam(name)
+            query = query.where(OPERATORS[operator](column, param))
+            if operator == "similar":
+                query = query.order_by(func.similarity(column, param).desc())
+        return query
+
+    def build(
+        self,
+        columns: Sequence[Column],
+        values: Dict[str, Any],
+        operators: Optional[Dict[str, str]] = None
+    ) -> Tuple[Select, Dict[str, Any]]:
+        """Get the statement for the active filters and its parameters"""
+        operators = operators or {}
+        active = tuple(
+            (name, operators.get(name, self.filters[name][1]))
+            for name in self.filters
+            if values.get(name)
+        )
+        params = {
+            name: f"%{values[name]}%" if operator == "contains" else values[name]
+            for name, operator in active
+        }
+        key = (tuple(column.key for column in columns), active)
+
+        query = self._statements.get(key)
+        if query is not None:
+            self._statements.move_to_end(key)
+            return query, params
+
+        query = self._build(columns, active)
+        self._statements[key] = query
+        if len(self._statements) > self.max_size:
+            self._statements.popitem(last=False)
+        return query, params
+
+    def cache_size(self) -> int:
+        """Number of cached statements"""
+        return len(self._statements)
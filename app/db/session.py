@@ -1,12 +1,23 @@
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
 
+def _database_url():
+    """Database URL with driver-side statement caching enabled where supported"""
+    url = make_url(settings.DATABASE_URL)
+    if url.drivername == "postgresql+asyncpg" and "prepared_statement_cache_size" not in url.query:
+        url = url.update_query_dict({
+            "prepared_statement_cache_size": str(settings.DB_PREPARED_STATEMENT_CACHE_SIZE)
+        })
+    return url
+
 # Create async engine
 engine = create_async_engine(
-    settings.DATABASE_URL,
+    _database_url(),
     echo=settings.DEBUG,
-    future=True
+    future=True,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE
 )
 
 # Create async session factory
@@ -24,4 +35,4 @@ async def get_db():
         try:
             yield session
         finally:
-            await session.close() 
\ No newline at end of file
+            await session.close() 
@@ -0,0 +1,20 @@
+"""Server-side cursor helpers for reading large result sets in chunks"""
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from sqlalchemy.sql import Select
+
+from app.db.session import AsyncSessionLocal
+
+# Rows fetched from the server-side cursor per chunk
+DEFAULT_CHUNK_SIZE = 500
+
+async def iter_row_chunks(
+    query: Select,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    params: Optional[Dict[str, Any]] = None
+) -> AsyncIterator[List[Dict[str, Any]]]:
+    """Yield result mappings in chunks from a server-side cursor"""
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(query, params, execution_options={"yield_per": chunk_size})
+        async for partition in result.mappings().partitions(chunk_size):
+            yield [dict(row) for row in partition]
@@ -1,10 +1,15 @@
+import asyncio
 from fastapi import FastAPI, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 
-from app.api.v1 import usaspending, treasury, government_data
+from app.api.v1 import usaspending, treasury, government_data, exports
+from app.api.endpoints import analytics
+from app.core.cache import listen_for_invalidations
 from app.core.config import settings
+from app.core.http_cache import ConditionalResponseMiddleware
+from app.services.ai.smart_search import close_xai_client
 
 app = FastAPI(
     title="OpenDOGE",
@@ -12,6 +17,9 @@ app = FastAPI(
     version="1.0.0"
 )
 
+# Conditional responses; added before CORS so 304s still carry CORS headers
+app.add_middleware(ConditionalResponseMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -35,6 +43,21 @@ app.include_router(
     prefix="/api/v1/government-data",
     tags=["Government Data"]
 )
+app.include_router(analytics.router, prefix="/api/v1/analytics", tags=["Analytics"])
+app.include_router(exports.router, prefix="/api/v1/exports", tags=["Exports"])
+
+@app.on_event("startup")
+async def start_cache_invalidation():
+    """Keep this worker's in-process cache in sync with other workers"""
+    app.state.cache_listener = asyncio.create_task(listen_for_invalidations())
+
+@app.on_event("shutdown")
+async def stop_cache_invalidation():
+    app.state.cache_listener.cancel()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    await close_xai_client()
 
 @app.get("/")
 async def root(request: Request):
@@ -1,22 +1,57 @@
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, Computed, Index
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from app.db.base_class import Base
 
+# Weighted document for local full-text search: description ranks above recipient, then agency
+AWARD_SEARCH_DOCUMENT = (
+    "setweight(to_tsvector('english', coalesce(description, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(recipient_name, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(awarding_agency, '')), 'C')"
+)
+
 class Award(Base):
     """Model for storing USAspending award data"""
     __tablename__ = "awards"
+    __table_args__ = (
+        Index("ix_awards_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     award_id = Column(String, unique=True, index=True)
+    generated_unique_award_id = Column(String, index=True)  # USAspending key for the award detail endpoint
     description = Column(String)
     award_amount = Column(Float)
     recipient_name = Column(String)
+    recipient_key = Column(String, index=True)  # UEI, DUNS or normalized name; see contractor graph
     awarding_agency = Column(String)
     funding_agency = Column(String)
     award_type = Column(String)
     start_date = Column(DateTime)
     end_date = Column(DateTime)
     recipient_state = Column(String)
+    # Dimension keys (dim_* tables live in app.models.base metadata; FKs are enforced by migration 007)
+    awarding_agency_id = Column(Integer, index=True)
+    funding_agency_id = Column(Integer)
+    recipient_id = Column(Integer, index=True)
+    award_type_id = Column(Integer)
+    recipient_state_id = Column(Integer, index=True)
     raw_data = Column(JSON)  # Store complete API response
+    raw_data_ref = Column(String)  # Archive pointer once raw_data moves to cold storage
+    detail_data = Column(JSON)  # Award detail response, stored apart from the search row
+    detail_fetched_at = Column(DateTime)
+    search_vector = Column(TSVECTOR, Computed(AWARD_SEARCH_DOCUMENT, persisted=True))
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow) 
\ No newline at end of file
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class AwardIngestionWindow(Base):
+    """Model for recording which award search windows have been ingested locally"""
+    __tablename__ = "award_ingestion_windows"
+
+    id = Column(Integer, primary_key=True, index=True)
+    start_date = Column(DateTime, index=True)
+    end_date = Column(DateTime, index=True)
+    min_amount = Column(Float)
+    award_types = Column(JSON)
+    award_count = Column(Integer)
+    completed_at = Column(DateTime, default=datetime.utcnow)
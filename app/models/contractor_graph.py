@@ -0,0 +1,23 @@
+"""Database models for the prime-to-subaward contractor graph"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime, Index, UniqueConstraint
+from app.models.base import Base
+
+class ContractorEdge(Base):
+    """Aggregated subcontracting relationship from a prime recipient to a subrecipient"""
+    __tablename__ = "contractor_edges"
+    __table_args__ = (
+        UniqueConstraint("source_key", "target_key", name="uq_contractor_edges_source_target"),
+        # Adjacency lookups in either direction, heaviest edges first
+        Index("ix_contractor_edges_source_amount", "source_key", "total_amount"),
+        Index("ix_contractor_edges_target_amount", "target_key", "total_amount"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_key = Column(String, nullable=False)  # Prime recipient key
+    target_key = Column(String, nullable=False)  # Subrecipient key
+    source_name = Column(String)
+    target_name = Column(String)
+    total_amount = Column(Float, default=0)
+    award_count = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
@@ -0,0 +1,34 @@
+"""Database models for Treasury debt time series"""
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Float, DateTime, UniqueConstraint
+from app.models.base import Base
+
+class DebtRecord(Base):
+    """Model for daily Debt to the Penny records"""
+    __tablename__ = "debt_records"
+
+    id = Column(Integer, primary_key=True, index=True)
+    record_date = Column(DateTime, unique=True, index=True)
+    total_debt = Column(Float)
+    debt_held_public = Column(Float)
+    intragov_holdings = Column(Float)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class DebtRollup(Base):
+    """Model for precomputed weekly, monthly and fiscal-year debt rollups"""
+    __tablename__ = "debt_rollups"
+    __table_args__ = (
+        UniqueConstraint("resolution", "period_start", name="uq_debt_rollups_resolution_period"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    resolution = Column(String)  # week, month or fiscal_year
+    period_start = Column(DateTime)
+    period_end = Column(DateTime)  # Last record date within the period
+    total_debt = Column(Float)  # Closing values for the period
+    debt_held_public = Column(Float)
+    intragov_holdings = Column(Float)
+    avg_total_debt = Column(Float)
+    min_total_debt = Column(Float)
+    max_total_debt = Column(Float)
+    record_count = Column(Integer)
@@ -0,0 +1,31 @@
+"""Dimension tables for values repeated across fact rows"""
+from sqlalchemy import Column, Integer, String
+from app.models.base import Base
+
+class Agency(Base):
+    """Agency dimension keyed by agency name"""
+    __tablename__ = "dim_agencies"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+
+class Recipient(Base):
+    """Recipient dimension keyed by recipient name"""
+    __tablename__ = "dim_recipients"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String, unique=True, nullable=False)
+
+class Location(Base):
+    """Location dimension keyed by state code"""
+    __tablename__ = "dim_locations"
+
+    id = Column(Integer, primary_key=True)
+    state_code = Column(String, unique=True, nullable=False)
+
+class AwardType(Base):
+    """Award type dimension keyed by award type code"""
+    __tablename__ = "dim_award_types"
+
+    id = Column(Integer, primary_key=True)
+    code = Column(String, unique=True, nullable=False)
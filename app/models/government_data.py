@@ -1,8 +1,9 @@
 """Database models for government data sources"""
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, DateTime, JSON, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.models.base import Base
+from app.models import dimensions  # noqa: F401  Registers dim_* tables for the foreign keys below
 
 class ContractOpportunity(Base):
     """Model for contract opportunities from FPDS and FBO"""
@@ -13,6 +14,7 @@ class ContractOpportunity(Base):
     title = Column(String)
     description = Column(String)
     agency = Column(String)
+    agency_id = Column(Integer, ForeignKey("dim_agencies.id"), index=True)
     status = Column(String)
     posted_date = Column(DateTime)
     response_deadline = Column(DateTime)
@@ -27,11 +29,21 @@ class ContractOpportunity(Base):
 class Subaward(Base):
     """Model for subaward data from FSRS"""
     __tablename__ = "subawards"
+    __table_args__ = (
+        Index(
+            "ix_subawards_recipient_name_trgm",
+            "recipient_name",
+            postgresql_using="gin",
+            postgresql_ops={"recipient_name": "gin_trgm_ops"}
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     subaward_id = Column(String, unique=True, index=True)
     prime_award_id = Column(String, index=True)
     recipient_name = Column(String)
+    recipient_id = Column(Integer, ForeignKey("dim_recipients.id"), index=True)
+    recipient_key = Column(String, index=True)  # UEI, DUNS or normalized name; see contractor graph
     recipient_address = Column(String)
     amount = Column(Float)
     description = Column(String)
@@ -39,6 +51,7 @@ class Subaward(Base):
     period_of_performance_start = Column(DateTime)
     period_of_performance_end = Column(DateTime)
     raw_data = Column(JSON)
+    raw_data_ref = Column(String)  # Archive pointer once raw_data moves to cold storage
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -60,6 +73,14 @@ class EconomicIndicator(Base):
 class CompanyFiling(Base):
     """Model for SEC EDGAR filings"""
     __tablename__ = "company_filings"
+    __table_args__ = (
+        Index(
+            "ix_company_filings_company_name_trgm",
+            "company_name",
+            postgresql_using="gin",
+            postgresql_ops={"company_name": "gin_trgm_ops"}
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     cik = Column(String, index=True)
@@ -70,6 +91,7 @@ class CompanyFiling(Base):
     fiscal_year = Column(Integer)
     fiscal_period = Column(String)
     raw_data = Column(JSON)
+    raw_data_ref = Column(String)  # Archive pointer once raw_data moves to cold storage
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -87,6 +109,7 @@ class CompanyFinancial(Base):
     start_date = Column(DateTime)
     end_date = Column(DateTime)
     raw_data = Column(JSON)
+    raw_data_ref = Column(String)  # Archive pointer once raw_data moves to cold storage
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -0,0 +1,75 @@
+"""Cache of model responses keyed on a normalized form of the search query"""
+import re
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional
+
+from app.core.cache import delete_many, generate_cache_key, get_cache, redis, set_cache
+from app.core.config import settings
+from app.core.logger import logger
+from app.services.ai.query_parser import AMOUNT, STOPWORDS, amount_value
+
+# Sorted set of cached query keys scored by last use, for LRU trimming
+LRU_KEY = "query_cache:lru"
+
+# "in" separates a state code from an agency code ("in va" vs "va"), so it is kept
+NORMALIZE_STOPWORDS = STOPWORDS - {"in"}
+
+_stats: Dict[str, Dict[str, int]] = defaultdict(lambda: {"hits": 0, "misses": 0})
+
+def _number(match: re.Match) -> str:
+    value = amount_value(match.group(1), match.group(2))
+    text = f"{value:.0f}" if value == int(value) else f"{value:g}"
+    return f" {text}+ " if match.group().endswith("+") else f" {text} "
+
+def normalize_query(query: str) -> str:
+    """Canonical query text: lowercased, stopwords dropped, amounts written out in full"""
+    text = re.sub(AMOUNT, _number, query.lower())
+    words = re.findall(r"[\w&+.]+|\?", text)
+    return " ".join(word.strip(".") for word in words if word.strip(".") not in NORMALIZE_STOPWORDS)
+
+def _key(kind: str, query: str) -> str:
+    return generate_cache_key(kind, query=normalize_query(query))
+
+async def get_cached_response(kind: str, query: str) -> Optional[Any]:
+    """Cached model response for a query, counting the lookup towards the hit rate"""
+    key = _key(kind, query)
+    try:
+        value = await get_cache(key)
+        if value is not None:
+            # Extend the key with its score, so index members older than the TTL are exactly the expired keys
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zadd(LRU_KEY, {key: time.time()})
+                pipe.expire(key, settings.SMART_SEARCH_CACHE_TTL)
+                await pipe.execute()
+    except Exception as e:
+        logger.error(f"Query cache lookup failed: {str(e)}")
+        value = None
+    _stats[kind]["hits" if value is not None else "misses"] += 1
+    return value
+
+async def store_response(kind: str, query: str, value: Any) -> None:
+    """Cache a successful model response, trimming expired and least recently used index entries"""
+    key = _key(kind, query)
+    try:
+        await set_cache(key, value, expire=settings.SMART_SEARCH_CACHE_TTL)
+        now = time.time()
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zadd(LRU_KEY, {key: now})
+            pipe.zremrangebyscore(LRU_KEY, 0, now - settings.SMART_SEARCH_CACHE_TTL)
+            pipe.zrange(LRU_KEY, 0, -(settings.SMART_SEARCH_CACHE_MAX_ENTRIES + 1))
+            _, _, evicted = await pipe.execute()
+        if evicted:
+            evicted = [item.decode() if isinstance(item, bytes) else item for item in evicted]
+            await redis.zrem(LRU_KEY, *evicted)
+            await delete_many(evicted)
+    except Exception as e:
+        logger.error(f"Query cache store failed: {str(e)}")
+
+async def query_cache_stats() -> Dict[str, Any]:
+    """Hit rate per response kind and the number of cached queries"""
+    kinds = {}
+    for kind, counts in _stats.items():
+        lookups = counts["hits"] + counts["misses"]
+        kinds[kind] = {**counts, "hit_rate": round(counts["hits"] / lookups, 4) if lookups else None}
+    return {"entries": await redis.zcard(LRU_KEY), "kinds": kinds}
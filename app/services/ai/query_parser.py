@@ -0,0 +1,232 @@
+"""Rule-based parsing of natural language award searches into search parameters"""
+import re
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+# Agency codes from the search_parameters schema and the phrases that name them
+AGENCY_ALIASES = {
+    "DOD": ["department of defense", "defense department", "dod", "pentagon", "army", "navy",
+            "air force", "marine corps"],
+    "HHS": ["department of health and human services", "health and human services", "hhs"],
+    "DOE": ["department of energy", "energy department", "doe"],
+    "NASA": ["nasa"],
+    "DHS": ["department of homeland security", "homeland security", "dhs"],
+    "VA": ["department of veterans affairs", "veterans affairs", "va"],
+    "DOT": ["department of transportation", "transportation department", "dot"],
+    "DOI": ["department of the interior", "interior department", "doi"],
+}
+
+CATEGORY_TERMS = {
+    "construction": ["construction", "building", "renovation"],
+    "research": ["research", "r&d", "study", "studies"],
+    "services": ["services", "consulting", "staffing"],
+    "equipment": ["equipment", "hardware", "vehicles"],
+    "technology": ["technology", "software", "it", "cloud", "cyber", "cybersecurity"],
+    "healthcare": ["healthcare", "health care", "medical", "hospital", "pharmaceutical"],
+    "defense": ["defense", "weapons", "military", "missile", "missiles"],
+    "infrastructure": ["infrastructure", "roads", "bridges", "highway", "highways"],
+}
+
+STATES = {
+    "alabama": "AL", "alaska": "AK", "arizona": "AZ", "arkansas": "AR", "california": "CA",
+    "colorado": "CO", "connecticut": "CT", "delaware": "DE", "district of columbia": "DC",
+    "florida": "FL", "georgia": "GA", "hawaii": "HI", "idaho": "ID", "illinois": "IL",
+    "indiana": "IN", "iowa": "IA", "kansas": "KS", "kentucky": "KY", "louisiana": "LA",
+    "maine": "ME", "maryland": "MD", "massachusetts": "MA", "michigan": "MI", "minnesota": "MN",
+    "mississippi": "MS", "missouri": "MO", "montana": "MT", "nebraska": "NE", "nevada": "NV",
+    "new hampshire": "NH", "new jersey": "NJ", "new mexico": "NM", "new york": "NY",
+    "north carolina": "NC", "north dakota": "ND", "ohio": "OH", "oklahoma": "OK", "oregon": "OR",
+    "pennsylvania": "PA", "rhode island": "RI", "south carolina": "SC", "south dakota": "SD",
+    "tennessee": "TN", "texas": "TX", "utah": "UT", "vermont": "VT", "virginia": "VA",
+    "washington state": "WA", "west virginia": "WV", "wisconsin": "WI", "wyoming": "WY",
+}
+STATE_CODES = set(STATES.values())
+
+SORT_PHRASES = [
+    (r"top(?:\s+\d+)?|largest|biggest|highest|most expensive", ("amount", "desc")),
+    (r"smallest|lowest|cheapest", ("amount", "asc")),
+    (r"latest|newest|most recent", ("date", "desc")),
+    (r"oldest|earliest", ("date", "asc")),
+]
+
+# Schema buckets, lowest first
+MIN_AMOUNT_BUCKETS = [(1e6, "1m+"), (1e7, "10m+"), (1e8, "100m+"), (1e9, "1b+")]
+MAX_AMOUNT_BUCKETS = [(1e7, "10m"), (1e8, "100m"), (1e9, "1b"), (1e10, "10b")]
+
+UNIT_DAYS = {"day": 1, "week": 7, "month": 30, "quarter": 90, "year": 365}
+MULTIPLIERS = {
+    "k": 1e3, "thousand": 1e3, "m": 1e6, "mm": 1e6, "mil": 1e6, "million": 1e6,
+    "b": 1e9, "bn": 1e9, "billion": 1e9, "t": 1e12, "trillion": 1e12,
+}
+
+AMOUNT = r"\$?\s*(\d+(?:,\d{3})*(?:\.\d+)?)\s*(k|thousand|mm|mil|million|m|bn|billion|b|trillion|t)?\b\+?"
+MIN_WORDS = r"over|above|more than|greater than|at least|exceeding|upwards of|>=?"
+MAX_WORDS = r"under|below|less than|up to|at most|<=?"
+
+STOPWORDS = {
+    "a", "an", "the", "of", "for", "to", "from", "in", "on", "by", "with", "within", "at",
+    "show", "me", "find", "get", "list", "search", "all", "any", "what", "which", "are", "were",
+    "is", "that", "please", "contracts", "contract", "awards", "award", "awarded", "grants",
+    "spending", "federal", "government", "worth", "valued", "dollars", "usd", "and",
+}
+# Words signalling constraints the rules do not express; these go to the model
+UNSUPPORTED = {
+    "not", "without", "except", "excluding", "or", "between", "versus", "vs", "compare",
+    "why", "how", "before", "after", "since", "during", "per", "average", "total",
+}
+MAX_KEYWORD_WORDS = 4
+
+def amount_value(number: str, unit: Optional[str]) -> float:
+    """Dollar value of a matched number and unit such as ("2.5", "billion")"""
+    return float(number.replace(",", "")) * MULTIPLIERS.get((unit or "").lower(), 1)
+
+def min_amount_bucket(value: float) -> str:
+    """Largest schema minimum not above the amount"""
+    bucket = "all"
+    for threshold, name in MIN_AMOUNT_BUCKETS:
+        if value >= threshold:
+            bucket = name
+    return bucket
+
+def max_amount_bucket(value: float) -> str:
+    """Smallest schema maximum not below the amount"""
+    for threshold, name in MAX_AMOUNT_BUCKETS:
+        if value <= threshold:
+            return name
+    return ""
+
+def _phrase_pattern(phrases: List[str]) -> str:
+    ordered = sorted(phrases, key=len, reverse=True)
+    return r"(?<![\w&])(" + "|".join(re.escape(phrase) for phrase in ordered) + r")(?![\w&])"
+
+class _Text:
+    """Lowercased query whose recognized spans are blanked out as they are consumed"""
+
+    def __init__(self, query: str):
+        self.original = " ".join(query.split())
+        self.text = self.original.lower()
+
+    def take(self, pattern: str, flags: int = 0) -> Optional[re.Match]:
+        match = re.search(pattern, self.text, flags)
+        if match:
+            self.text = self.text[:match.start()] + " " * (match.end() - match.start()) + self.text[match.end():]
+        return match
+
+def _parse_days(text: _Text, today: date) -> Optional[int]:
+    match = text.take(r"\b(?:in\s+the\s+|over\s+the\s+)?(?:last|past|previous)\s+(\d+\s+)?(day|week|month|quarter|year)s?\b")
+    if match:
+        count = int(match.group(1)) if match.group(1) else 1
+        return count * UNIT_DAYS[match.group(2)]
+    match = text.take(r"\b(?:this|current)\s+(month|year)\b|\bytd\b|\byear to date\b")
+    if match:
+        start = today.replace(day=1) if match.group(1) == "month" else today.replace(month=1, day=1)
+        return (today - start).days + 1
+    if text.take(r"\btoday\b"):
+        return 1
+    if text.take(r"\brecent(?:ly)?\b"):
+        return 30
+    return None
+
+def _parse_amounts(text: _Text, params: Dict[str, Any]) -> None:
+    match = text.take(rf"\bbetween\s+{AMOUNT}\s+(?:and|to|-)\s+{AMOUNT}")
+    if match:
+        low_unit = match.group(2) or match.group(4)
+        params["min_amount"] = min_amount_bucket(amount_value(match.group(1), low_unit))
+        params["max_amount"] = max_amount_bucket(amount_value(match.group(3), match.group(4)))
+        return
+    match = text.take(rf"(?:{MIN_WORDS})\s*{AMOUNT}|{AMOUNT}(?:\s+(?:or more|and up|plus))")
+    if match is None:
+        # "10m+" style minimums
+        match = text.take(r"\$?\s*(\d+(?:,\d{3})*(?:\.\d+)?)\s*(k|mm|m|bn|b|t)\+")
+    if match:
+        number, unit = next(
+            (match.group(index), match.group(index + 1))
+            for index in range(1, len(match.groups()), 2) if match.group(index)
+        )
+        params["min_amount"] = min_amount_bucket(amount_value(number, unit))
+    match = text.take(rf"(?:{MAX_WORDS})\s*{AMOUNT}")
+    if match:
+        maximum = max_amount_bucket(amount_value(match.group(1), match.group(2)))
+        if maximum:
+            params["max_amount"] = maximum
+
+def _parse_state(text: _Text) -> Optional[str]:
+    match = text.take(_phrase_pattern(list(STATES)))
+    if match:
+        return STATES[match.group(1)]
+    # Two-letter codes only after "in", or written in capitals, so "or" and "me" stay words
+    match = re.search(r"\bin\s+([a-z]{2})\b", text.text)
+    if match and match.group(1).upper() in STATE_CODES:
+        text.take(rf"\bin\s+{match.group(1)}\b")
+        return match.group(1).upper()
+    for code in re.findall(r"\b[A-Z]{2}\b", text.original):
+        if code in STATE_CODES and code not in AGENCY_ALIASES and re.search(rf"\b{code.lower()}\b", text.text):
+            text.take(rf"\b{code.lower()}\b")
+            return code
+    return None
+
+def _parse_agency(text: _Text) -> Optional[str]:
+    aliases = {alias: code for code, names in AGENCY_ALIASES.items() for alias in names}
+    match = text.take(_phrase_pattern(list(aliases)))
+    return aliases[match.group(1)] if match else None
+
+def _parse_category(text: _Text) -> Optional[str]:
+    # Category terms stay in the keyword; they are what the upstream search matches on
+    for category, terms in CATEGORY_TERMS.items():
+        if re.search(_phrase_pattern(terms), text.text):
+            return category
+    return None
+
+def _parse_sort(text: _Text) -> Optional[Tuple[str, str]]:
+    for pattern, sort in SORT_PHRASES:
+        if text.take(rf"\b(?:{pattern})\b"):
+            # "top 10 largest" names one ordering twice
+            while text.take(rf"\b(?:{pattern})\b"):
+                pass
+            return sort
+    return None
+
+def parse_query(query: str, today: Optional[date] = None) -> Tuple[Dict[str, Any], float]:
+    """Parse a search query into search_parameters with a confidence from 0 to 1.
+
+    Confidence drops for numbers the rules could not place, words that express
+    constraints the rules cannot represent, and long free-text remainders.
+    """
+    text = _Text(query)
+    params: Dict[str, Any] = {}
+
+    _parse_amounts(text, params)
+    days = _parse_days(text, today or date.today())
+    if days:
+        params["days"] = max(1, min(days, 365))
+    state = _parse_state(text)
+    if state:
+        params["state"] = state
+    agency = _parse_agency(text)
+    if agency:
+        params["agency"] = agency
+    sort = _parse_sort(text)
+    if sort:
+        params["sort_by"], params["sort_order"] = sort
+    category = _parse_category(text)
+    if category:
+        params["category"] = category
+
+    confidence = 1.0
+    keyword: List[str] = []
+    # Lowercasing can change the length of some characters; keep the query's case otherwise
+    source = text.original if len(text.original) == len(text.text) else text.text
+    for match in re.finditer(r"[\w&$.,'-]+|\?", text.text):
+        word = match.group().strip(".,'")
+        if not word or word in STOPWORDS:
+            continue
+        if word == "?" or word in UNSUPPORTED:
+            confidence -= 0.4
+        elif re.search(r"\d", word):
+            confidence -= 0.5
+        else:
+            keyword.append(source[match.start():match.end()].strip(".,'"))
+    confidence -= 0.15 * max(0, len(keyword) - MAX_KEYWORD_WORDS)
+
+    params["keyword"] = " ".join(keyword)
+    return params, max(0.0, round(confidence, 2))
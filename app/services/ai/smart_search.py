@@ -1,15 +1,40 @@
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Set
+import asyncio
 import json
 import httpx
 from app.core.config import settings
 from app.core.logger import logger
+from app.services.ai.query_cache import get_cached_response, store_response
+from app.services.ai.query_parser import parse_query
 
-# Initialize HTTP client for XAI API
-async def get_xai_client():
-    return httpx.AsyncClient(
-        base_url="https://api.xai.com/v1",
-        headers={"Authorization": f"Bearer {settings.XAI_API_KEY}"}
-    )
+# Shared HTTP/2 client for the XAI API, created on first use
+_xai_client: Optional[httpx.AsyncClient] = None
+
+# Model calls that overran their budget; they finish in the background and fill the query cache
+_overrun: Set["asyncio.Task[Any]"] = set()
+
+def get_xai_client() -> httpx.AsyncClient:
+    """Pooled XAI API client; requests multiplex over kept-alive HTTP/2 connections"""
+    global _xai_client
+    if _xai_client is None or _xai_client.is_closed:
+        _xai_client = httpx.AsyncClient(
+            base_url=settings.XAI_API_URL,
+            headers={"Authorization": f"Bearer {settings.XAI_API_KEY}"},
+            http2=True,
+            timeout=settings.XAI_TIMEOUT,
+            limits=httpx.Limits(
+                max_connections=settings.XAI_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.XAI_MAX_CONNECTIONS
+            )
+        )
+    return _xai_client
+
+async def close_xai_client() -> None:
+    """Close the pooled XAI API client"""
+    global _xai_client
+    if _xai_client is not None:
+        await _xai_client.aclose()
+        _xai_client = None
 
 # Define comprehensive search parameters schema
 search_parameters = {
@@ -67,6 +92,15 @@ async def process_search_query(query: str) -> Dict[str, Any]:
     """
     Process a natural language search query and return structured search parameters
     """
+    local_parameters, confidence = parse_query(query)
+    if confidence >= settings.SMART_SEARCH_PARSER_CONFIDENCE:
+        logger.info(f"Parsed search query locally: {query} -> {local_parameters}")
+        return local_parameters
+
+    cached = await get_cached_response("search_params", query)
+    if cached is not None:
+        return cached
+
     try:
         system_prompt = """You are an expert at analyzing government contracts and spending data. 
         Convert natural language queries into structured search parameters. Consider:
@@ -79,48 +113,53 @@ async def process_search_query(query: str) -> Dict[str, Any]:
         
         Always maintain high precision and recall in the search results."""
 
-        async with await get_xai_client() as client:
-            response = await client.post("/chat/completions", json={
-                "model": "gpt-4",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": query
-                    }
-                ],
-                "functions": [{
-                    "name": "search_contracts",
-                    "description": "Search for federal contracts with specific parameters",
-                    "parameters": search_parameters
-                }],
-                "function_call": {"name": "search_contracts"}
-            })
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            # Extract function call arguments
-            function_call = data["choices"][0]["message"].get("function_call")
-            if function_call and function_call.get("arguments"):
-                parameters = json.loads(function_call["arguments"])
-                logger.info(f"Processed search query: {query} -> {parameters}")
-                return parameters
-            
-            logger.warning(f"No function call in response for query: {query}")
-            return {"keyword": query}  # Fallback to simple keyword search
+        client = get_xai_client()
+        response = await client.post("/chat/completions", json={
+            "model": "gpt-4",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": query
+                }
+            ],
+            "functions": [{
+                "name": "search_contracts",
+                "description": "Search for federal contracts with specific parameters",
+                "parameters": search_parameters
+            }],
+            "function_call": {"name": "search_contracts"}
+        })
+        
+        response.raise_for_status()
+        data = response.json()
+        
+        # Extract function call arguments
+        function_call = data["choices"][0]["message"].get("function_call")
+        if function_call and function_call.get("arguments"):
+            parameters = json.loads(function_call["arguments"])
+            logger.info(f"Processed search query: {query} -> {parameters}")
+            await store_response("search_params", query, parameters)
+            return parameters
+        
+        logger.warning(f"No function call in response for query: {query}")
+        return local_parameters  # Fallback to the best local parse
 
     except Exception as e:
         logger.error(f"Error processing search query: {str(e)}")
-        return {"keyword": query}  # Fallback to simple keyword search
+        return local_parameters  # Fallback to the best local parse
 
 async def get_search_suggestions(query: str) -> Dict[str, Any]:
     """
     Get intelligent search suggestions and explanations for the current query
     """
+    cached = await get_cached_response("search_suggestions", query)
+    if cached is not None:
+        return {"suggestions": cached, "original_query": query}
+
     try:
         system_prompt = """You are an expert at helping users search through government contracts.
         Provide 3-4 specific suggestions to help refine or improve the search. Consider:
@@ -132,62 +171,84 @@ async def get_search_suggestions(query: str) -> Dict[str, Any]:
         
         Make suggestions concrete and actionable."""
 
-        async with await get_xai_client() as client:
-            response = await client.post("/chat/completions", json={
-                "model": "gpt-4",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    },
-                    {
-                        "role": "user",
-                        "content": f"Current search: {query}\nProvide specific suggestions to improve this search."
-                    }
-                ],
-                "temperature": 0.7,
-                "max_tokens": 200
-            })
-            
-            response.raise_for_status()
-            data = response.json()
-            
-            suggestions = data["choices"][0]["message"]["content"].split("\n")
-            
-            # Process and structure suggestions
-            processed_suggestions = []
-            for suggestion in suggestions:
-                if suggestion.strip():
-                    # Extract any structured data if present
-                    try:
-                        if ":" in suggestion:
-                            category, text = suggestion.split(":", 1)
-                            processed_suggestions.append({
-                                "category": category.strip(),
-                                "text": text.strip(),
-                                "query": text.strip()  # The actual query to use
-                            })
-                        else:
-                            processed_suggestions.append({
-                                "category": "General",
-                                "text": suggestion.strip(),
-                                "query": suggestion.strip()
-                            })
-                    except Exception:
+        client = get_xai_client()
+        response = await client.post("/chat/completions", json={
+            "model": "gpt-4",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": f"Current search: {query}\nProvide specific suggestions to improve this search."
+                }
+            ],
+            "temperature": 0.7,
+            "max_tokens": 200
+        })
+        
+        response.raise_for_status()
+        data = response.json()
+        
+        suggestions = data["choices"][0]["message"]["content"].split("\n")
+        
+        # Process and structure suggestions
+        processed_suggestions = []
+        for suggestion in suggestions:
+            if suggestion.strip():
+                # Extract any structured data if present
+                try:
+                    if ":" in suggestion:
+                        category, text = suggestion.split(":", 1)
+                        processed_suggestions.append({
+                            "category": category.strip(),
+                            "text": text.strip(),
+                            "query": text.strip()  # The actual query to use
+                        })
+                    else:
                         processed_suggestions.append({
                             "category": "General",
                             "text": suggestion.strip(),
                             "query": suggestion.strip()
                         })
+                except Exception:
+                    processed_suggestions.append({
+                        "category": "General",
+                        "text": suggestion.strip(),
+                        "query": suggestion.strip()
+                    })
 
-            return {
-                "suggestions": processed_suggestions,
-                "original_query": query
-            }
+        await store_response("search_suggestions", query, processed_suggestions)
+        return {
+            "suggestions": processed_suggestions,
+            "original_query": query
+        }
 
     except Exception as e:
         logger.error(f"Error getting search suggestions: {str(e)}")
         return {
             "suggestions": [],
             "original_query": query
-        } 
\ No newline at end of file
+        }
+
+async def result_within(task: "asyncio.Task[Any]", timeout: float) -> Optional[Any]:
+    """Result of a task if it finishes in time; otherwise it keeps running in the background"""
+    done, _ = await asyncio.wait({task}, timeout=max(0.0, timeout))
+    if task in done:
+        return task.result()
+    _overrun.add(task)
+    task.add_done_callback(_overrun.discard)
+    return None
+
+async def process_search_query_within(query: str, budget: float) -> Dict[str, Any]:
+    """Search parameters within a time budget, falling back to the local parse if the model overruns"""
+    parameters = await result_within(asyncio.create_task(process_search_query(query)), budget)
+    if parameters is None:
+        logger.warning(f"Search query parsing exceeded {budget}s, using local parse: {query}")
+        parameters, _ = parse_query(query)
+    return parameters
+
+def start_search_suggestions(query: str) -> "asyncio.Task[Dict[str, Any]]":
+    """Fetch suggestions concurrently with the rest of a request"""
+    return asyncio.create_task(get_search_suggestions(query))
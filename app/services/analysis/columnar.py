@@ -0,0 +1,190 @@
+"""Parquet export of award, subaward and indicator data for columnar analytics"""
+import asyncio
+import shutil
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+from sqlalchemy import Integer, cast, extract, literal_column, select
+from sqlalchemy.sql import Select
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.streaming import iter_row_chunks
+from app.models.awards import Award
+from app.models.government_data import EconomicIndicator, Subaward
+from app.utils.helpers import agency_slug
+
+# Rows per export chunk; each chunk is written as its own set of partition files
+EXPORT_CHUNK_SIZE = 100000
+
+def fiscal_year_of(column: Any) -> Any:
+    """SQL expression for the federal fiscal year (starting October 1) of a date column"""
+    return cast(extract("year", column + literal_column("interval '3 months'")), Integer)
+
+def _awards_query() -> Select:
+    fiscal_year = fiscal_year_of(Award.start_date).label("fiscal_year")
+    return select(
+        Award.award_id,
+        Award.description,
+        Award.award_amount,
+        Award.recipient_name,
+        Award.awarding_agency,
+        Award.funding_agency,
+        Award.award_type,
+        Award.start_date,
+        Award.end_date,
+        Award.recipient_state,
+        fiscal_year
+    ).where(Award.start_date.isnot(None)).order_by(fiscal_year, Award.awarding_agency)
+
+def _subawards_query() -> Select:
+    fiscal_year = fiscal_year_of(Subaward.period_of_performance_start).label("fiscal_year")
+    return select(
+        Subaward.subaward_id,
+        Subaward.prime_award_id,
+        Subaward.recipient_name,
+        Subaward.amount,
+        Subaward.description,
+        Subaward.place_of_performance,
+        Subaward.period_of_performance_start,
+        Subaward.period_of_performance_end,
+        Award.awarding_agency,
+        fiscal_year
+    ).outerjoin(
+        Award, Award.award_id == Subaward.prime_award_id
+    ).where(
+        Subaward.period_of_performance_start.isnot(None)
+    ).order_by(fiscal_year, Award.awarding_agency)
+
+def _indicators_query() -> Select:
+    fiscal_year = fiscal_year_of(EconomicIndicator.date).label("fiscal_year")
+    return select(
+        EconomicIndicator.series_id,
+        EconomicIndicator.date,
+        EconomicIndicator.value,
+        EconomicIndicator.indicator_type,
+        EconomicIndicator.units,
+        EconomicIndicator.seasonally_adjusted,
+        fiscal_year
+    ).where(EconomicIndicator.date.isnot(None)).order_by(fiscal_year)
+
+# Dataset name -> (query factory, Arrow schema, partition columns)
+DATASETS: Dict[str, Any] = {
+    "awards": (
+        _awards_query,
+        pa.schema([
+            ("award_id", pa.string()),
+            ("description", pa.string()),
+            ("award_amount", pa.float64()),
+            ("recipient_name", pa.string()),
+            ("awarding_agency", pa.string()),
+            ("funding_agency", pa.string()),
+            ("award_type", pa.string()),
+            ("start_date", pa.timestamp("us")),
+            ("end_date", pa.timestamp("us")),
+            ("recipient_state", pa.string()),
+            ("fiscal_year", pa.int32()),
+            ("agency", pa.string()),
+        ]),
+        ["fiscal_year", "agency"],
+    ),
+    "subawards": (
+        _subawards_query,
+        pa.schema([
+            ("subaward_id", pa.string()),
+            ("prime_award_id", pa.string()),
+            ("recipient_name", pa.string()),
+            ("amount", pa.float64()),
+            ("description", pa.string()),
+            ("place_of_performance", pa.string()),
+            ("period_of_performance_start", pa.timestamp("us")),
+            ("period_of_performance_end", pa.timestamp("us")),
+            ("awarding_agency", pa.string()),
+            ("fiscal_year", pa.int32()),
+            ("agency", pa.string()),
+        ]),
+        ["fiscal_year", "agency"],
+    ),
+    "indicators": (
+        _indicators_query,
+        pa.schema([
+            ("series_id", pa.string()),
+            ("date", pa.timestamp("us")),
+            ("value", pa.float64()),
+            ("indicator_type", pa.string()),
+            ("units", pa.string()),
+            ("seasonally_adjusted", pa.string()),
+            ("fiscal_year", pa.int32()),
+        ]),
+        ["fiscal_year"],
+    ),
+}
+
+def rows_to_table(rows: List[Dict[str, Any]], schema: pa.Schema) -> pa.Table:
+    """Build an Arrow table from result mappings, deriving the agency partition key"""
+    if "agency" in schema.names:
+        for row in rows:
+            row["agency"] = agency_slug(row.get("awarding_agency"))
+    columns = {name: [row.get(name) for row in rows] for name in schema.names}
+    return pa.table(columns, schema=schema)
+
+class ParquetExporter:
+    """Writes database tables to hive-partitioned Parquet datasets"""
+
+    def __init__(self, base_dir: Optional[str] = None, chunk_size: int = EXPORT_CHUNK_SIZE):
+        self.base_dir = Path(base_dir or settings.PARQUET_DATA_DIR)
+        self.chunk_size = chunk_size
+
+    def _write_chunk(
+        self,
+        table: pa.Table,
+        target: Path,
+        partitioning: List[str],
+        chunk_index: int
+    ) -> None:
+        ds.write_dataset(
+            table,
+            target,
+            format="parquet",
+            partitioning=partitioning,
+            partitioning_flavor="hive",
+            basename_template=f"part-{chunk_index}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+
+    async def export(self, dataset: str) -> int:
+        """Export a dataset, replacing the previous export once the new one is complete"""
+        query_factory, schema, partitioning = DATASETS[dataset]
+        target = self.base_dir / dataset
+        staging = self.base_dir / f".{dataset}.staging"
+        shutil.rmtree(staging, ignore_errors=True)
+
+        row_count = 0
+        chunk_index = 0
+        async for rows in iter_row_chunks(query_factory(), self.chunk_size):
+            table = rows_to_table(rows, schema)
+            await asyncio.to_thread(self._write_chunk, table, staging, partitioning, chunk_index)
+            row_count += len(rows)
+            chunk_index += 1
+            logger.info(f"Exported {row_count} {dataset} rows so far...")
+
+        if chunk_index == 0:
+            logger.info(f"No {dataset} rows to export")
+            return 0
+
+        # Swap directories so readers never see a half-written dataset
+        previous = self.base_dir / f".{dataset}.previous"
+        shutil.rmtree(previous, ignore_errors=True)
+        if target.exists():
+            target.rename(previous)
+        staging.rename(target)
+        shutil.rmtree(previous, ignore_errors=True)
+
+        logger.info(f"Exported {row_count} {dataset} rows to {target}")
+        return row_count
+
+    async def export_all(self) -> Dict[str, int]:
+        """Export every dataset"""
+        return {dataset: await self.export(dataset) for dataset in DATASETS}
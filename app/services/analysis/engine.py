@@ -0,0 +1,249 @@
+"""Embedded DuckDB analytics over the Parquet award store"""
+import asyncio
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import duckdb
+
+from app.core.config import settings
+from app.utils.helpers import agency_slug
+
+# Award type codes grouped into the categories used by the analytics routes
+AWARD_CATEGORIES = {
+    "contracts": ["A", "B", "C", "D"],
+    "idvs": ["IDV_A", "IDV_B", "IDV_B_A", "IDV_B_B", "IDV_B_C", "IDV_C", "IDV_D", "IDV_E"],
+    "grants": ["02", "03", "04", "05"],
+    "direct_payments": ["06", "10"],
+    "loans": ["07", "08"],
+    "other": ["09", "11"],
+}
+
+AGENCY_METRICS = {
+    "total_spending": "SUM(award_amount)",
+    "award_count": "COUNT(*)",
+    "average_award": "AVG(award_amount)",
+    "largest_award": "MAX(award_amount)",
+    "recipient_count": "COUNT(DISTINCT recipient_name)",
+}
+
+# Anomaly category -> per-award measure; frequency scores recipients by award count instead
+ANOMALY_MEASURES = {
+    "amount": "award_amount",
+    "duration": "date_diff('day', start_date, end_date)",
+    "frequency": None,
+}
+
+def current_fiscal_year() -> int:
+    """Federal fiscal year for today's date"""
+    now = datetime.now()
+    return now.year + 1 if now.month >= 10 else now.year
+
+class AnalyticsEngine:
+    """Runs analytical queries over hive-partitioned Parquet datasets"""
+
+    def __init__(self, base_dir: Optional[str] = None):
+        self.base_dir = Path(base_dir or settings.PARQUET_DATA_DIR)
+
+    def _source(self, dataset: str) -> str:
+        if not (self.base_dir / dataset).is_dir():
+            raise FileNotFoundError(f"No Parquet export found for {dataset} under {self.base_dir}")
+        pattern = (self.base_dir / dataset / "**" / "*.parquet").as_posix().replace("'", "''")
+        return f"read_parquet('{pattern}', hive_partitioning = true)"
+
+    def _run(self, sql: str, params: List[Any]) -> List[Dict[str, Any]]:
+        connection = duckdb.connect()
+        try:
+            cursor = connection.execute(sql, params)
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+        finally:
+            connection.close()
+
+    async def query(self, sql: str, params: Optional[List[Any]] = None) -> List[Dict[str, Any]]:
+        """Run a query in a worker thread so the event loop stays responsive"""
+        return await asyncio.to_thread(self._run, sql, params or [])
+
+    def _award_filters(
+        self,
+        fiscal_years: Optional[List[int]] = None,
+        agencies: Optional[List[str]] = None,
+        category: Optional[str] = None
+    ) -> Tuple[str, List[Any]]:
+        # fiscal_year and agency are partition columns, so these filters prune whole directories
+        clauses = ["award_amount IS NOT NULL"]
+        params: List[Any] = []
+        if fiscal_years:
+            clauses.append(f"fiscal_year IN ({', '.join('?' for _ in fiscal_years)})")
+            params.extend(fiscal_years)
+        if agencies:
+            clauses.append(f"agency IN ({', '.join('?' for _ in agencies)})")
+            params.extend(agency_slug(agency) for agency in agencies)
+        if category:
+            codes = AWARD_CATEGORIES.get(category.lower(), [category])
+            clauses.append(f"award_type IN ({', '.join('?' for _ in codes)})")
+            params.extend(codes)
+        return " AND ".join(clauses), params
+
+    async def spending_trends(
+        self,
+        fiscal_year: Optional[int] = None,
+        agency: Optional[str] = None,
+        category: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Monthly award totals with optional fiscal year, agency and category filters"""
+        where, params = self._award_filters(
+            [fiscal_year] if fiscal_year else None,
+            [agency] if agency else None,
+            category
+        )
+        rows = await self.query(
+            f"""
+            SELECT strftime(date_trunc('month', start_date), '%Y-%m') AS month,
+                   SUM(award_amount) AS total_amount,
+                   COUNT(*) AS award_count
+            FROM {self._source('awards')}
+            WHERE {where}
+            GROUP BY 1
+            ORDER BY 1
+            """,
+            params
+        )
+        return {
+            "fiscal_year": fiscal_year,
+            "agency": agency,
+            "category": category,
+            "total_amount": sum(row["total_amount"] or 0 for row in rows),
+            "award_count": sum(row["award_count"] for row in rows),
+            "monthly": rows
+        }
+
+    async def seasonal_patterns(self, years: int = 5, category: Optional[str] = None) -> Dict[str, Any]:
+        """Average spending by month of the fiscal year across recent fiscal years"""
+        last_year = current_fiscal_year()
+        fiscal_years = list(range(last_year - years + 1, last_year + 1))
+        where, params = self._award_filters(fiscal_years, None, category)
+        rows = await self.query(
+            f"""
+            WITH monthly AS (
+                SELECT fiscal_year,
+                       ((month(start_date) + 2) % 12) + 1 AS fiscal_month,
+                       SUM(award_amount) AS total_amount,
+                       COUNT(*) AS award_count
+                FROM {self._source('awards')}
+                WHERE {where}
+                GROUP BY 1, 2
+            )
+            SELECT fiscal_month,
+                   AVG(total_amount) AS average_amount,
+                   SUM(total_amount) AS total_amount,
+                   SUM(award_count) AS award_count,
+                   SUM(total_amount) / SUM(SUM(total_amount)) OVER () AS share_of_spending
+            FROM monthly
+            GROUP BY 1
+            ORDER BY 1
+            """,
+            params
+        )
+        return {
+            "fiscal_years": fiscal_years,
+            "category": category,
+            "by_fiscal_month": rows
+        }
+
+    async def agency_comparison(
+        self,
+        fiscal_year: int,
+        agencies: List[str],
+        metric: str = "total_spending"
+    ) -> Dict[str, Any]:
+        """Compare agencies on spending metrics for a fiscal year"""
+        if metric not in AGENCY_METRICS:
+            raise ValueError(f"Unknown metric '{metric}', expected one of {', '.join(AGENCY_METRICS)}")
+        where, params = self._award_filters([fiscal_year], agencies, None)
+        columns = ",\n                   ".join(
+            f"{expression} AS {name}" for name, expression in AGENCY_METRICS.items()
+        )
+        rows = await self.query(
+            f"""
+            SELECT agency,
+                   any_value(awarding_agency) AS agency_name,
+                   {columns}
+            FROM {self._source('awards')}
+            WHERE {where}
+            GROUP BY agency
+            ORDER BY {metric} DESC
+            """,
+            params
+        )
+        return {
+            "fiscal_year": fiscal_year,
+            "metric": metric,
+            "agencies": rows
+        }
+
+    async def anomalies(
+        self,
+        fiscal_year: int,
+        threshold: float = 2.0,
+        category: str = "amount",
+        limit: int = 100
+    ) -> List[Dict[str, Any]]:
+        """Awards, or recipients for frequency, more than threshold standard deviations from the mean"""
+        if category not in ANOMALY_MEASURES:
+            raise ValueError(f"Unknown category '{category}', expected one of {', '.join(ANOMALY_MEASURES)}")
+        where, params = self._award_filters([fiscal_year])
+        measure = ANOMALY_MEASURES[category]
+        if measure is None:
+            measured = f"""
+                SELECT recipient_name, COUNT(*) AS value
+                FROM {self._source('awards')}
+                WHERE {where}
+                GROUP BY recipient_name
+            """
+        else:
+            measured = f"""
+                SELECT award_id, recipient_name, awarding_agency, award_type, start_date, {measure} AS value
+                FROM {self._source('awards')}
+                WHERE {where} AND {measure} IS NOT NULL
+            """
+        return await self.query(
+            f"""
+            WITH measured AS ({measured}),
+            scored AS (
+                SELECT *,
+                       (value - AVG(value) OVER ()) / NULLIF(STDDEV_POP(value) OVER (), 0) AS z_score
+                FROM measured
+            )
+            SELECT *
+            FROM scored
+            WHERE abs(z_score) >= ?
+            ORDER BY abs(z_score) DESC
+            LIMIT ?
+            """,
+            params + [threshold, limit]
+        )
+
+    async def geographic_distribution(self, fiscal_year: int, category: str = "contracts") -> Dict[str, Any]:
+        """Award totals by recipient state for a fiscal year; category "total" covers every award type"""
+        where, params = self._award_filters([fiscal_year], None, None if category == "total" else category)
+        rows = await self.query(
+            f"""
+            SELECT recipient_state AS state,
+                   SUM(award_amount) AS total_amount,
+                   COUNT(*) AS award_count,
+                   COUNT(DISTINCT recipient_name) AS recipient_count,
+                   SUM(award_amount) / SUM(SUM(award_amount)) OVER () AS share_of_spending
+            FROM {self._source('awards')}
+            WHERE {where}
+            GROUP BY 1
+            ORDER BY total_amount DESC
+            """,
+            params
+        )
+        return {
+            "fiscal_year": fiscal_year,
+            "category": category,
+            "total_amount": sum(row["total_amount"] or 0 for row in rows),
+            "states": rows
+        }
@@ -0,0 +1,40 @@
+"""Cache tags shared by collector writes and the cached responses they invalidate"""
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Set
+
+from app.core.cache import cache_tag, invalidate_tags
+from app.core.logger import logger
+from app.utils.helpers import fiscal_year_for_date
+
+USASPENDING_TAG = cache_tag("source", "usaspending")
+
+def award_response_tags(arguments: Dict[str, Any]) -> List[str]:
+    """Fiscal years a response's look-back window covers; writes of awards starting in them evict it.
+
+    An entry is evicted when any of its tags is, so agency or award type tags
+    could only widen eviction; the window is what narrows it.
+    """
+    end = date.today()
+    start = end - timedelta(days=arguments["days"])
+    return [
+        cache_tag("fy", fiscal_year)
+        for fiscal_year in range(fiscal_year_for_date(start), fiscal_year_for_date(end) + 1)
+    ]
+
+def award_cache_tags(awards: List[Dict]) -> Set[str]:
+    """Cache tags touched by a batch of USAspending award results"""
+    # The source tag versions validators of routes built from all award data, like the contractor graph
+    tags = {USASPENDING_TAG}
+    for award in awards:
+        if award.get("Start Date"):
+            start = datetime.strptime(award["Start Date"], "%Y-%m-%d")
+            tags.add(cache_tag("fy", fiscal_year_for_date(start)))
+    return tags
+
+async def publish_cache_tags(tags: Set[str]) -> None:
+    """Evict cached responses depending on committed data; failures only cost freshness"""
+    try:
+        evicted = await invalidate_tags(tags)
+        logger.info(f"Invalidated {evicted} cached entries for {len(tags)} tags")
+    except Exception as e:
+        logger.error(f"Error invalidating cache tags: {str(e)}")
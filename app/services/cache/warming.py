@@ -0,0 +1,80 @@
+"""Precomputes cached responses for the most requested query shapes"""
+import importlib
+import inspect
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_type_hints
+
+from fastapi.params import Depends
+from pydantic import TypeAdapter
+from pydantic.fields import FieldInfo
+
+from app.core.cache import CACHE_KEY_EXCLUDE, cached_functions, generate_cache_key, top_accessed
+from app.core.config import settings
+from app.core.logger import logger
+
+# Route modules whose cached functions register themselves on import
+WARMED_MODULES = ("app.api.v1.treasury", "app.api.v1.usaspending")
+
+def call_arguments(func: Callable, given: Dict[str, Any], db: Any) -> Dict[str, Any]:
+    """Build keyword arguments for calling a route function directly.
+
+    Recorded values are converted back to the annotated types, and parameters
+    not given fall back to their Query defaults, so the call hits the same
+    cache key as the equivalent HTTP request.
+    """
+    hints = get_type_hints(inspect.unwrap(func))
+    arguments: Dict[str, Any] = {}
+    for name, parameter in inspect.signature(func).parameters.items():
+        default = parameter.default
+        if name == "db" or isinstance(default, Depends):
+            arguments[name] = db
+        elif name in given:
+            arguments[name] = TypeAdapter(hints.get(name, Any)).validate_python(given[name])
+        elif isinstance(default, FieldInfo):
+            if default.is_required():
+                raise ValueError(f"Missing required argument {name}")
+            arguments[name] = default.get_default(call_default_factory=True)
+        elif default is not inspect.Parameter.empty:
+            arguments[name] = default
+        else:
+            raise ValueError(f"Missing required argument {name}")
+    return arguments
+
+async def warm_shapes(limit: Optional[int] = None) -> List[Tuple[str, Dict[str, Any]]]:
+    """Configured dashboard queries followed by the most requested shapes"""
+    shapes = [(query["prefix"], query.get("args", {})) for query in settings.CACHE_WARM_QUERIES]
+    try:
+        shapes.extend(await top_accessed(limit or settings.CACHE_WARM_TOP_N))
+    except Exception as e:
+        logger.error(f"Error reading cache access counts: {str(e)}")
+    return shapes
+
+async def warm_cache(limit: Optional[int] = None) -> int:
+    """Recompute and store cached responses for hot query shapes"""
+    for module in WARMED_MODULES:
+        try:
+            importlib.import_module(module)
+        except Exception as e:
+            logger.error(f"Error loading {module} for cache warming: {str(e)}")
+    functions = cached_functions()
+
+    warmed = set()
+    for prefix, given in await warm_shapes(limit):
+        func = functions.get(prefix)
+        if func is None:
+            logger.warning(f"No cached function registered for {prefix}")
+            continue
+        try:
+            # Cached functions open their own session for db
+            arguments = call_arguments(func, given, None)
+            key = generate_cache_key(prefix, **{
+                name: value for name, value in arguments.items() if name not in CACHE_KEY_EXCLUDE
+            })
+            if key in warmed:
+                continue
+            await func.refresh(**arguments)
+            warmed.add(key)
+        except Exception as e:
+            logger.error(f"Error warming {prefix} {given}: {str(e)}")
+
+    logger.info(f"Warmed {len(warmed)} cached query shapes")
+    return len(warmed)
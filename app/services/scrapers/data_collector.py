@@ -1,4 +1,4 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 import asyncio
 from datetime import datetime, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -9,6 +9,7 @@ from app.db.session import AsyncSessionLocal
 from app.models.awards import Award
 from app.services.scrapers.usaspending import USSpendingClient
 from app.services.scrapers.treasury import TreasuryClient, SAMClient
+from app.core.cache import cache_tag
 from app.core.logger import logger
 from app.core.config import settings
 from app.services.scrapers.fpds import FPDSClient
@@ -16,6 +17,12 @@ from app.services.scrapers.fbo import FBOClient
 from app.services.scrapers.fsrs import FSRSClient
 from app.services.scrapers.fred import FederalReserveClient
 from app.services.scrapers.sec import SECClient
+from app.services.cache.invalidation import award_cache_tags, publish_cache_tags
+from app.services.cache.warming import warm_cache
+from app.services.search.awards import ingestion_window
+from app.services.storage.contractor_graph import add_subaward_edges, invalidate_adjacency, recipient_key
+from app.services.storage.debt_series import DebtSeriesStore
+from app.services.storage.dimensions import dimension_resolver
 from app.models.government_data import (
     ContractOpportunity,
     Subaward,
@@ -26,6 +33,9 @@ from app.models.government_data import (
 
 logger = logging.getLogger(__name__)
 
+# Award type codes fetched by collect_recent_awards; ingestion windows cover only these
+COLLECTED_AWARD_TYPES = ["A", "B", "C", "D"]
+
 class DataCollector:
     """Service for collecting and storing data from multiple sources"""
     
@@ -40,11 +50,14 @@ class DataCollector:
         self.sec_client = SECClient()
         self.db = AsyncSessionLocal()
         
-    async def collect_recent_awards(self, days: int = 30, min_amount: float = 1000000) -> List[Dict]:
-        """Collect recent awards with proper pagination"""
+    async def collect_recent_awards(self, days: int = 30, min_amount: float = 1000000) -> Tuple[List[Dict], bool]:
+        """Collect recent awards with proper pagination, and whether the last page was reached"""
         all_awards = []
         page = 1
         has_more = True
+        complete = False
+        # Ingested pages must be current, so skip the client's response cache
+        search_awards = USSpendingClient.search_awards.__wrapped__
         
         while has_more:
             try:
@@ -58,13 +71,14 @@ class DataCollector:
                 }
                 
                 # Fetch page of results
-                result = await self.usaspending_client.search_awards(
+                result = await search_awards(
+                    self.usaspending_client,
                     time_period=time_period,
-                    award_type=["A", "B", "C", "D"],
+                    award_type=COLLECTED_AWARD_TYPES,
                     limit=100,  # Max page size
                     page=page,
                     filters={
-                        "award_type_codes": ["A", "B", "C", "D"],
+                        "award_type_codes": COLLECTED_AWARD_TYPES,
                         "time_period": [time_period],
                         "award_amounts": [{
                             "lower_bound": min_amount,
@@ -73,6 +87,10 @@ class DataCollector:
                     }
                 )
                 
+                if "error" in result:
+                    logger.error(f"Error collecting awards on page {page}: {result['error']}")
+                    break
+                
                 if result.get("results"):
                     all_awards.extend(result["results"])
                     # Check if there are more pages
@@ -81,18 +99,50 @@ class DataCollector:
                     logger.info(f"Collected {len(all_awards)} awards so far...")
                 else:
                     has_more = False
+                complete = not has_more
                     
             except Exception as e:
                 logger.error(f"Error collecting awards on page {page}: {str(e)}")
                 break
                 
-        return all_awards
+        return all_awards, complete
     
-    async def store_awards(self, awards: List[Dict]) -> None:
-        """Store awards in database"""
+    async def resolve_award_dimensions(self, awards: List[Dict]) -> Dict[str, Dict[str, int]]:
+        """Resolve dimension keys for every agency, recipient, type and state in a batch"""
+        return {
+            "agency": await dimension_resolver.resolve_many(
+                "agency",
+                [a.get("Awarding Agency") for a in awards] + [a.get("Funding Agency") for a in awards]
+            ),
+            "recipient": await dimension_resolver.resolve_many(
+                "recipient", [a.get("Recipient Name") for a in awards]
+            ),
+            "award_type": await dimension_resolver.resolve_many(
+                "award_type", [a.get("Award Type") for a in awards]
+            ),
+            "location": await dimension_resolver.resolve_many(
+                "location", [a.get("recipient_state") for a in awards]
+            ),
+        }
+    
+    async def store_awards(self, awards: List[Dict]) -> int:
+        """Store awards in database, returning how many were persisted"""
+        keys = await self.resolve_award_dimensions(awards)
+        stored = 0
         async with AsyncSessionLocal() as session:
             for award_data in awards:
                 try:
+                    dimension_keys = {
+                        "awarding_agency_id": keys["agency"].get(award_data.get("Awarding Agency")),
+                        "funding_agency_id": keys["agency"].get(award_data.get("Funding Agency")),
+                        "recipient_id": keys["recipient"].get(award_data.get("Recipient Name")),
+                        "award_type_id": keys["award_type"].get(award_data.get("Award Type")),
+                        "recipient_state_id": keys["location"].get(award_data.get("recipient_state")),
+                    }
+                    award_recipient_key = recipient_key(
+                        award_data.get("Recipient UEI"), None, award_data.get("Recipient Name")
+                    )
+                    
                     # Check if award already exists
                     existing = await session.execute(
                         select(Award).where(Award.award_id == award_data.get("Award ID"))
@@ -103,23 +153,31 @@ class DataCollector:
                         # Update existing award
                         existing.award_amount = float(award_data.get("Award Amount", 0))
                         existing.raw_data = award_data
+                        existing.recipient_key = award_recipient_key
+                        existing.generated_unique_award_id = award_data.get("generated_internal_id")
+                        for column, key in dimension_keys.items():
+                            setattr(existing, column, key)
                         existing.updated_at = datetime.utcnow()
                     else:
                         # Create new award
                         award = Award(
                             award_id=award_data.get("Award ID"),
+                            generated_unique_award_id=award_data.get("generated_internal_id"),
                             description=award_data.get("Description"),
                             award_amount=float(award_data.get("Award Amount", 0)),
                             recipient_name=award_data.get("Recipient Name"),
+                            recipient_key=award_recipient_key,
                             awarding_agency=award_data.get("Awarding Agency"),
                             funding_agency=award_data.get("Funding Agency"),
                             award_type=award_data.get("Award Type"),
                             start_date=datetime.strptime(award_data.get("Start Date", ""), "%Y-%m-%d") if award_data.get("Start Date") else None,
                             end_date=datetime.strptime(award_data.get("End Date", ""), "%Y-%m-%d") if award_data.get("End Date") else None,
                             recipient_state=award_data.get("recipient_state"),
-                            raw_data=award_data
+                            raw_data=award_data,
+                            **dimension_keys
                         )
                         session.add(award)
+                    stored += 1
                         
                 except Exception as e:
                     logger.error(f"Error storing award {award_data.get('Award ID')}: {str(e)}")
@@ -130,21 +188,38 @@ class DataCollector:
             except Exception as e:
                 logger.error(f"Error committing awards to database: {str(e)}")
                 await session.rollback()
+                return 0
+        
+        await publish_cache_tags(award_cache_tags(awards))
+        return stored
     
-    async def collect_and_store_all(self) -> None:
+    async def record_ingestion_window(self, days: int, min_amount: float, award_count: int) -> None:
+        """Record a completed award ingestion window so searches can be answered locally"""
+        async with AsyncSessionLocal() as session:
+            session.add(ingestion_window(days, min_amount, award_count, COLLECTED_AWARD_TYPES))
+            try:
+                await session.commit()
+            except Exception as e:
+                logger.error(f"Error recording ingestion window: {str(e)}")
+                await session.rollback()
+    
+    async def collect_and_store_all(self, days: int = 30, min_amount: float = 1000000) -> None:
         """Collect and store data from all sources"""
         # Collect awards
-        awards = await self.collect_recent_awards()
+        awards, complete = await self.collect_recent_awards(days=days, min_amount=min_amount)
         if awards:
-            await self.store_awards(awards)
-            logger.info(f"Stored {len(awards)} awards in database")
+            stored = await self.store_awards(awards)
+            # A partial collection or store must not let searches of this window be answered locally
+            if complete and stored == len(awards):
+                await self.record_ingestion_window(days, min_amount, stored)
+            logger.info(f"Stored {stored} of {len(awards)} awards in database")
         
         # Collect debt information
         try:
-            debt_data = await self.treasury_client.get_debt_to_penny()
-            if "error" not in debt_data:
-                # TODO: Implement debt data storage
-                logger.info("Successfully collected debt information")
+            stored = await DebtSeriesStore(self.treasury_client).sync()
+            if stored:
+                await publish_cache_tags({cache_tag("source", "treasury")})
+            logger.info(f"Successfully collected debt information ({stored} new records)")
         except Exception as e:
             logger.error(f"Error collecting debt information: {str(e)}")
         
@@ -170,6 +245,9 @@ class DataCollector:
         """Collect contract opportunities from FBO"""
         try:
             opportunities = await self.fbo_client.get_contract_opportunities()
+            agency_keys = await dimension_resolver.resolve_many(
+                "agency", [opp.get("agency") for opp in opportunities]
+            )
             for opp in opportunities:
                 existing = await self.db.execute(
                     select(ContractOpportunity).where(ContractOpportunity.opportunity_id == opp["opportunity_id"])
@@ -182,6 +260,7 @@ class DataCollector:
                         title=opp["title"],
                         description=opp["description"],
                         agency=opp["agency"],
+                        agency_id=agency_keys.get(opp["agency"]),
                         status=opp["status"],
                         posted_date=opp["posted_date"],
                         response_deadline=opp["response_deadline"],
@@ -194,6 +273,7 @@ class DataCollector:
                     await self.db.add(opportunity)
             
             await self.db.commit()
+            await publish_cache_tags({cache_tag("source", "fbo")})
             logger.info(f"Collected {len(opportunities)} contract opportunities")
         except Exception as e:
             logger.error(f"Error collecting contract opportunities: {str(e)}")
@@ -203,6 +283,10 @@ class DataCollector:
         """Collect subaward data from FSRS"""
         try:
             subawards = await self.fsrs_client.get_subawards()
+            recipient_keys = await dimension_resolver.resolve_many(
+                "recipient", [sub.get("recipient_name") for sub in subawards]
+            )
+            new_subawards = []
             for sub in subawards:
                 existing = await self.db.execute(
                     select(Subaward).where(Subaward.subaward_id == sub["subaward_id"])
@@ -210,10 +294,15 @@ class DataCollector:
                 existing = existing.scalar_one_or_none()
                 
                 if not existing:
+                    sub_recipient_key = recipient_key(
+                        sub.get("recipient_uei"), sub.get("recipient_duns"), sub["recipient_name"]
+                    )
                     subaward = Subaward(
                         subaward_id=sub["subaward_id"],
                         prime_award_id=sub["prime_award_id"],
                         recipient_name=sub["recipient_name"],
+                        recipient_id=recipient_keys.get(sub["recipient_name"]),
+                        recipient_key=sub_recipient_key,
                         recipient_address=sub["recipient_address"],
                         amount=sub["amount"],
                         description=sub["description"],
@@ -222,10 +311,16 @@ class DataCollector:
                         period_of_performance_end=sub["period_of_performance_end"],
                         raw_data=sub
                     )
-                    await self.db.add(subaward)
+                    self.db.add(subaward)
+                    new_subawards.append({**sub, "recipient_key": sub_recipient_key})
             
+            # Edge weights are updated in the same transaction as the subawards they count
+            edges = await add_subaward_edges(self.db, new_subawards)
             await self.db.commit()
-            logger.info(f"Collected {len(subawards)} subawards")
+            await invalidate_adjacency(edges)
+            if new_subawards:
+                await publish_cache_tags({cache_tag("source", "fsrs")})
+            logger.info(f"Collected {len(subawards)} subawards, updated {len(edges)} contractor edges")
         except Exception as e:
             logger.error(f"Error collecting subawards: {str(e)}")
             await self.db.rollback()
@@ -253,6 +348,7 @@ class DataCollector:
                     await self.db.add(indicator)
             
             await self.db.commit()
+            await publish_cache_tags({cache_tag("source", "fred")})
             logger.info(f"Collected {len(indicators)} economic indicators")
         except Exception as e:
             logger.error(f"Error collecting economic indicators: {str(e)}")
@@ -296,6 +392,7 @@ class DataCollector:
                         await self.db.add(financial)
             
             await self.db.commit()
+            await publish_cache_tags({cache_tag("source", "sec")})
             logger.info(f"Collected {len(filings)} company filings")
         except Exception as e:
             logger.error(f"Error collecting company filings: {str(e)}")
@@ -320,6 +417,9 @@ async def run_collector():
             await collector.collect_all()
             logger.info("Completed data collection cycle")
             
+            # Precompute hot responses so the next visitors are served from cache
+            await warm_cache()
+            
             # Wait for next collection cycle (e.g., every hour)
             await asyncio.sleep(3600)
             
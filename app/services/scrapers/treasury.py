@@ -22,6 +22,7 @@ class SAMClient:
         keyword: Optional[str] = None,
         cage_code: Optional[str] = None,
         duns: Optional[str] = None,
+        uei: Optional[str] = None,
         page_size: int = 10,
         page: int = 1
     ) -> Dict[str, Any]:
@@ -39,6 +40,8 @@ class SAMClient:
             params["cageCode"] = cage_code
         if duns:
             params["ueiDUNS"] = duns
+        if uei:
+            params["ueiSAM"] = uei
             
         async with aiohttp.ClientSession() as session:
             async with session.get(
@@ -137,22 +140,30 @@ class TreasuryClient:
             logger.error(error_msg)
             return {"error": error_msg}
     
-    async def get_debt_historical(self, days: int = 365) -> Dict[str, Any]:
-        """Get historical debt information"""
+    async def get_debt_historical(
+        self,
+        days: int = 365,
+        start_date: Optional[datetime] = None,
+        end_date: Optional[datetime] = None
+    ) -> Dict[str, Any]:
+        """Get historical debt information, for the last `days` days or an explicit range"""
         try:
             async with aiohttp.ClientSession() as session:
                 # Calculate date range
-                end_date = datetime.now()
-                start_date = end_date - timedelta(days=days)
+                end_date = end_date or datetime.now()
+                start_date = start_date or end_date - timedelta(days=days)
                 
                 url = f"{self.BASE_URL}/v2/accounting/od/debt_to_penny"
                 params = {
-                    "filter": f"record_date:gte:{start_date.strftime('%Y-%m-%d')}",
+                    "filter": (
+                        f"record_date:gte:{start_date.strftime('%Y-%m-%d')},"
+                        f"record_date:lte:{end_date.strftime('%Y-%m-%d')}"
+                    ),
                     "sort": "-record_date",
                     "page[size]": 366  # Get up to a year of daily data
                 }
                 
-                logger.info(f"Fetching historical debt data for the last {days} days")
+                logger.info(f"Fetching historical debt data from {start_date:%Y-%m-%d} to {end_date:%Y-%m-%d}")
                 async with session.get(url, params=params, headers=self.headers) as response:
                     if response.status == 200:
                         data = await response.json()
@@ -180,4 +191,57 @@ class TreasuryClient:
         except Exception as e:
             error_msg = f"Error fetching historical debt data: {str(e)}"
             logger.error(error_msg)
-            return {"error": error_msg} 
\ No newline at end of file
+            return {"error": error_msg}
+    
+    async def get_debt_records(
+        self,
+        after_date: Optional[str] = None,
+        page_size: int = 10000
+    ) -> Dict[str, Any]:
+        """Get all Debt to the Penny records, optionally only those after a given date"""
+        try:
+            async with aiohttp.ClientSession() as session:
+                url = f"{self.BASE_URL}/v2/accounting/od/debt_to_penny"
+                params = {
+                    "fields": "record_date,tot_pub_debt_out_amt,debt_held_public_amt,intragov_hold_amt",
+                    "sort": "record_date",
+                    "page[size]": page_size
+                }
+                if after_date:
+                    params["filter"] = f"record_date:gt:{after_date}"
+                
+                records = []
+                page = 1
+                total_pages = 1
+                logger.info(f"Fetching debt records after {after_date or 'the beginning of the series'}")
+                while page <= total_pages:
+                    params["page[number]"] = page
+                    async with session.get(url, params=params, headers=self.headers) as response:
+                        if response.status != 200:
+                            error_msg = f"Treasury API Error: {response.status}"
+                            logger.error(error_msg)
+                            return {"error": error_msg}
+                        
+                        data = await response.json()
+                        records.extend({
+                            "date": record["record_date"],
+                            "total_debt": _to_float(record.get("tot_pub_debt_out_amt")),
+                            "debt_held_public": _to_float(record.get("debt_held_public_amt")),
+                            "intragov_holdings": _to_float(record.get("intragov_hold_amt"))
+                        } for record in data.get("data", []))
+                        total_pages = data.get("meta", {}).get("total-pages", 1)
+                        page += 1
+                
+                return {"data": records}
+                        
+        except Exception as e:
+            error_msg = f"Error fetching debt records: {str(e)}"
+            logger.error(error_msg)
+            return {"error": error_msg}
+
+def _to_float(value: Any) -> Optional[float]:
+    """Convert a Treasury API amount, which may be missing or 'null', to float"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
@@ -2,6 +2,7 @@ from typing import Optional, Dict, Any, List
 import aiohttp
 from datetime import datetime, timedelta
 import logging
+from app.core.cache import cached
 from app.core.config import settings
 
 logging.basicConfig(level=logging.INFO)
@@ -17,6 +18,7 @@ class USSpendingClient:
             "Content-Type": "application/json"
         }
     
+    @cached("usaspending_search", soft_ttl=300, hard_ttl=3600)
     async def search_awards(
         self,
         keyword: Optional[str] = None,
@@ -40,6 +42,7 @@ class USSpendingClient:
                 "fields": [
                     "Award ID",
                     "Recipient Name",
+                    "Recipient UEI",
                     "Description",
                     "Award Amount",
                     "Start Date",
@@ -107,6 +110,7 @@ class USSpendingClient:
             logger.error(error_msg)
             return {"results": [], "error": error_msg}
     
+    @cached("usaspending_award", soft_ttl=3600, hard_ttl=24 * 3600)
     async def get_award_details(self, award_id: str) -> Dict[str, Any]:
         """Get detailed information about a specific award"""
         try:
@@ -130,6 +134,7 @@ class USSpendingClient:
             logger.error(error_msg)
             return {"error": error_msg}
     
+    @cached("usaspending_federal_accounts", soft_ttl=3600, hard_ttl=24 * 3600)
     async def get_federal_accounts(
         self,
         fiscal_year: Optional[int] = None,
@@ -162,6 +167,7 @@ class USSpendingClient:
                     error_text = await response.text()
                     raise Exception(f"USSpending API Error: {error_text}")
 
+    @cached("usaspending_agency_spending", soft_ttl=3600, hard_ttl=24 * 3600)
     async def get_agency_spending(
         self,
         fiscal_year: int,
@@ -185,6 +191,7 @@ class USSpendingClient:
                     error_text = await response.text()
                     raise Exception(f"USSpending API Error: {error_text}")
 
+    @cached("usaspending_recipient", soft_ttl=3600, hard_ttl=24 * 3600)
     async def get_recipient_profile(
         self,
         recipient_id: str,
@@ -207,6 +214,7 @@ class USSpendingClient:
                     error_text = await response.text()
                     raise Exception(f"USSpending API Error: {error_text}")
 
+    @cached("usaspending_subawards", soft_ttl=3600, hard_ttl=24 * 3600)
     async def get_subawards(
         self,
         award_id: str,
@@ -232,6 +240,7 @@ class USSpendingClient:
                     error_text = await response.text()
                     raise Exception(f"USSpending API Error: {error_text}")
 
+    @cached("usaspending_spending_by_category", soft_ttl=3600, hard_ttl=24 * 3600)
     async def get_spending_by_category(
         self,
         fiscal_year: int,
@@ -257,6 +266,7 @@ class USSpendingClient:
                     error_text = await response.text()
                     raise Exception(f"USSpending API Error: {error_text}")
 
+    @cached("usaspending_state", soft_ttl=3600, hard_ttl=24 * 3600)
     async def get_state_data(
         self,
         state_code: str,
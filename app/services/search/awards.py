@@ -0,0 +1,85 @@
+"""Local full-text search over ingested awards"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.awards import Award, AwardIngestionWindow
+from app.services.storage.archive import resolve_raw_data
+
+def ingestion_window(
+    days: int,
+    min_amount: float,
+    award_count: int,
+    award_types: List[str],
+    now: Optional[datetime] = None
+) -> AwardIngestionWindow:
+    """Window record for an ingestion of the last `days` days, at the day granularity searches use"""
+    end_date = (now or datetime.now()).replace(hour=0, minute=0, second=0, microsecond=0)
+    return AwardIngestionWindow(
+        start_date=end_date - timedelta(days=days),
+        end_date=end_date,
+        min_amount=min_amount,
+        award_types=list(award_types),
+        award_count=award_count
+    )
+
+async def is_window_ingested(
+    db: AsyncSession,
+    start_date: datetime,
+    end_date: datetime,
+    award_types: List[str],
+    min_amount: float
+) -> bool:
+    """Check whether a search window is fully covered by a completed local ingestion"""
+    # Ingestion windows are recorded at day granularity
+    start_date = start_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    end_date = end_date.replace(hour=0, minute=0, second=0, microsecond=0)
+    query = select(AwardIngestionWindow.award_types).where(
+        AwardIngestionWindow.start_date <= start_date,
+        AwardIngestionWindow.end_date >= end_date,
+        AwardIngestionWindow.min_amount <= min_amount
+    )
+    result = await db.execute(query)
+    requested = set(award_types)
+    return any(requested.issubset(types or []) for types in result.scalars())
+
+async def search_local_awards(
+    db: AsyncSession,
+    keyword: str,
+    start_date: datetime,
+    end_date: datetime,
+    award_types: List[str],
+    min_amount: float = 0,
+    agency: Optional[str] = None,
+    state: Optional[str] = None,
+    limit: int = 10
+) -> Dict[str, Any]:
+    """Search stored awards ranked by full-text relevance"""
+    query = select(Award.raw_data, Award.raw_data_ref).where(
+        Award.award_amount >= min_amount,
+        Award.award_type.in_(award_types),
+        Award.start_date >= start_date,
+        Award.start_date <= end_date
+    )
+
+    if keyword:
+        ts_query = func.websearch_to_tsquery("english", keyword)
+        query = query.where(Award.search_vector.op("@@")(ts_query)).order_by(
+            func.ts_rank_cd(Award.search_vector, ts_query).desc(),
+            Award.award_amount.desc()
+        )
+    else:
+        query = query.order_by(Award.award_amount.desc())
+
+    if agency:
+        query = query.where(Award.awarding_agency.ilike(agency))
+    if state:
+        query = query.where(Award.recipient_state == state)
+
+    result = await db.execute(query.limit(limit))
+    return {
+        "results": await resolve_raw_data(result.all()),
+        "source": "local"
+    }
@@ -0,0 +1,134 @@
+"""Upstream award search results reused across narrower filter sets.
+
+Searches that share a keyword, award types and state are grouped under one
+cache key. A stored result is complete when upstream returned every matching
+award, and any later search whose window, minimum amount and agency fall inside
+it is answered by filtering that result locally. Windows are matched on the
+award's period of performance overlapping the requested dates.
+"""
+from datetime import date
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.core.cache import generate_cache_key, get_cache, set_cache
+from app.core.logger import logger
+
+# Rows requested upstream on a miss; USAspending caps a page at 100
+FETCH_LIMIT = 100
+RESULT_CACHE_TTL = 900
+# Filter sets kept per keyword/type/state group, newest first
+MAX_ENTRIES = 8
+
+Fetch = Callable[[int], Awaitable[Dict[str, Any]]]
+
+def _group_key(keyword: str, award_types: List[str], state: Optional[str]) -> str:
+    return generate_cache_key(
+        "award_search_results",
+        keyword=" ".join((keyword or "").lower().split()),
+        award_types=award_types,
+        state=(state or "").upper() or None
+    )
+
+def _normalize_agency(agency: Optional[str]) -> Optional[str]:
+    return " ".join(agency.lower().split()) if agency else None
+
+def _date(value: Any) -> Optional[str]:
+    """ISO date prefix of an upstream date field"""
+    return str(value)[:10] if value else None
+
+def _matches(row: Dict[str, Any], start: str, end: str, min_amount: float, agency: Optional[str]) -> bool:
+    """Whether a cached row satisfies a narrower filter set"""
+    if float(row.get("Award Amount") or 0) < min_amount:
+        return False
+    if agency and _normalize_agency(row.get("Awarding Agency")) != agency:
+        return False
+    row_start = _date(row.get("Start Date"))
+    row_end = _date(row.get("End Date")) or row_start
+    if row_start and row_start > end:
+        return False
+    if row_end and row_end < start:
+        return False
+    return True
+
+def subsumes(entry: Dict[str, Any], start: str, end: str, min_amount: float, agency: Optional[str]) -> bool:
+    """Whether a cached entry holds every result for the requested filters"""
+    if not entry["complete"]:
+        return False
+    return (
+        entry["start"] <= start
+        and entry["end"] >= end
+        and entry["min_amount"] <= min_amount
+        and (entry["agency"] is None or entry["agency"] == agency)
+    )
+
+def answer_from_entries(
+    entries: List[Dict[str, Any]],
+    start: str,
+    end: str,
+    min_amount: float,
+    agency: Optional[str],
+    limit: int
+) -> Optional[List[Dict[str, Any]]]:
+    """Results for a filter set from the first cached entry that covers it"""
+    for entry in entries:
+        same_filters = (
+            entry["start"] == start
+            and entry["end"] == end
+            and entry["min_amount"] == min_amount
+            and entry["agency"] == agency
+        )
+        # An incomplete entry is still the exact top of its own filter set
+        if same_filters and len(entry["results"]) >= limit:
+            return entry["results"][:limit]
+        if subsumes(entry, start, end, min_amount, agency):
+            rows = (row for row in entry["results"] if _matches(row, start, end, min_amount, agency))
+            return [row for _, row in zip(range(limit), rows)]
+    return None
+
+async def search_with_subsumption(
+    fetch: Fetch,
+    keyword: str,
+    award_types: List[str],
+    start_date: date,
+    end_date: date,
+    min_amount: float = 0,
+    agency: Optional[str] = None,
+    state: Optional[str] = None,
+    limit: int = 10
+) -> Dict[str, Any]:
+    """Answer an upstream award search from a covering cached result, fetching on a miss.
+
+    ``fetch`` performs the upstream search for the given filters with the row limit
+    it is passed.
+    """
+    key = _group_key(keyword, award_types, state)
+    start, end = start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
+    agency_key = _normalize_agency(agency)
+
+    entries = await get_cache(key) or []
+    results = answer_from_entries(entries, start, end, min_amount, agency_key, limit)
+    if results is not None:
+        logger.info(f"Award search for '{keyword}' answered from a cached result set")
+        return {"results": results, "source": "upstream_cache"}
+
+    fetch_limit = max(limit, FETCH_LIMIT)
+    data = await fetch(fetch_limit)
+    if data.get("error"):
+        return data
+
+    rows = data.get("results", [])
+    has_next = (data.get("page_metadata") or {}).get("hasNext")
+    entry = {
+        "start": start,
+        "end": end,
+        "min_amount": min_amount,
+        "agency": agency_key,
+        "complete": not has_next if has_next is not None else len(rows) < fetch_limit,
+        "results": rows,
+    }
+    # Drop entries the new one covers; concurrent writers may lose an entry, which only costs a miss
+    entries = [
+        cached for cached in entries
+        if not (entry["complete"] and subsumes(entry, cached["start"], cached["end"], cached["min_amount"], cached["agency"]))
+    ]
+    await set_cache(key, [entry, *entries][:MAX_ENTRIES], expire=RESULT_CACHE_TTL)
+    return {**data, "results": rows[:limit], "source": "upstream"}
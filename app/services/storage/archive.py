@@ -0,0 +1,231 @@
+"""Cold-tier archival of raw source payloads into compressed segment files"""
+import asyncio
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import zstandard
+from sqlalchemy import bindparam, null, select, update
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.session import AsyncSessionLocal
+from app.models.awards import Award
+from app.models.government_data import CompanyFiling, CompanyFinancial, Subaward
+
+# Tables whose raw_data payloads are moved to the archive
+ARCHIVED_MODELS = {
+    "awards": Award,
+    "subawards": Subaward,
+    "company_filings": CompanyFiling,
+    "company_financials": CompanyFinancial,
+}
+
+SEGMENT_SUFFIX = ".zst"
+
+def _archive_dir() -> Path:
+    return Path(settings.RAW_DATA_ARCHIVE_DIR)
+
+def write_segment(payloads: Sequence[Any], archive_dir: Optional[Path] = None) -> List[str]:
+    """Write payloads as independent zstd frames in one content-addressed segment.
+
+    Returns a pointer for each payload in the form ``<segment>:<offset>:<length>``.
+    Identical payloads within a segment share a single frame.
+    """
+    archive_dir = archive_dir or _archive_dir()
+    archive_dir.mkdir(parents=True, exist_ok=True)
+    compressor = zstandard.ZstdCompressor(level=settings.RAW_DATA_ARCHIVE_LEVEL)
+
+    frames: List[bytes] = []
+    locations: List[Tuple[int, int]] = []
+    seen: Dict[bytes, Tuple[int, int]] = {}
+    offset = 0
+    for payload in payloads:
+        encoded = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+        digest = hashlib.sha256(encoded).digest()
+        if digest not in seen:
+            frame = compressor.compress(encoded)
+            seen[digest] = (offset, len(frame))
+            frames.append(frame)
+            offset += len(frame)
+        locations.append(seen[digest])
+
+    segment = b"".join(frames)
+    segment_id = hashlib.sha256(segment).hexdigest()
+    path = archive_dir / f"{segment_id}{SEGMENT_SUFFIX}"
+    if not path.exists():
+        # Write and fsync before the rename so a pointer never references a partial file
+        staging = path.with_suffix(".tmp")
+        with open(staging, "wb") as handle:
+            handle.write(segment)
+            handle.flush()
+            os.fsync(handle.fileno())
+        staging.replace(path)
+
+    return [f"{segment_id}:{start}:{length}" for start, length in locations]
+
+@lru_cache(maxsize=2048)
+def _read_frame(pointer: str, archive_dir: str) -> bytes:
+    segment_id, offset, length = pointer.split(":")
+    with open(Path(archive_dir) / f"{segment_id}{SEGMENT_SUFFIX}", "rb") as handle:
+        handle.seek(int(offset))
+        frame = handle.read(int(length))
+    return zstandard.ZstdDecompressor().decompress(frame)
+
+def read_payload(pointer: str, archive_dir: Optional[Path] = None) -> Any:
+    """Load a single archived payload"""
+    return json.loads(_read_frame(pointer, str(archive_dir or _archive_dir())))
+
+async def resolve_raw_data(pairs: Sequence[Tuple[Any, Optional[str]]]) -> List[Any]:
+    """Resolve (raw_data, raw_data_ref) pairs to payloads, loading archived ones lazily"""
+    def load() -> List[Any]:
+        return [
+            raw_data if raw_data is not None or not ref else read_payload(ref)
+            for raw_data, ref in pairs
+        ]
+
+    if all(raw_data is not None or not ref for raw_data, ref in pairs):
+        return [raw_data for raw_data, _ in pairs]
+    return await asyncio.to_thread(load)
+
+async def hydrate_rows(rows: List[Dict[str, Any]]) -> None:
+    """Fill in archived raw_data on result mappings that carry a raw_data_ref"""
+    if not rows or "raw_data" not in rows[0] or "raw_data_ref" not in rows[0]:
+        return
+    payloads = await resolve_raw_data([(row["raw_data"], row["raw_data_ref"]) for row in rows])
+    for row, payload in zip(rows, payloads):
+        row["raw_data"] = payload
+
+class RawDataArchiver:
+    """Moves raw payloads older than a cutoff out of the hot tables"""
+
+    def __init__(self, archive_dir: Optional[str] = None, batch_size: int = 5000):
+        self.archive_dir = Path(archive_dir or settings.RAW_DATA_ARCHIVE_DIR)
+        self.batch_size = batch_size
+
+    async def archive_table(self, table: str, older_than_days: Optional[int] = None) -> int:
+        """Archive raw payloads of rows not updated within the hot window"""
+        model = ARCHIVED_MODELS[table]
+        days = older_than_days if older_than_days is not None else settings.RAW_DATA_HOT_DAYS
+        cutoff = datetime.utcnow() - timedelta(days=days)
+        archived = 0
+
+        while True:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(model.id, model.raw_data)
+                    .where(model.updated_at < cutoff, model.raw_data.isnot(None))
+                    .order_by(model.id)
+                    .limit(self.batch_size)
+                )
+                rows = result.all()
+                if not rows:
+                    break
+
+                pointers = await asyncio.to_thread(
+                    write_segment, [row.raw_data for row in rows], self.archive_dir
+                )
+                try:
+                    # Core executemany; raw_data is set to SQL NULL rather than JSON null,
+                    # and updated_at is kept so it still reflects the last source change
+                    table_columns = model.__table__.c
+                    await session.execute(
+                        update(model.__table__)
+                        .where(table_columns.id == bindparam("row_id"))
+                        .values(
+                            raw_data=null(),
+                            raw_data_ref=bindparam("ref"),
+                            updated_at=table_columns.updated_at
+                        ),
+                        [{"row_id": row.id, "ref": pointer} for row, pointer in zip(rows, pointers)]
+                    )
+                    await session.commit()
+                except Exception as e:
+                    logger.error(f"Error archiving {table} payloads: {str(e)}")
+                    await session.rollback()
+                    break
+
+            archived += len(rows)
+            logger.info(f"Archived {archived} {table} payloads so far...")
+
+        return archived
+
+    async def prune_award_details(self) -> int:
+        """Drop stored award detail payloads past AWARD_DETAIL_MAX_AGE.
+
+        Details that old are refetched rather than served, so they are cleared
+        instead of archived.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.AWARD_DETAIL_MAX_AGE)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                update(Award.__table__)
+                .where(Award.__table__.c.detail_fetched_at < cutoff)
+                .values(
+                    detail_data=null(),
+                    detail_fetched_at=None,
+                    updated_at=Award.__table__.c.updated_at
+                )
+            )
+            await session.commit()
+        return result.rowcount
+
+    async def backfill_award_keys(self) -> int:
+        """Set generated_unique_award_id from archived payloads of awards that lack it.
+
+        Covers rows archived before migration 009, whose backfill could only read
+        raw_data still in the table.
+        """
+        table_columns = Award.__table__.c
+        filled = 0
+        last_id = 0
+
+        while True:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(Award.id, Award.raw_data_ref)
+                    .where(
+                        Award.id > last_id,
+                        Award.generated_unique_award_id.is_(None),
+                        Award.raw_data_ref.isnot(None)
+                    )
+                    .order_by(Award.id)
+                    .limit(self.batch_size)
+                )
+                rows = result.all()
+                if not rows:
+                    break
+                last_id = rows[-1].id
+
+                payloads = await asyncio.to_thread(
+                    lambda: [read_payload(row.raw_data_ref, self.archive_dir) for row in rows]
+                )
+                keys = [
+                    {"row_id": row.id, "key": payload["generated_internal_id"]}
+                    for row, payload in zip(rows, payloads)
+                    if payload.get("generated_internal_id")
+                ]
+                if keys:
+                    await session.execute(
+                        update(Award.__table__)
+                        .where(table_columns.id == bindparam("row_id"))
+                        .values(
+                            generated_unique_award_id=bindparam("key"),
+                            updated_at=table_columns.updated_at
+                        ),
+                        keys
+                    )
+                    await session.commit()
+
+            filled += len(keys)
+            logger.info(f"Backfilled {filled} archived award keys so far...")
+
+        return filled
+
+    async def archive_all(self, older_than_days: Optional[int] = None) -> Dict[str, int]:
+        """Archive raw payloads for every tiered table"""
+        return {table: await self.archive_table(table, older_than_days) for table in ARCHIVED_MODELS}
@@ -0,0 +1,189 @@
+"""Formatted award detail records resolved from cache, stored details, then upstream"""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from sqlalchemy import or_, select, update
+
+from app.core.cache import get_many, set_many
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.session import AsyncSessionLocal
+from app.models.awards import Award
+from app.services.scrapers.usaspending import USSpendingClient
+
+DETAIL_CACHE_TTL = 24 * 3600
+# Largest number of award IDs accepted in one batch request
+MAX_BATCH_SIZE = 500
+
+def _detail_cache_key(award_id: str) -> str:
+    return f"award_details:{award_id}"
+
+def format_award_details(award_id: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Flatten an upstream award detail payload into the fields the details page shows"""
+    awarding_agency = data.get("awarding_agency") or {}
+    recipient = data.get("recipient") or {}
+    location = recipient.get("location") or {}
+    return {
+        "award_id": award_id,
+        "generated_unique_award_id": data.get("generated_unique_award_id"),
+        "description": data.get("description", "No description available"),
+        "amount": float(data.get("total_obligation") or 0),
+        "award_type": data.get("type", "Unknown"),
+        "period_of_performance_start_date": data.get("period_of_performance_start_date"),
+        "period_of_performance_end_date": data.get("period_of_performance_end_date"),
+        "status": data.get("status", "Unknown"),
+
+        # Agency information
+        "awarding_agency_name": awarding_agency.get("name", "Unknown"),
+        "funding_agency_name": (data.get("funding_agency") or {}).get("name", "Unknown"),
+        "awarding_sub_agency_name": (awarding_agency.get("subtier_agency") or {}).get("name", "Unknown"),
+
+        # Recipient information
+        "recipient_name": recipient.get("recipient_name", "Unknown"),
+        "recipient_uei": recipient.get("recipient_uei"),
+        "recipient_duns": recipient.get("duns", "Unknown"),
+        "recipient_hash": recipient.get("recipient_hash"),
+        "recipient_business_type": recipient.get("business_types_description", "Unknown"),
+        "recipient_city": location.get("city_name", "Unknown"),
+        "recipient_state": location.get("state_code", "Unknown"),
+        "recipient_zip": location.get("zip5", "Unknown"),
+        "recipient_congressional_district": location.get("congressional_code", "Unknown"),
+
+        # Additional details
+        "naics": data.get("naics", ""),
+        "psc": data.get("psc", "")
+    }
+
+async def _fetch_upstream(
+    client: USSpendingClient,
+    award_id: str,
+    upstream_id: str
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Formatted details from USAspending, or an error record, with the raw payload"""
+    try:
+        data = await client.get_award_details(upstream_id)
+    except Exception as e:
+        data = {"error": str(e)}
+    if "error" in data:
+        logger.error(f"Error fetching award {award_id}: {data['error']}")
+        return {"award_id": award_id, "error": data["error"]}, None
+    return format_award_details(award_id, data), data
+
+async def _load_stored(award_ids: List[str]) -> Dict[str, Any]:
+    """Stored rows for the requested awards, keyed by the ID they were requested under"""
+    query = select(
+        Award.id,
+        Award.award_id,
+        Award.generated_unique_award_id,
+        Award.detail_data,
+        Award.detail_fetched_at
+    ).where(or_(Award.award_id.in_(award_ids), Award.generated_unique_award_id.in_(award_ids)))
+    requested = set(award_ids)
+    try:
+        async with AsyncSessionLocal() as session:
+            rows = (await session.execute(query)).all()
+    except Exception as e:
+        logger.error(f"Could not load stored award details: {str(e)}")
+        return {}
+    return {
+        key: row
+        for row in rows
+        for key in (row.award_id, row.generated_unique_award_id)
+        if key in requested
+    }
+
+async def _persist(payloads: Dict[int, Dict[str, Any]]) -> None:
+    """Store fetched detail payloads on their award rows"""
+    now = datetime.utcnow()
+    try:
+        async with AsyncSessionLocal() as session:
+            await session.execute(
+                update(Award),
+                [{"id": row_id, "detail_data": data, "detail_fetched_at": now} for row_id, data in payloads.items()]
+            )
+            await session.commit()
+    except Exception as e:
+        logger.error(f"Could not store {len(payloads)} award details: {str(e)}")
+
+async def _cache(details: Dict[str, Dict[str, Any]]) -> None:
+    try:
+        await set_many(details, expire=DETAIL_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"Could not cache {len(details)} award details: {str(e)}")
+
+async def get_award_details(award_id: str) -> Dict[str, Any]:
+    """Formatted details for one award"""
+    # Drain the iterator so stored and cached writes finish before returning
+    results = [details async for details in iter_award_details([award_id])]
+    return results[0] if results else {"award_id": award_id, "error": "Award not found"}
+
+async def iter_award_details(award_ids: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Formatted details for many awards, yielded as each one resolves.
+
+    Cached records come first from one round-trip, then stored details younger
+    than AWARD_DETAIL_MAX_AGE. The rest are fetched upstream concurrently, at most
+    AWARD_DETAIL_CONCURRENCY at a time, and written back to the awards table and
+    the cache.
+    """
+    award_ids = list(dict.fromkeys(award_ids))
+    try:
+        cached = await get_many(_detail_cache_key(award_id) for award_id in award_ids)
+    except Exception as e:
+        logger.warning(f"Could not read cached award details: {str(e)}")
+        cached = {}
+    missing = []
+    for award_id in award_ids:
+        details = cached.get(_detail_cache_key(award_id))
+        if details is None:
+            missing.append(award_id)
+        else:
+            yield details
+    if not missing:
+        return
+
+    stored = await _load_stored(missing)
+    fresh_after = datetime.utcnow() - timedelta(seconds=settings.AWARD_DETAIL_MAX_AGE)
+    from_db: Dict[str, Dict[str, Any]] = {}
+    upstream = []
+    for award_id in missing:
+        row = stored.get(award_id)
+        if row is not None and row.detail_data and row.detail_fetched_at and row.detail_fetched_at >= fresh_after:
+            details = format_award_details(award_id, row.detail_data)
+            from_db[_detail_cache_key(award_id)] = details
+            yield details
+        else:
+            upstream.append(award_id)
+    if from_db:
+        await _cache(from_db)
+    if not upstream:
+        return
+
+    client = USSpendingClient()
+    semaphore = asyncio.Semaphore(settings.AWARD_DETAIL_CONCURRENCY)
+
+    async def fetch(award_id: str) -> Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]:
+        row = stored.get(award_id)
+        upstream_id = (row.generated_unique_award_id if row is not None else None) or award_id
+        async with semaphore:
+            return (award_id, *await _fetch_upstream(client, award_id, upstream_id))
+
+    tasks = [asyncio.create_task(fetch(award_id)) for award_id in upstream]
+    fetched: Dict[str, Dict[str, Any]] = {}
+    payloads: Dict[int, Dict[str, Any]] = {}
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            award_id, details, data = await next_done
+            if data is not None:
+                fetched[_detail_cache_key(award_id)] = details
+                if award_id in stored:
+                    payloads[stored[award_id].id] = data
+            yield details
+    finally:
+        # A disconnected client stops the remaining fetches
+        for task in tasks:
+            task.cancel()
+        if payloads:
+            await _persist(payloads)
+        if fetched:
+            await _cache(fetched)
@@ -0,0 +1,151 @@
+"""Award dossier: details plus related sections fetched concurrently under a deadline"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from sqlalchemy import func, select
+
+from app.core.cache import get_many, set_cache
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.session import AsyncSessionLocal
+from app.models.government_data import CompanyFiling
+from app.services.scrapers.treasury import SAMClient
+from app.services.scrapers.usaspending import USSpendingClient
+from app.services.storage.award_details import get_award_details
+
+RELATED_FILINGS_LIMIT = 10
+
+# Sections still running after the response was sent; they finish to fill the cache
+_pending: Set["asyncio.Task[Any]"] = set()
+
+def _known(value: Optional[str]) -> Optional[str]:
+    return value if value and value != "Unknown" else None
+
+async def fetch_subawards(award: Dict[str, Any]) -> Any:
+    client = USSpendingClient()
+    return await client.get_subawards(award.get("generated_unique_award_id") or award["award_id"])
+
+async def fetch_recipient(award: Dict[str, Any]) -> Any:
+    if not award.get("recipient_hash"):
+        return None
+    return await USSpendingClient().get_recipient_profile(award["recipient_hash"])
+
+async def fetch_sam_entity(award: Dict[str, Any]) -> Any:
+    uei = _known(award.get("recipient_uei"))
+    duns = _known(award.get("recipient_duns"))
+    name = _known(award.get("recipient_name"))
+    if not (uei or duns or name):
+        return None
+    client = SAMClient(settings.SAM_API_KEY)
+    if uei:
+        return await client.search_entities(uei=uei, page_size=1)
+    if duns:
+        return await client.search_entities(duns=duns, page_size=1)
+    return await client.search_entities(keyword=name, page_size=1)
+
+async def fetch_filings(award: Dict[str, Any]) -> Any:
+    name = _known(award.get("recipient_name"))
+    if not name:
+        return []
+    # Trigram match on the company name; served by ix_company_filings_company_name_trgm
+    query = select(
+        CompanyFiling.id,
+        CompanyFiling.cik,
+        CompanyFiling.company_name,
+        CompanyFiling.filing_type,
+        CompanyFiling.filing_date,
+        CompanyFiling.fiscal_year,
+    ).where(
+        CompanyFiling.company_name.op("%")(name)
+    ).order_by(
+        func.similarity(CompanyFiling.company_name, name).desc(),
+        CompanyFiling.filing_date.desc()
+    ).limit(RELATED_FILINGS_LIMIT)
+    async with AsyncSessionLocal() as session:
+        rows = (await session.execute(query)).mappings().all()
+    return [
+        {**row, "filing_date": row["filing_date"].isoformat() if row["filing_date"] else None}
+        for row in rows
+    ]
+
+# Section -> (fetcher, timeout seconds, cache TTL seconds)
+SECTIONS: Dict[str, Tuple[Callable[[Dict[str, Any]], Awaitable[Any]], float, int]] = {
+    "subawards": (fetch_subawards, 3.0, 6 * 3600),
+    "recipient": (fetch_recipient, 3.0, 24 * 3600),
+    "sam_entity": (fetch_sam_entity, 3.0, 24 * 3600),
+    "filings": (fetch_filings, 2.0, 3600),
+}
+
+def _section_cache_key(name: str, award_id: str) -> str:
+    return f"award_dossier:{name}:{award_id}"
+
+async def _run_section(
+    name: str,
+    award: Dict[str, Any],
+    fetcher: Callable[[Dict[str, Any]], Awaitable[Any]],
+    timeout: float,
+    ttl: int
+) -> Dict[str, Any]:
+    """Fetch one section within its timeout, caching it on success"""
+    try:
+        data = await asyncio.wait_for(fetcher(award), timeout)
+    except asyncio.TimeoutError:
+        logger.warning(f"Dossier section {name} for {award['award_id']} timed out after {timeout}s")
+        return {"status": "timeout"}
+    except Exception as e:
+        logger.error(f"Dossier section {name} for {award['award_id']} failed: {str(e)}")
+        return {"status": "error", "error": str(e)}
+    if isinstance(data, dict) and "error" in data:
+        return {"status": "error", "error": data["error"]}
+
+    try:
+        await set_cache(_section_cache_key(name, award["award_id"]), data, expire=ttl)
+    except Exception as e:
+        logger.warning(f"Could not cache dossier section {name}: {str(e)}")
+    return {"status": "ok", "data": data}
+
+async def build_dossier(award_id: str, deadline: Optional[float] = None) -> Dict[str, Any]:
+    """Award details and related sections in one response.
+
+    Cached sections are read in one round-trip and the rest fetched concurrently,
+    each within its own timeout. Sections unfinished at the deadline are reported
+    as pending and keep running so the next request finds them cached.
+    """
+    deadline = settings.AWARD_DOSSIER_DEADLINE if deadline is None else deadline
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+
+    award = await get_award_details(award_id)
+    if "error" in award:
+        return {"award_id": award_id, "error": award["error"]}
+
+    keys = {name: _section_cache_key(name, award_id) for name in SECTIONS}
+    try:
+        cached = await get_many(keys.values())
+    except Exception as e:
+        logger.warning(f"Dossier cache read failed: {str(e)}")
+        cached = {}
+
+    sections: Dict[str, Dict[str, Any]] = {
+        name: {"status": "ok", "data": cached[key]} for name, key in keys.items() if key in cached
+    }
+    tasks = {
+        name: asyncio.create_task(_run_section(name, award, *SECTIONS[name]))
+        for name in SECTIONS if name not in sections
+    }
+    if tasks:
+        await asyncio.wait(tasks.values(), timeout=max(0.0, deadline - (loop.time() - started)))
+    for name, task in tasks.items():
+        if task.done():
+            sections[name] = task.result()
+        else:
+            sections[name] = {"status": "pending"}
+            _pending.add(task)
+            task.add_done_callback(_pending.discard)
+
+    return {
+        "award_id": award_id,
+        "award": award,
+        "sections": {name: sections[name] for name in SECTIONS},
+        "complete": all(section["status"] == "ok" for section in sections.values()),
+    }
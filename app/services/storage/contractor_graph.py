@@ -0,0 +1,246 @@
+"""Prime-to-subaward contractor graph maintained at ingestion"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, literal, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import delete_many, get_many, set_many
+from app.core.logger import logger
+from app.db.session import AsyncSessionLocal
+from app.models.awards import Award
+from app.models.contractor_graph import ContractorEdge
+from app.models.government_data import Subaward
+
+# Heaviest edges kept per node and direction in the adjacency cache
+ADJACENCY_LIMIT = 100
+ADJACENCY_CACHE_TTL = 6 * 3600
+MAX_DEPTH = 3
+
+DIRECTIONS = ("out", "in", "both")
+
+def recipient_key(
+    uei: Optional[str] = None,
+    duns: Optional[str] = None,
+    name: Optional[str] = None
+) -> Optional[str]:
+    """Stable node key for a recipient: UEI, then DUNS, then normalized name"""
+    if uei and uei.strip():
+        return f"uei:{uei.strip().upper()}"
+    if duns and duns.strip():
+        return f"duns:{duns.strip()}"
+    if name and name.strip():
+        return f"name:{' '.join(name.upper().split())}"
+    return None
+
+def _adjacency_cache_key(direction: str, key: str) -> str:
+    return f"contractor_adjacency:{direction}:{key}"
+
+def aggregate_edges(
+    subawards: List[Dict[str, Any]],
+    primes: Dict[str, Tuple[str, Optional[str]]]
+) -> Dict[Tuple[str, str], Dict[str, Any]]:
+    """Fold subawards into (prime key, subrecipient key) edge increments.
+
+    ``primes`` maps prime award IDs to (recipient key, recipient name); subawards
+    whose prime award is not stored locally are skipped.
+    """
+    edges: Dict[Tuple[str, str], Dict[str, Any]] = defaultdict(
+        lambda: {"source_name": None, "target_name": None, "total_amount": 0.0, "award_count": 0}
+    )
+    for sub in subawards:
+        prime = primes.get(sub.get("prime_award_id"))
+        target = sub.get("recipient_key")
+        if not prime or not target or prime[0] == target:
+            continue
+        edge = edges[(prime[0], target)]
+        edge["source_name"] = prime[1]
+        edge["target_name"] = sub.get("recipient_name")
+        edge["total_amount"] += float(sub.get("amount") or 0)
+        edge["award_count"] += 1
+    return dict(edges)
+
+async def add_subaward_edges(
+    session: AsyncSession,
+    subawards: List[Dict[str, Any]]
+) -> List[Tuple[str, str]]:
+    """Add newly ingested subawards to the edge weights in the caller's transaction.
+
+    Each subaward dict needs prime_award_id, recipient_key, recipient_name and amount.
+    Returns the (source, target) keys of the edges touched.
+    """
+    prime_ids = {sub.get("prime_award_id") for sub in subawards if sub.get("prime_award_id")}
+    if not prime_ids:
+        return []
+
+    result = await session.execute(
+        select(Award.award_id, Award.recipient_key, Award.recipient_name)
+        .where(Award.award_id.in_(prime_ids), Award.recipient_key.isnot(None))
+    )
+    primes = {award_id: (key, name) for award_id, key, name in result.all()}
+    edges = aggregate_edges(subawards, primes)
+    if not edges:
+        return []
+
+    statement = insert(ContractorEdge).values([
+        {"source_key": source, "target_key": target, "updated_at": datetime.utcnow(), **edge}
+        for (source, target), edge in edges.items()
+    ])
+    await session.execute(
+        statement.on_conflict_do_update(
+            constraint="uq_contractor_edges_source_target",
+            set_={
+                "source_name": statement.excluded.source_name,
+                "target_name": statement.excluded.target_name,
+                "total_amount": ContractorEdge.total_amount + statement.excluded.total_amount,
+                "award_count": ContractorEdge.award_count + statement.excluded.award_count,
+                "updated_at": statement.excluded.updated_at,
+            }
+        )
+    )
+    return list(edges)
+
+async def invalidate_adjacency(edges: List[Tuple[str, str]]) -> None:
+    """Drop cached adjacency lists on both ends of changed edges"""
+    await delete_many(
+        [_adjacency_cache_key("out", source) for source, _ in edges]
+        + [_adjacency_cache_key("in", target) for _, target in edges]
+    )
+
+async def rebuild_edges() -> int:
+    """Recompute every edge from the subawards and awards tables"""
+    aggregated = (
+        select(
+            Award.recipient_key.label("source_key"),
+            Subaward.recipient_key.label("target_key"),
+            func.max(Award.recipient_name).label("source_name"),
+            func.max(Subaward.recipient_name).label("target_name"),
+            func.coalesce(func.sum(Subaward.amount), 0).label("total_amount"),
+            func.count().label("award_count"),
+            literal(datetime.utcnow()).label("updated_at"),
+        )
+        .join(Award, Award.award_id == Subaward.prime_award_id)
+        .where(
+            Award.recipient_key.isnot(None),
+            Subaward.recipient_key.isnot(None),
+            Award.recipient_key != Subaward.recipient_key,
+        )
+        .group_by(Award.recipient_key, Subaward.recipient_key)
+    )
+    async with AsyncSessionLocal() as session:
+        await session.execute(delete(ContractorEdge))
+        await session.execute(
+            insert(ContractorEdge).from_select(
+                ["source_key", "target_key", "source_name", "target_name",
+                 "total_amount", "award_count", "updated_at"],
+                aggregated
+            )
+        )
+        count = await session.scalar(select(func.count()).select_from(ContractorEdge))
+        await session.commit()
+    logger.info(f"Rebuilt contractor graph with {count} edges")
+    return count
+
+def _edge_dict(edge: Any) -> Dict[str, Any]:
+    return {
+        "source": edge.source_key,
+        "target": edge.target_key,
+        "source_name": edge.source_name,
+        "target_name": edge.target_name,
+        "total_amount": edge.total_amount,
+        "award_count": edge.award_count,
+    }
+
+async def _load_adjacency(db: AsyncSession, direction: str, keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Heaviest edges per node from the database for one direction"""
+    own_key = ContractorEdge.source_key if direction == "out" else ContractorEdge.target_key
+    ranked = select(
+        ContractorEdge,
+        func.row_number().over(
+            partition_by=own_key, order_by=ContractorEdge.total_amount.desc()
+        ).label("rank")
+    ).where(own_key.in_(keys)).subquery()
+    result = await db.execute(
+        select(ranked).where(ranked.c.rank <= ADJACENCY_LIMIT)
+    )
+    adjacency: Dict[str, List[Dict[str, Any]]] = {key: [] for key in keys}
+    for edge in result.all():
+        node = edge.source_key if direction == "out" else edge.target_key
+        adjacency[node].append(_edge_dict(edge))
+    for edges in adjacency.values():
+        edges.sort(key=lambda edge: edge["total_amount"] or 0, reverse=True)
+    return adjacency
+
+async def get_adjacency(db: AsyncSession, direction: str, keys: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+    """Adjacency lists for a frontier of nodes, served from cache where possible"""
+    cache_keys = {key: _adjacency_cache_key(direction, key) for key in keys}
+    try:
+        cached = await get_many(cache_keys.values())
+    except Exception as e:
+        logger.warning(f"Could not read cached adjacency lists: {str(e)}")
+        cached = {}
+    adjacency = {key: cached[cache_key] for key, cache_key in cache_keys.items() if cache_key in cached}
+
+    missing = [key for key in keys if key not in adjacency]
+    if missing:
+        loaded = await _load_adjacency(db, direction, missing)
+        try:
+            await set_many(
+                {cache_keys[key]: edges for key, edges in loaded.items()},
+                expire=ADJACENCY_CACHE_TTL
+            )
+        except Exception as e:
+            logger.warning(f"Could not cache {len(loaded)} adjacency lists: {str(e)}")
+        adjacency.update(loaded)
+    return adjacency
+
+async def traverse(
+    db: AsyncSession,
+    root: str,
+    depth: int = 2,
+    direction: str = "out",
+    max_neighbors: int = 25,
+    min_amount: float = 0
+) -> Dict[str, Any]:
+    """Breadth-first neighborhood of a recipient, bounded by depth and fan-out"""
+    if direction not in DIRECTIONS:
+        raise ValueError(f"Unknown direction '{direction}', expected one of {', '.join(DIRECTIONS)}")
+    depth = max(1, min(depth, MAX_DEPTH))
+    max_neighbors = max(1, min(max_neighbors, ADJACENCY_LIMIT))
+    directions = ["out", "in"] if direction == "both" else [direction]
+
+    levels = {root: 0}
+    names: Dict[str, Optional[str]] = {}
+    edges: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    frontier = [root]
+
+    for level in range(1, depth + 1):
+        next_frontier: List[str] = []
+        for edge_direction in directions:
+            adjacency = await get_adjacency(db, edge_direction, frontier)
+            for node in frontier:
+                kept = [edge for edge in adjacency.get(node, []) if (edge["total_amount"] or 0) >= min_amount]
+                for edge in kept[:max_neighbors]:
+                    edges[(edge["source"], edge["target"])] = edge
+                    names.setdefault(edge["source"], edge["source_name"])
+                    names.setdefault(edge["target"], edge["target_name"])
+                    neighbor = edge["target"] if edge_direction == "out" else edge["source"]
+                    if neighbor not in levels:
+                        levels[neighbor] = level
+                        next_frontier.append(neighbor)
+        if not next_frontier:
+            break
+        frontier = next_frontier
+
+    return {
+        "root": root,
+        "depth": depth,
+        "direction": direction,
+        "nodes": [
+            {"key": key, "name": names.get(key), "depth": level}
+            for key, level in levels.items()
+        ],
+        "edges": list(edges.values())
+    }
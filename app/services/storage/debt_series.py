@@ -0,0 +1,193 @@
+"""Local storage and downsampling of the Debt to the Penny time series"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import logger
+from app.db.session import AsyncSessionLocal
+from app.models.debt import DebtRecord, DebtRollup
+from app.services.scrapers.treasury import TreasuryClient
+
+# Rollup resolution -> SQL expression for the start of the period containing record_date
+ROLLUP_PERIODS = {
+    "week": "date_trunc('week', record_date)",
+    "month": "date_trunc('month', record_date)",
+    "fiscal_year": "date_trunc('year', record_date + interval '3 months') - interval '3 months'",
+}
+
+# Approximate period length in days, used to pick a resolution for a requested range
+RESOLUTION_DAYS = {
+    "day": 1,
+    "week": 7,
+    "month": 30.44,
+    "fiscal_year": 365.25,
+}
+
+INSERT_BATCH_SIZE = 1000
+
+def period_start(resolution: str, value: datetime) -> datetime:
+    """Start of the rollup period containing a date, matching ROLLUP_PERIODS"""
+    value = value.replace(hour=0, minute=0, second=0, microsecond=0)
+    if resolution == "week":
+        return value - timedelta(days=value.weekday())
+    if resolution == "month":
+        return value.replace(day=1)
+    if resolution == "fiscal_year":
+        return datetime(value.year if value.month >= 10 else value.year - 1, 10, 1)
+    return value
+
+def choose_resolution(start_date: datetime, end_date: datetime, max_points: int) -> str:
+    """Pick the finest resolution that fits the range into max_points"""
+    span_days = max((end_date - start_date).days, 1)
+    for resolution, days in RESOLUTION_DAYS.items():
+        if span_days / days <= max_points:
+            return resolution
+    return "fiscal_year"
+
+def downsample(points: List[Dict[str, Any]], max_points: int) -> List[Dict[str, Any]]:
+    """Evenly thin a series to at most max_points, always keeping both ends"""
+    if len(points) <= max_points:
+        return points
+    step = (len(points) - 1) / (max_points - 1)
+    return [points[round(i * step)] for i in range(max_points)]
+
+class DebtSeriesStore:
+    """Incrementally syncs debt records and serves them at any resolution"""
+
+    def __init__(self, client: Optional[TreasuryClient] = None):
+        self.client = client or TreasuryClient()
+
+    async def sync(self) -> int:
+        """Fetch records newer than the latest stored one and refresh affected rollups"""
+        async with AsyncSessionLocal() as session:
+            latest = await session.scalar(select(func.max(DebtRecord.record_date)))
+            data = await self.client.get_debt_records(
+                after_date=latest.strftime("%Y-%m-%d") if latest else None
+            )
+            if "error" in data:
+                logger.error(f"Error syncing debt records: {data['error']}")
+                return 0
+
+            rows = [
+                {
+                    "record_date": datetime.strptime(record["date"], "%Y-%m-%d"),
+                    "total_debt": record["total_debt"],
+                    "debt_held_public": record["debt_held_public"],
+                    "intragov_holdings": record["intragov_holdings"],
+                }
+                for record in data["data"]
+            ]
+            if not rows:
+                logger.info("Debt records are up to date")
+                return 0
+
+            try:
+                # Batch inserts to stay under the driver's bind parameter limit
+                for i in range(0, len(rows), INSERT_BATCH_SIZE):
+                    await session.execute(
+                        insert(DebtRecord)
+                        .values(rows[i:i + INSERT_BATCH_SIZE])
+                        .on_conflict_do_nothing(index_elements=["record_date"])
+                    )
+                await self.refresh_rollups(session, min(row["record_date"] for row in rows))
+                await session.commit()
+            except Exception as e:
+                logger.error(f"Error storing debt records: {str(e)}")
+                await session.rollback()
+                return 0
+
+        logger.info(f"Stored {len(rows)} new debt records")
+        return len(rows)
+
+    async def refresh_rollups(self, session: AsyncSession, since: datetime) -> None:
+        """Recompute rollup periods from the one containing `since` onwards"""
+        for resolution, period_expression in ROLLUP_PERIODS.items():
+            start = period_start(resolution, since)
+            await session.execute(
+                delete(DebtRollup).where(
+                    DebtRollup.resolution == resolution,
+                    DebtRollup.period_start >= start
+                )
+            )
+            await session.execute(
+                text(f"""
+                    INSERT INTO debt_rollups (
+                        resolution, period_start, period_end,
+                        total_debt, debt_held_public, intragov_holdings,
+                        avg_total_debt, min_total_debt, max_total_debt, record_count
+                    )
+                    SELECT :resolution,
+                           {period_expression} AS period,
+                           max(record_date),
+                           (array_agg(total_debt ORDER BY record_date DESC))[1],
+                           (array_agg(debt_held_public ORDER BY record_date DESC))[1],
+                           (array_agg(intragov_holdings ORDER BY record_date DESC))[1],
+                           avg(total_debt),
+                           min(total_debt),
+                           max(total_debt),
+                           count(*)
+                    FROM debt_records
+                    WHERE record_date >= :start
+                    GROUP BY period
+                """),
+                {"resolution": resolution, "start": start}
+            )
+
+    async def get_series(
+        self,
+        session: AsyncSession,
+        start_date: datetime,
+        end_date: datetime,
+        resolution: str = "auto",
+        max_points: int = 500
+    ) -> Dict[str, Any]:
+        """Get the debt series for a range, downsampled to at most max_points"""
+        if resolution == "auto":
+            resolution = choose_resolution(start_date, end_date, max_points)
+
+        if resolution == "day":
+            query = select(
+                DebtRecord.record_date.label("date"),
+                DebtRecord.total_debt,
+                DebtRecord.debt_held_public,
+                DebtRecord.intragov_holdings
+            ).where(
+                DebtRecord.record_date >= start_date,
+                DebtRecord.record_date <= end_date
+            ).order_by(DebtRecord.record_date.desc())
+        else:
+            query = select(
+                DebtRollup.period_end.label("date"),
+                DebtRollup.period_start,
+                DebtRollup.total_debt,
+                DebtRollup.debt_held_public,
+                DebtRollup.intragov_holdings,
+                DebtRollup.min_total_debt,
+                DebtRollup.max_total_debt
+            ).where(
+                DebtRollup.resolution == resolution,
+                DebtRollup.period_end >= start_date,
+                DebtRollup.period_start <= end_date
+            ).order_by(DebtRollup.period_start.desc())
+
+        result = await session.execute(query)
+        points = []
+        for row in result.mappings():
+            point = dict(row)
+            point["date"] = point["date"].strftime("%Y-%m-%d")
+            if "period_start" in point:
+                point["period_start"] = point["period_start"].strftime("%Y-%m-%d")
+            points.append(point)
+
+        return {
+            "data": downsample(points, max_points),
+            "resolution": resolution,
+            "as_of": datetime.utcnow().isoformat()
+        }
+
+    async def has_records(self, session: AsyncSession) -> bool:
+        """Check whether any debt records have been synced"""
+        return await session.scalar(select(select(DebtRecord.id).exists()))
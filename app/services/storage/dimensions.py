@@ -0,0 +1,86 @@
+"""Resolution of dimension keys with an in-memory lookup cache"""
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.dimensions import Agency, AwardType, Location, Recipient
+
+# Values inserted and looked up per statement
+RESOLVE_BATCH_SIZE = 5000
+
+# Dimension name -> (model, natural key column name)
+DIMENSIONS = {
+    "agency": (Agency, "name"),
+    "recipient": (Recipient, "name"),
+    "location": (Location, "state_code"),
+    "award_type": (AwardType, "code"),
+}
+
+class DimensionResolver:
+    """Maps dimension values to integer surrogate keys, creating missing rows on demand.
+
+    Up to max_entries keys per dimension are cached per process, least recently
+    used first out. New dimension rows are committed in their own transaction
+    before their keys are cached, so a cached key never refers to a rolled-back row.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = settings.DIMENSION_CACHE_MAX_ENTRIES if max_entries is None else max_entries
+        self._keys: Dict[str, "OrderedDict[str, int]"] = {dimension: OrderedDict() for dimension in DIMENSIONS}
+
+    def _remember(self, cache: "OrderedDict[str, int]", keys: Dict[str, int]) -> None:
+        for value, key in keys.items():
+            cache[value] = key
+            cache.move_to_end(value)
+        while len(cache) > self.max_entries:
+            cache.popitem(last=False)
+
+    async def resolve_many(self, dimension: str, values: Iterable[Optional[str]]) -> Dict[str, int]:
+        """Resolve values to keys, returning a value -> key mapping"""
+        cache = self._keys[dimension]
+        wanted = {value for value in values if value}
+        resolved = {value: cache[value] for value in wanted if value in cache}
+        for value in resolved:
+            cache.move_to_end(value)
+        missing = wanted - resolved.keys()
+
+        if missing:
+            model, key_name = DIMENSIONS[dimension]
+            key_column = getattr(model, key_name)
+            pending = sorted(missing)
+            fetched: Dict[str, int] = {}
+            async with AsyncSessionLocal() as session:
+                for i in range(0, len(pending), RESOLVE_BATCH_SIZE):
+                    batch = pending[i:i + RESOLVE_BATCH_SIZE]
+                    await session.execute(
+                        insert(model)
+                        .values([{key_name: value} for value in batch])
+                        .on_conflict_do_nothing(index_elements=[key_name])
+                    )
+                    result = await session.execute(
+                        select(key_column, model.id).where(key_column.in_(batch))
+                    )
+                    fetched.update({value: key for value, key in result.all()})
+                await session.commit()
+            self._remember(cache, fetched)
+            resolved.update(fetched)
+
+        return resolved
+
+    async def resolve(self, dimension: str, value: Optional[str]) -> Optional[int]:
+        """Resolve a single value to its key"""
+        if not value:
+            return None
+        return (await self.resolve_many(dimension, [value]))[value]
+
+    def clear(self) -> None:
+        """Drop all cached keys"""
+        for cache in self._keys.values():
+            cache.clear()
+
+# Shared by all collectors in the process
+dimension_resolver = DimensionResolver()
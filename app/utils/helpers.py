@@ -0,0 +1,16 @@
+import re
+from datetime import date, datetime
+from typing import Optional, Tuple
+
+def agency_slug(name: Optional[str]) -> str:
+    """Normalize an agency name into a filesystem-safe partition value"""
+    slug = re.sub(r"[^a-z0-9]+", "-", (name or "").lower()).strip("-")
+    return slug or "unknown"
+
+def fiscal_year_for_date(value: date) -> int:
+    """Federal fiscal year (starting October 1) containing a date"""
+    return value.year + 1 if value.month >= 10 else value.year
+
+def fiscal_year_bounds(fiscal_year: int) -> Tuple[datetime, datetime]:
+    """Start of a federal fiscal year and the start of the next one"""
+    return datetime(fiscal_year - 1, 10, 1), datetime(fiscal_year, 10, 1)
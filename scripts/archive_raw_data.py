@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from app.services.storage.archive import RawDataArchiver
+from app.core.logger import logger
+
+async def main():
+    """Move raw payloads older than the hot window into the archive and clear expired award details"""
+    older_than_days = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    archiver = RawDataArchiver()
+    results = await archiver.archive_all(older_than_days)
+    for table, count in results.items():
+        logger.info(f"Archived {count} {table} payloads")
+    pruned = await archiver.prune_award_details()
+    logger.info(f"Cleared {pruned} expired award detail payloads")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,19 @@
+#!/usr/bin/env python3
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from app.services.storage.archive import RawDataArchiver
+from app.core.logger import logger
+
+async def main():
+    """Fill in generated_unique_award_id for awards whose raw_data was archived before migration 009"""
+    filled = await RawDataArchiver().backfill_award_keys()
+    logger.info(f"Backfilled {filled} award keys from the archive")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,3 +1,6 @@
 #!/bin/bash
 cd /app
-python scripts/collect_data.py >> /var/log/opendoge/collector.log 2>&1 
\ No newline at end of file
+python scripts/collect_data.py >> /var/log/opendoge/collector.log 2>&1
+python scripts/export_parquet.py >> /var/log/opendoge/export.log 2>&1
+python scripts/archive_raw_data.py >> /var/log/opendoge/archive.log 2>&1
+python scripts/warm_cache.py >> /var/log/opendoge/warm.log 2>&1
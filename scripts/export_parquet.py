@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from app.services.analysis.columnar import DATASETS, ParquetExporter
+from app.core.logger import logger
+
+async def main():
+    """Export awards, subawards and indicators to partitioned Parquet"""
+    datasets = sys.argv[1:] or list(DATASETS)
+    exporter = ParquetExporter()
+    for dataset in datasets:
+        if dataset not in DATASETS:
+            logger.error(f"Unknown dataset: {dataset}")
+            sys.exit(1)
+        await exporter.export(dataset)
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from app.services.storage.contractor_graph import rebuild_edges
+
+async def main():
+    """Recompute contractor graph edges from stored subawards"""
+    await rebuild_edges()
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,17 @@
+#!/usr/bin/env python3
+import asyncio
+import sys
+from pathlib import Path
+
+# Add project root to Python path
+project_root = str(Path(__file__).parent.parent)
+sys.path.append(project_root)
+
+from app.services.cache.warming import warm_cache
+
+async def main():
+    """Precompute cached responses for the dashboard and the most requested queries"""
+    await warm_cache()
+
+if __name__ == "__main__":
+    asyncio.run(main())
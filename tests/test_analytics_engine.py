@@ -0,0 +1,100 @@
+import pytest
+from datetime import datetime
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from app.services.analysis.engine import AnalyticsEngine
+from app.utils.helpers import agency_slug
+
+def write_awards(base_dir, rows):
+    """Write award rows as a hive-partitioned Parquet dataset"""
+    for row in rows:
+        row["agency"] = agency_slug(row["awarding_agency"])
+    table = pa.Table.from_pylist(rows)
+    ds.write_dataset(
+        table,
+        base_dir / "awards",
+        format="parquet",
+        partitioning=["fiscal_year", "agency"],
+        partitioning_flavor="hive",
+    )
+
+@pytest.fixture
+def engine(tmp_path):
+    write_awards(tmp_path, [
+        {"award_id": "1", "recipient_state": "VA", "award_amount": 100.0, "awarding_agency": "Department of Defense",
+         "recipient_name": "Acme", "award_type": "A", "start_date": datetime(2023, 10, 5), "fiscal_year": 2024},
+        {"award_id": "2", "recipient_state": "MD", "award_amount": 50.0, "awarding_agency": "Department of Defense",
+         "recipient_name": "Beta", "award_type": "B", "start_date": datetime(2023, 11, 5), "fiscal_year": 2024},
+        {"award_id": "3", "recipient_state": "VA", "award_amount": 70.0, "awarding_agency": "NASA",
+         "recipient_name": "Acme", "award_type": "02", "start_date": datetime(2023, 10, 20), "fiscal_year": 2024},
+        {"award_id": "4", "recipient_state": "TX", "award_amount": 500.0, "awarding_agency": "NASA",
+         "recipient_name": "Acme", "award_type": "A", "start_date": datetime(2022, 10, 20), "fiscal_year": 2023},
+    ])
+    return AnalyticsEngine(base_dir=str(tmp_path))
+
+@pytest.mark.asyncio
+async def test_spending_trends_filters_partitions(engine):
+    """Test monthly trends for one fiscal year and agency"""
+    result = await engine.spending_trends(fiscal_year=2024, agency="Department of Defense")
+
+    assert result["total_amount"] == 150.0
+    assert result["award_count"] == 2
+    assert [row["month"] for row in result["monthly"]] == ["2023-10", "2023-11"]
+
+@pytest.mark.asyncio
+async def test_spending_trends_category(engine):
+    """Test that categories map to award type codes"""
+    result = await engine.spending_trends(category="grants")
+
+    assert result["total_amount"] == 70.0
+
+@pytest.mark.asyncio
+async def test_agency_comparison(engine):
+    """Test comparing agencies ranked by a metric"""
+    result = await engine.agency_comparison(
+        fiscal_year=2024,
+        agencies=["Department of Defense", "NASA"],
+        metric="total_spending"
+    )
+
+    assert [row["agency"] for row in result["agencies"]] == ["department-of-defense", "nasa"]
+    assert result["agencies"][0]["award_count"] == 2
+
+@pytest.mark.asyncio
+async def test_agency_comparison_rejects_unknown_metric(engine):
+    """Test that unknown metrics are rejected"""
+    with pytest.raises(ValueError):
+        await engine.agency_comparison(fiscal_year=2024, agencies=["NASA"], metric="bogus")
+
+@pytest.mark.asyncio
+async def test_amount_anomalies(engine):
+    """Test that awards far from the fiscal year's mean amount are flagged, largest deviation first"""
+    rows = await engine.anomalies(fiscal_year=2024, threshold=1.0)
+
+    assert [row["award_id"] for row in rows] == ["1", "2"]
+    assert rows[0]["z_score"] > 0 > rows[1]["z_score"]
+
+@pytest.mark.asyncio
+async def test_anomalies_reject_unknown_category(engine):
+    """Test that unknown anomaly categories are rejected"""
+    with pytest.raises(ValueError):
+        await engine.anomalies(fiscal_year=2024, category="bogus")
+
+@pytest.mark.asyncio
+async def test_geographic_distribution(engine):
+    """Test state totals for a category and for every award type"""
+    contracts = await engine.geographic_distribution(fiscal_year=2024)
+    total = await engine.geographic_distribution(fiscal_year=2024, category="total")
+
+    assert [(row["state"], row["total_amount"]) for row in contracts["states"]] == [("VA", 100.0), ("MD", 50.0)]
+    assert total["total_amount"] == 220.0
+    assert total["states"][0]["state"] == "VA"
+    assert total["states"][0]["award_count"] == 2
+
+@pytest.mark.asyncio
+async def test_missing_export(tmp_path):
+    """Test querying before any export has been written"""
+    with pytest.raises(FileNotFoundError):
+        await AnalyticsEngine(base_dir=str(tmp_path)).spending_trends()
@@ -0,0 +1,28 @@
+import pytest
+
+from app.services.storage.archive import read_payload, resolve_raw_data, write_segment
+
+def test_segment_round_trip(tmp_path):
+    """Test writing payloads to a segment and reading them back by pointer"""
+    payloads = [{"Award ID": "A1", "Award Amount": 10.5}, {"Award ID": "A2"}, {"Award ID": "A1", "Award Amount": 10.5}]
+
+    pointers = write_segment(payloads, tmp_path)
+
+    assert len(pointers) == 3
+    assert pointers[0] == pointers[2]  # Identical payloads share a frame
+    assert [read_payload(pointer, tmp_path) for pointer in pointers] == payloads
+
+def test_segment_is_content_addressed(tmp_path):
+    """Test that rewriting the same payloads reuses the same segment"""
+    first = write_segment([{"a": 1}], tmp_path)
+    second = write_segment([{"a": 1}], tmp_path)
+
+    assert first == second
+    assert len(list(tmp_path.iterdir())) == 1
+
+@pytest.mark.asyncio
+async def test_resolve_prefers_hot_payload():
+    """Test that hot payloads are returned without touching the archive"""
+    result = await resolve_raw_data([({"hot": True}, "missing:0:0"), (None, None)])
+
+    assert result == [{"hot": True}, None]
@@ -0,0 +1,128 @@
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.storage import award_details
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    values = {}
+
+    async def fake_get_many(keys):
+        return {key: values[key] for key in keys if key in values}
+
+    async def fake_set_many(items, expire=None, tags=None):
+        values.update(items)
+
+    monkeypatch.setattr(award_details, "get_many", fake_get_many)
+    monkeypatch.setattr(award_details, "set_many", fake_set_many)
+    return values
+
+@pytest.fixture
+def stored_awards(monkeypatch):
+    rows = {}
+    persisted = {}
+
+    async def fake_load(award_ids):
+        return {award_id: rows[award_id] for award_id in award_ids if award_id in rows}
+
+    async def fake_persist(payloads):
+        persisted.update(payloads)
+
+    monkeypatch.setattr(award_details, "_load_stored", fake_load)
+    monkeypatch.setattr(award_details, "_persist", fake_persist)
+    return rows, persisted
+
+def stored_row(row_id, generated_id, detail_data=None, age=None):
+    return SimpleNamespace(
+        id=row_id,
+        generated_unique_award_id=generated_id,
+        detail_data=detail_data,
+        detail_fetched_at=datetime.utcnow() - age if age is not None else None
+    )
+
+class FakeClient:
+    """Upstream stand-in tracking how many detail calls run at once"""
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+        self.calls = []
+
+    async def get_award_details(self, award_id):
+        self.calls.append(award_id)
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.01)
+        self.active -= 1
+        if award_id == "BAD":
+            return {"error": "not found"}
+        return {"total_obligation": 100, "type": "A", "recipient": {"recipient_name": award_id}}
+
+@pytest.mark.asyncio
+async def test_batch_serves_cache_then_bounded_upstream(monkeypatch, memory_cache, stored_awards):
+    """Test cached details come first and misses are fetched with bounded concurrency"""
+    client = FakeClient()
+    monkeypatch.setattr(award_details, "USSpendingClient", lambda: client)
+    monkeypatch.setattr(award_details.settings, "AWARD_DETAIL_CONCURRENCY", 2)
+    memory_cache["award_details:CACHED"] = {"award_id": "CACHED"}
+
+    results = [item async for item in award_details.iter_award_details(
+        ["CACHED", "A1", "A2", "A3", "BAD", "A1"]
+    )]
+
+    assert results[0] == {"award_id": "CACHED"}
+    assert sorted(item["award_id"] for item in results) == ["A1", "A2", "A3", "BAD", "CACHED"]
+    assert sorted(client.calls) == ["A1", "A2", "A3", "BAD"]
+    assert client.peak == 2
+    # Failures are streamed back but not cached
+    assert "award_details:BAD" not in memory_cache
+    assert memory_cache["award_details:A1"]["recipient_name"] == "A1"
+
+@pytest.mark.asyncio
+async def test_fresh_stored_details_skip_upstream(monkeypatch, memory_cache, stored_awards):
+    """Test that stored details are served until they age out, then refetched and stored"""
+    rows, persisted = stored_awards
+    client = FakeClient()
+    monkeypatch.setattr(award_details, "USSpendingClient", lambda: client)
+    rows["FRESH"] = stored_row(1, "CONT_AWD_FRESH", {"type": "A", "total_obligation": 5}, timedelta(hours=1))
+    rows["STALE"] = stored_row(2, "CONT_AWD_STALE", {"type": "A"}, timedelta(days=30))
+
+    fresh = await award_details.get_award_details("FRESH")
+    stale = await award_details.get_award_details("STALE")
+
+    assert fresh["amount"] == 5.0
+    assert stale["recipient_name"] == "CONT_AWD_STALE"
+    # Upstream is asked with its own award key, and only for the stale record
+    assert client.calls == ["CONT_AWD_STALE"]
+    assert list(persisted) == [2]
+    assert set(memory_cache) == {"award_details:FRESH", "award_details:STALE"}
+
+@pytest.mark.asyncio
+async def test_cache_outage_falls_back_to_stored_and_upstream(monkeypatch, stored_awards):
+    """Test that a failing cache read is treated as a miss instead of ending the stream"""
+    rows, _ = stored_awards
+    client = FakeClient()
+    monkeypatch.setattr(award_details, "USSpendingClient", lambda: client)
+    rows["FRESH"] = stored_row(1, "CONT_AWD_FRESH", {"type": "A", "total_obligation": 5}, timedelta(hours=1))
+
+    async def failing_cache(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(award_details, "get_many", failing_cache)
+    monkeypatch.setattr(award_details, "set_many", failing_cache)
+
+    results = [item async for item in award_details.iter_award_details(["FRESH", "A1"])]
+
+    assert sorted(item["award_id"] for item in results) == ["A1", "FRESH"]
+    assert client.calls == ["A1"]
+
+def test_format_award_details_tolerates_missing_sections():
+    """Test that absent nested objects fall back to defaults"""
+    details = award_details.format_award_details("X", {"recipient": None, "total_obligation": None})
+
+    assert details["amount"] == 0.0
+    assert details["recipient_city"] == "Unknown"
+    assert details["awarding_sub_agency_name"] == "Unknown"
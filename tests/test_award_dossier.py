@@ -0,0 +1,102 @@
+import asyncio
+
+import pytest
+
+from app.services.storage import award_dossier
+
+@pytest.fixture
+def dossier_env(monkeypatch):
+    values = {}
+
+    async def fake_details(award_id):
+        return {"award_id": award_id, "recipient_name": "Acme"}
+
+    async def fake_get_many(keys):
+        return {key: values[key] for key in keys if key in values}
+
+    async def fake_set(key, value, expire=None, tags=None):
+        values[key] = value
+
+    monkeypatch.setattr(award_dossier, "get_award_details", fake_details)
+    monkeypatch.setattr(award_dossier, "get_many", fake_get_many)
+    monkeypatch.setattr(award_dossier, "set_cache", fake_set)
+    return values
+
+def section(result=None, delay=0.0, error=None):
+    async def fetch(award):
+        await asyncio.sleep(delay)
+        if error:
+            raise RuntimeError(error)
+        return result
+    return fetch
+
+@pytest.mark.asyncio
+async def test_dossier_returns_partial_results_at_deadline(monkeypatch, dossier_env):
+    """Test that slow sections are reported as pending or timed out while the rest return"""
+    monkeypatch.setattr(award_dossier, "SECTIONS", {
+        "subawards": (section({"results": [1]}), 1.0, 60),
+        "recipient": (section(delay=0.5), 0.01, 60),
+        "sam_entity": (section(error="SAM API Error"), 1.0, 60),
+        "filings": (section([{"cik": "1"}], delay=0.2), 1.0, 60),
+    })
+
+    dossier = await award_dossier.build_dossier("A1", deadline=0.1)
+
+    sections = dossier["sections"]
+    assert sections["subawards"] == {"status": "ok", "data": {"results": [1]}}
+    assert sections["recipient"] == {"status": "timeout"}
+    assert sections["sam_entity"] == {"status": "error", "error": "SAM API Error"}
+    assert sections["filings"] == {"status": "pending"}
+    assert dossier["complete"] is False
+
+    # The pending section finishes in the background and is cached for the next request
+    await asyncio.gather(*award_dossier._pending)
+    assert dossier_env["award_dossier:filings:A1"] == [{"cik": "1"}]
+    assert "award_dossier:sam_entity:A1" not in dossier_env
+
+@pytest.mark.asyncio
+async def test_dossier_serves_cached_sections(monkeypatch, dossier_env):
+    """Test that cached sections are not fetched again"""
+    calls = []
+
+    async def fetch(award):
+        calls.append(award["award_id"])
+        return {"fresh": True}
+
+    monkeypatch.setattr(award_dossier, "SECTIONS", {
+        "subawards": (fetch, 1.0, 60),
+        "recipient": (fetch, 1.0, 60),
+    })
+    dossier_env["award_dossier:subawards:A1"] = {"cached": True}
+
+    dossier = await award_dossier.build_dossier("A1")
+
+    assert dossier["sections"]["subawards"]["data"] == {"cached": True}
+    assert dossier["sections"]["recipient"]["data"] == {"fresh": True}
+    assert calls == ["A1"]
+    assert dossier["complete"] is True
+
+@pytest.mark.asyncio
+async def test_sam_entity_looks_up_uei_and_duns_separately(monkeypatch):
+    """Test that UEIs are sent as ueiSAM lookups and only real DUNS numbers as ueiDUNS"""
+    lookups = []
+
+    class FakeSAMClient:
+        def __init__(self, api_key):
+            pass
+
+        async def search_entities(self, **params):
+            lookups.append(params)
+            return {"entityData": []}
+
+    monkeypatch.setattr(award_dossier, "SAMClient", FakeSAMClient)
+
+    await award_dossier.fetch_sam_entity({"recipient_uei": "ABC123DEF456", "recipient_duns": "123456789"})
+    await award_dossier.fetch_sam_entity({"recipient_uei": None, "recipient_duns": "123456789"})
+    await award_dossier.fetch_sam_entity({"recipient_duns": "Unknown", "recipient_name": "Acme"})
+
+    assert lookups == [
+        {"uei": "ABC123DEF456", "page_size": 1},
+        {"duns": "123456789", "page_size": 1},
+        {"keyword": "Acme", "page_size": 1},
+    ]
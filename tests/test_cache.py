@@ -0,0 +1,259 @@
+import asyncio
+import time
+
+import pytest
+
+from app.core import cache
+from app.core.cache import INSTANCE_ID, LocalCache, handle_invalidation, local_ttl
+
+class FakeRedis:
+    """In-memory stand-in recording the commands that reach Redis"""
+
+    def __init__(self):
+        self.data = {}
+        self.gets = 0
+
+    async def get(self, key):
+        self.gets += 1
+        return self.data.get(key)
+
+def test_local_cache_evicts_least_recently_used():
+    """Test the size bound keeps recently read entries"""
+    local = LocalCache(max_entries=2)
+    local.set("a:1", 1, ttl=60)
+    local.set("a:2", 2, ttl=60)
+    local.get("a:1")
+    local.set("a:3", 3, ttl=60)
+
+    assert local.get("a:1") == (True, 1)
+    assert local.get("a:2") == (False, None)
+    assert local.stats()["a"] == {"hits": 2, "misses": 1}
+
+def test_local_cache_expires_entries(monkeypatch):
+    """Test entries are not served past their TTL"""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    local = LocalCache(max_entries=10)
+    local.set("current_debt", {"total": 1}, ttl=60)
+
+    now[0] += 59
+    assert local.get("current_debt") == (True, {"total": 1})
+    now[0] += 2
+    assert local.get("current_debt") == (False, None)
+    assert len(local) == 0
+
+def test_local_ttl_uses_prefix_policy_capped_by_expiry():
+    """Test per-prefix policies and the Redis expiry cap"""
+    assert local_ttl("current_debt") == cache.CACHE_POLICIES["current_debt"]
+    assert local_ttl("historical_debt:days:30", expire=10) == 10
+
+@pytest.mark.asyncio
+async def test_hot_reads_stay_in_process(monkeypatch):
+    """Test that a value read from Redis is then served locally"""
+    fake = FakeRedis()
+    fake.data["current_debt"] = '{"total": 5}'
+    monkeypatch.setattr(cache, "redis", fake)
+    monkeypatch.setattr(cache, "local_cache", LocalCache(max_entries=10))
+
+    assert await cache.get_cache("current_debt") == {"total": 5}
+    assert await cache.get_cache("current_debt") == {"total": 5}
+    assert fake.gets == 1
+
+def test_invalidation_skips_own_messages(monkeypatch):
+    """Test that only other processes' invalidations evict local entries"""
+    local = LocalCache(max_entries=10)
+    monkeypatch.setattr(cache, "local_cache", local)
+    local.set("current_debt", 1, ttl=60)
+
+    handle_invalidation(f"{INSTANCE_ID}:current_debt")
+    assert local.get("current_debt") == (True, 1)
+    handle_invalidation("other:current_debt")
+    assert local.get("current_debt") == (False, None)
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    """Route get_cache/set_cache to a dict"""
+    store = {}
+
+    async def fake_get(key):
+        return store.get(key)
+
+    async def fake_set(key, value, expire=None, tags=None):
+        store[key] = value
+        for tag in tags or ():
+            store.setdefault(f"tag:{tag}", set()).add(key)
+
+    async def fake_acquire(key):
+        return None if store.get(f"lock:{key}") else "token"
+
+    async def fake_release(key, token):
+        pass
+
+    monkeypatch.setattr(cache, "get_cache", fake_get)
+    monkeypatch.setattr(cache, "set_cache", fake_set)
+    monkeypatch.setattr(cache, "_acquire_lock", fake_acquire)
+    monkeypatch.setattr(cache, "_release_lock", fake_release)
+    return store
+
+@pytest.mark.asyncio
+async def test_cached_serves_stale_and_refreshes_in_background(memory_cache, monkeypatch):
+    """Test that an expired soft TTL returns the old value without waiting"""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "time", lambda: now[0])
+    calls = []
+
+    @cache.cached("debt", soft_ttl=10, hard_ttl=100)
+    async def fetch(series):
+        calls.append(series)
+        return {"value": len(calls)}
+
+    assert await fetch("total") == {"value": 1}
+    now[0] += 11
+    assert await fetch("total") == {"value": 1}
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert await fetch("total") == {"value": 2}
+    assert calls == ["total", "total"]
+
+@pytest.mark.asyncio
+async def test_cached_negatively_caches_errors(memory_cache):
+    """Test that error results and exceptions are not refetched within error_ttl"""
+    calls = []
+
+    @cache.cached("upstream", soft_ttl=10, error_ttl=30)
+    async def failing(kind, db=None):
+        calls.append(kind)
+        if kind == "raise":
+            raise RuntimeError("upstream down")
+        return {"error": "bad gateway"}
+
+    assert await failing("dict", db=object()) == {"error": "bad gateway"}
+    assert await failing("dict", db=object()) == {"error": "bad gateway"}
+    with pytest.raises(RuntimeError):
+        await failing("raise")
+    with pytest.raises(cache.CachedUpstreamError):
+        await failing("raise")
+    assert calls == ["dict", "raise"]
+
+@pytest.mark.asyncio
+async def test_cached_tags_entries_from_arguments(memory_cache):
+    """Test that tags derived from call arguments are stored with the entry"""
+    @cache.cached(
+        "recent", soft_ttl=10,
+        tags=lambda arguments: [cache.cache_tag("award_type", code) for code in arguments["award_types"]]
+    )
+    async def recent(award_types):
+        return {"results": []}
+
+    await recent(["A", "B"])
+
+    key = cache.generate_cache_key("recent", award_types=["A", "B"])
+    assert memory_cache["tag:award_type:a"] == {key}
+    assert memory_cache["tag:award_type:b"] == {key}
+
+@pytest.mark.asyncio
+async def test_cached_fetch_opens_its_own_session(memory_cache, monkeypatch):
+    """Test that a request session passed as db never reaches the cached fetch"""
+    opened = []
+
+    class FakeSession:
+        async def __aenter__(self):
+            opened.append(self)
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    monkeypatch.setattr(cache, "AsyncSessionLocal", FakeSession)
+    seen = []
+
+    @cache.cached("session_test", soft_ttl=10)
+    async def stored(days, db=None):
+        seen.append(db)
+        return {"days": days}
+
+    request_session = object()
+    assert await stored(30, db=request_session) == {"days": 30}
+    assert seen == opened
+    assert request_session not in seen
+
+def test_cache_tag_normalizes_values():
+    """Test that tag values match regardless of case and punctuation"""
+    assert cache.cache_tag("agency", "Department of Defense") == "agency:department-of-defense"
+    assert cache.cache_tag("fy", 2025) == "fy:2025"
+
+@pytest.mark.asyncio
+async def test_miss_waits_for_lock_holder(memory_cache, monkeypatch):
+    """Test that a miss waits for another worker's recompute instead of calling upstream"""
+    monkeypatch.setattr(cache.settings, "CACHE_LOCK_POLL_INTERVAL", 0.001)
+    calls = []
+
+    @cache.cached("popular", soft_ttl=10)
+    async def popular():
+        calls.append(1)
+        return {"value": "mine"}
+
+    key = cache.generate_cache_key("popular")
+    memory_cache[f"lock:{key}"] = "other-worker"
+
+    async def other_worker_finishes():
+        await asyncio.sleep(0.01)
+        memory_cache[key] = {"v": {"value": "theirs"}, "t": 0, "e": time.time() + 10}
+
+    finisher = asyncio.create_task(other_worker_finishes())
+    assert await popular() == {"value": "theirs"}
+    await finisher
+    assert calls == []
+
+@pytest.mark.asyncio
+async def test_slow_keys_refresh_early(memory_cache, monkeypatch):
+    """Test XFetch early refresh of a fresh value close to expiry"""
+    now = time.time()
+    calls = []
+
+    @cache.cached("slow", soft_ttl=60)
+    async def slow():
+        calls.append(1)
+        return {"value": len(calls)}
+
+    key = cache.generate_cache_key("slow")
+    memory_cache[key] = {"v": {"value": 0}, "t": now - 59, "e": now + 1, "d": 5.0}
+
+    monkeypatch.setattr(cache.random, "random", lambda: 0.5)
+    assert await slow() == {"value": 0}
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+    assert calls == [1]
+
+    memory_cache[key] = {"v": {"value": 0}, "t": now, "e": now + 60, "d": 5.0}
+    assert await slow() == {"value": 0}
+    await asyncio.sleep(0)
+    assert calls == [1]
+
+class FakeMultiRedis(FakeRedis):
+    """Adds MGET to the in-memory stand-in"""
+
+    def __init__(self):
+        super().__init__()
+        self.mgets = []
+
+    async def mget(self, keys):
+        self.mgets.append(list(keys))
+        return [self.data.get(key) for key in keys]
+
+@pytest.mark.asyncio
+async def test_get_many_fetches_only_non_local_keys_in_one_call(monkeypatch):
+    """Test partial hits: local entries are skipped and Redis is asked once"""
+    fake = FakeMultiRedis()
+    fake.data["award:2"] = cache.encode({"id": 2})
+    local = LocalCache(max_entries=10)
+    local.set("award:1", {"id": 1}, ttl=60)
+    monkeypatch.setattr(cache, "redis", fake)
+    monkeypatch.setattr(cache, "local_cache", local)
+
+    found = await cache.get_many(["award:1", "award:2", "award:3"])
+
+    assert found == {"award:1": {"id": 1}, "award:2": {"id": 2}}
+    assert fake.mgets == [["award:2", "award:3"]]
+    assert await cache.get_many(["award:2"]) == {"award:2": {"id": 2}}
+    assert len(fake.mgets) == 1
@@ -0,0 +1,34 @@
+import json
+from datetime import date
+
+from app.core.cache import generate_cache_key
+from app.core.cache_codec import VERSION_ORJSON, VERSION_ORJSON_ZSTD, decode, encode
+
+def test_small_values_round_trip_uncompressed():
+    """Test that small values carry the plain version byte"""
+    data = encode({"total_debt": 1.5, "record_date": "2024-01-01"})
+
+    assert data[0] == VERSION_ORJSON
+    assert decode(data) == {"total_debt": 1.5, "record_date": "2024-01-01"}
+
+def test_large_values_are_compressed():
+    """Test that values above the threshold are zstd-compressed"""
+    series = [{"record_date": f"2024-01-{day % 28 + 1:02d}", "total_debt": 34e12 + day} for day in range(2000)]
+    data = encode(series)
+
+    assert data[0] == VERSION_ORJSON_ZSTD
+    assert len(data) < len(json.dumps(series)) / 4
+    assert decode(data) == series
+
+def test_legacy_json_entries_still_decode():
+    """Test that entries written before the codec change are readable"""
+    assert decode(json.dumps({"a": [1, 2]}).encode()) == {"a": [1, 2]}
+
+def test_cache_keys_are_canonical():
+    """Test that argument order and list order do not change the key"""
+    first = generate_cache_key("search", award_type=["A", "B"], since=date(2024, 1, 1), filters={"x": 1, "y": 2})
+    second = generate_cache_key("search", filters={"y": 2, "x": 1}, since=date(2024, 1, 1), award_type=["B", "A"])
+
+    assert first == second
+    assert first.startswith("search:")
+    assert first != generate_cache_key("search", award_type=["A"], since=date(2024, 1, 1), filters={"x": 1, "y": 2})
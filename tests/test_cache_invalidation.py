@@ -0,0 +1,94 @@
+from datetime import date, timedelta
+
+import pytest
+
+from app.core import cache
+from app.core.cache import LocalCache
+from app.services.cache.invalidation import award_cache_tags, award_response_tags, publish_cache_tags
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.commands.append((name, args))
+
+    async def execute(self):
+        return [getattr(self.redis, name)(*args) for name, args in self.commands]
+
+class FakeRedis:
+    """In-memory strings and sets covering the commands tag invalidation uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def sadd(self, key, member):
+        self.data.setdefault(key, set()).add(member.encode())
+
+    def smembers(self, key):
+        return self.data.get(key, set())
+
+    def delete(self, *keys):
+        for key in keys:
+            self.data.pop(key, None)
+
+    def incr(self, key):
+        self.data[key] = self.data.get(key, 0) + 1
+
+    def expire(self, key, seconds):
+        pass
+
+    def publish(self, channel, message):
+        pass
+
+@pytest.mark.asyncio
+async def test_award_write_evicts_cached_award_responses(monkeypatch):
+    """Test that award writes evict cached award responses whose window covers them, and only those"""
+    fake = FakeRedis()
+    monkeypatch.setattr(cache, "redis", fake)
+    monkeypatch.setattr(cache, "local_cache", LocalCache(max_entries=10))
+
+    async def no_lock(key):
+        return ""
+
+    monkeypatch.setattr(cache, "_acquire_lock", no_lock)
+
+    # Same decoration as the recent awards route
+    @cache.cached("recent_awards_test", soft_ttl=300, hard_ttl=3600, tags=award_response_tags)
+    async def recent(days, award_types):
+        return {"results": []}
+
+    await recent(30, ["A", "B"])
+    key = cache.generate_cache_key("recent_awards_test", days=30, award_types=["A", "B"])
+    assert key in fake.data
+
+    # Awards starting long before the window leave the entry in place
+    await publish_cache_tags(award_cache_tags([
+        {"Award ID": "X0", "Start Date": (date.today() - timedelta(days=3 * 365)).isoformat()}
+    ]))
+    assert key in fake.data
+
+    await publish_cache_tags(award_cache_tags([
+        {"Award ID": "X1", "Start Date": date.today().isoformat(), "Awarding Agency": "Department of Defense"}
+    ]))
+
+    assert key not in fake.data
+    assert cache.local_cache.get(key) == (False, None)
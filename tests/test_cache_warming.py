@@ -0,0 +1,65 @@
+from datetime import date
+from typing import List, Optional
+
+import pytest
+from fastapi import Query
+
+from app.core import cache
+from app.services.cache import warming
+from app.services.cache.warming import call_arguments
+
+async def historical(
+    days: int = Query(365, ge=1),
+    start_date: Optional[date] = Query(None),
+    award_types: List[str] = Query(["A", "B"]),
+    db=None,
+):
+    return {}
+
+def test_call_arguments_restores_types_and_query_defaults():
+    """Test that recorded arguments are converted back for a direct call"""
+    session = object()
+
+    arguments = call_arguments(historical, {"days": "30", "start_date": "2024-01-01"}, session)
+
+    assert arguments == {
+        "days": 30,
+        "start_date": date(2024, 1, 1),
+        "award_types": ["A", "B"],
+        "db": session,
+    }
+
+def test_call_arguments_rejects_missing_required():
+    """Test that shapes without required arguments are skipped"""
+    async def search(keyword: str = Query(...)):
+        return {}
+
+    with pytest.raises(ValueError):
+        call_arguments(search, {}, None)
+
+@pytest.mark.asyncio
+async def test_warm_shapes_put_configured_queries_first(monkeypatch):
+    """Test that configured dashboard queries are always warmed"""
+    async def fake_top(limit):
+        return [("recent_awards", {"days": 7})]
+
+    monkeypatch.setattr(warming, "top_accessed", fake_top)
+    monkeypatch.setattr(warming.settings, "CACHE_WARM_QUERIES", [{"prefix": "current_debt", "args": {}}])
+
+    assert await warming.warm_shapes() == [("current_debt", {}), ("recent_awards", {"days": 7})]
+
+def test_cached_functions_register_for_warming():
+    """Test that functions without self are registered and expose refresh"""
+    @cache.cached("warm_test", soft_ttl=10)
+    async def standalone():
+        return {}
+
+    class Client:
+        @cache.cached("warm_test_method", soft_ttl=10)
+        async def method(self):
+            return {}
+
+    functions = cache.cached_functions()
+    assert functions["warm_test"] is standalone
+    assert hasattr(standalone, "refresh")
+    assert "warm_test_method" not in functions
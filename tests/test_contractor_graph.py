@@ -0,0 +1,65 @@
+import pytest
+
+from app.services.storage import contractor_graph
+from app.services.storage.contractor_graph import aggregate_edges, recipient_key, traverse
+
+def test_recipient_key_prefers_uei_then_duns_then_name():
+    """Test recipient node key precedence and name normalization"""
+    assert recipient_key(" abc123 ", "0001", "Acme") == "uei:ABC123"
+    assert recipient_key(None, "0001", "Acme") == "duns:0001"
+    assert recipient_key("", None, "  Acme   Corp ") == "name:ACME CORP"
+    assert recipient_key(None, None, " ") is None
+
+def test_aggregate_edges_sums_by_recipient_pair():
+    """Test that subawards fold into weighted prime-to-subrecipient edges"""
+    primes = {"P1": ("uei:PRIME", "Prime Co"), "P2": ("uei:PRIME", "Prime Co")}
+    subawards = [
+        {"prime_award_id": "P1", "recipient_key": "uei:SUB", "recipient_name": "Sub Co", "amount": 100},
+        {"prime_award_id": "P2", "recipient_key": "uei:SUB", "recipient_name": "Sub Co", "amount": 50},
+        {"prime_award_id": "P9", "recipient_key": "uei:SUB", "recipient_name": "Sub Co", "amount": 1},
+        {"prime_award_id": "P1", "recipient_key": "uei:PRIME", "recipient_name": "Prime Co", "amount": 5},
+    ]
+
+    edges = aggregate_edges(subawards, primes)
+
+    assert list(edges) == [("uei:PRIME", "uei:SUB")]
+    assert edges[("uei:PRIME", "uei:SUB")]["total_amount"] == 150
+    assert edges[("uei:PRIME", "uei:SUB")]["award_count"] == 2
+
+@pytest.mark.asyncio
+async def test_traverse_is_bounded_by_depth_and_fan_out(monkeypatch):
+    """Test breadth-first traversal limits"""
+    graph = {"A": ["B", "C"], "B": ["D"], "C": ["E"], "D": ["F"]}
+    amounts = {"B": 10, "C": 5, "D": 7, "E": 3, "F": 1}
+
+    async def fake_adjacency(db, direction, keys):
+        return {
+            key: [
+                {"source": key, "target": target, "source_name": key, "target_name": target,
+                 "total_amount": amounts[target], "award_count": 1}
+                for target in graph.get(key, [])
+            ]
+            for key in keys
+        }
+
+    monkeypatch.setattr(contractor_graph, "get_adjacency", fake_adjacency)
+
+    result = await traverse(None, "A", depth=2, max_neighbors=1)
+
+    assert {node["key"]: node["depth"] for node in result["nodes"]} == {"A": 0, "B": 1, "D": 2}
+    assert [(edge["source"], edge["target"]) for edge in result["edges"]] == [("A", "B"), ("B", "D")]
+
+@pytest.mark.asyncio
+async def test_adjacency_cache_outage_reads_from_database(monkeypatch):
+    """Test that cache read and write errors fall back to loading edges from the database"""
+    async def failing_cache(*args, **kwargs):
+        raise ConnectionError("redis down")
+
+    async def fake_load(db, direction, keys):
+        return {key: [] for key in keys}
+
+    monkeypatch.setattr(contractor_graph, "get_many", failing_cache)
+    monkeypatch.setattr(contractor_graph, "set_many", failing_cache)
+    monkeypatch.setattr(contractor_graph, "_load_adjacency", fake_load)
+
+    assert await contractor_graph.get_adjacency(None, "out", ["uei:A", "uei:B"]) == {"uei:A": [], "uei:B": []}
@@ -0,0 +1,29 @@
+from datetime import datetime
+
+from app.services.storage.debt_series import choose_resolution, downsample, period_start
+
+def test_period_start():
+    """Test rollup period boundaries"""
+    value = datetime(2024, 11, 14, 15, 30)
+
+    assert period_start("week", value) == datetime(2024, 11, 11)
+    assert period_start("month", value) == datetime(2024, 11, 1)
+    assert period_start("fiscal_year", value) == datetime(2024, 10, 1)
+    assert period_start("fiscal_year", datetime(2024, 9, 30)) == datetime(2023, 10, 1)
+
+def test_choose_resolution():
+    """Test picking the finest resolution that fits the point budget"""
+    assert choose_resolution(datetime(2024, 1, 1), datetime(2024, 12, 31), 500) == "day"
+    assert choose_resolution(datetime(2015, 1, 1), datetime(2024, 12, 31), 600) == "week"
+    assert choose_resolution(datetime(1993, 4, 1), datetime(2024, 12, 31), 100) == "fiscal_year"
+
+def test_downsample_keeps_ends():
+    """Test thinning a series to the requested number of points"""
+    points = [{"date": i} for i in range(1000)]
+
+    result = downsample(points, 10)
+
+    assert len(result) == 10
+    assert result[0]["date"] == 0
+    assert result[-1]["date"] == 999
+    assert downsample(points[:5], 10) == points[:5]
@@ -0,0 +1,89 @@
+import pytest
+
+from app.services.storage import dimensions
+from app.services.storage.dimensions import DimensionResolver
+
+class FakeDimensionTable:
+    """Session factory over one in-memory dimension table, assigning keys on insert"""
+
+    def __init__(self, rows=None):
+        self.rows = dict(rows or {})
+        self.sessions = 0
+        self.inserted = []
+        self.committed = False
+
+    def __call__(self):
+        self.sessions += 1
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if statement.is_insert:
+            return None
+        values = statement.whereclause.right.value
+        for value in values:
+            if value not in self.rows:
+                self.rows[value] = len(self.rows) + 1
+                self.inserted.append(value)
+        return FakeResult([(value, self.rows[value]) for value in values])
+
+    async def commit(self):
+        self.committed = True
+
+class FakeResult:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+@pytest.fixture
+def table(monkeypatch):
+    table = FakeDimensionTable({"NASA": 7})
+    monkeypatch.setattr(dimensions, "AsyncSessionLocal", table)
+    return table
+
+@pytest.mark.asyncio
+async def test_miss_creates_rows_then_hits_cache(table):
+    """Test that missing values are created once and later lookups stay in process"""
+    resolver = DimensionResolver()
+
+    keys = await resolver.resolve_many("agency", ["NASA", "Department of Energy"])
+    again = await resolver.resolve_many("agency", ["Department of Energy", "NASA"])
+
+    assert keys == again == {"NASA": 7, "Department of Energy": 2}
+    assert table.inserted == ["Department of Energy"]
+    assert table.committed
+    assert table.sessions == 1
+
+@pytest.mark.asyncio
+async def test_blank_and_repeated_values_are_dropped(table):
+    """Test that None, empty strings and duplicates never reach the table"""
+    resolver = DimensionResolver()
+
+    keys = await resolver.resolve_many("recipient", ["Acme", None, "", "Acme"])
+
+    assert keys == {"Acme": 2}
+    assert table.inserted == ["Acme"]
+    assert await resolver.resolve("recipient", "") is None
+    assert table.sessions == 1
+
+@pytest.mark.asyncio
+async def test_cache_evicts_least_recently_used(table):
+    """Test the per-dimension size bound keeps recently resolved values"""
+    resolver = DimensionResolver(max_entries=2)
+
+    await resolver.resolve_many("recipient", ["Acme", "Beta"])
+    await resolver.resolve("recipient", "Acme")
+    await resolver.resolve("recipient", "Gamma")
+    assert table.sessions == 2
+
+    assert await resolver.resolve("recipient", "Acme") == 2
+    assert table.sessions == 2
+    assert await resolver.resolve("recipient", "Beta") == 3
+    assert table.sessions == 3
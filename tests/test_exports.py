@@ -0,0 +1,77 @@
+import gzip
+import io
+from datetime import datetime
+
+import pyarrow.parquet as pq
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1 import exports
+
+ROWS = [
+    {"id": index, "award_id": f"A{index}", "award_amount": 1000.0 * index, "start_date": datetime(2024, 1, index + 1)}
+    for index in range(5)
+]
+
+def _client(monkeypatch, chunk_sizes):
+    queries = []
+
+    async def fake_chunks(query, chunk_size, params=None):
+        queries.append((str(query), params))
+        chunk_sizes.append(chunk_size)
+        yield ROWS[:3]
+        yield ROWS[3:]
+
+    monkeypatch.setattr(exports, "iter_row_chunks", fake_chunks)
+    app = FastAPI()
+    app.include_router(exports.router, prefix="/exports")
+    return TestClient(app), queries
+
+FIELDS = "fields=id&fields=award_id&fields=award_amount&fields=start_date"
+
+def test_csv_export_streams_header_and_rows(monkeypatch):
+    """Test that CSV exports carry a header and every chunk's rows"""
+    client, queries = _client(monkeypatch, [])
+
+    response = client.get(f"/exports/awards?fiscal_year=2024&{FIELDS}")
+
+    assert response.status_code == 200
+    assert response.headers["content-disposition"] == 'attachment; filename="awards_fy2024.csv"'
+    lines = response.text.splitlines()
+    assert lines[0] == "id,award_id,award_amount,start_date"
+    assert len(lines) == 6
+    # The fiscal year runs from October 1 to the next October 1, exclusive
+    assert queries[0][1] == {
+        "fiscal_year_start": datetime(2023, 10, 1),
+        "fiscal_year_end": datetime(2024, 10, 1),
+    }
+
+def test_gzip_ndjson_export(monkeypatch):
+    """Test that gzip output decompresses to one JSON object per row"""
+    client, _ = _client(monkeypatch, [])
+
+    response = client.get(f"/exports/awards?format=ndjson&gzip=true&{FIELDS}")
+
+    assert response.headers["content-type"] == "application/gzip"
+    lines = gzip.decompress(response.content).decode().splitlines()
+    assert len(lines) == 5
+    assert lines[0].startswith('{"id": 0')
+
+def test_parquet_export_writes_row_groups(monkeypatch):
+    """Test that Parquet exports write one row group per chunk"""
+    chunk_sizes = []
+    client, _ = _client(monkeypatch, chunk_sizes)
+
+    response = client.get(f"/exports/awards?format=parquet&{FIELDS}")
+
+    parquet = pq.ParquetFile(io.BytesIO(response.content))
+    assert parquet.num_row_groups == 2
+    assert parquet.read().column("award_id").to_pylist() == [row["award_id"] for row in ROWS]
+    assert chunk_sizes == [exports.PARQUET_ROW_GROUP_SIZE]
+
+def test_export_rejects_payload_fields_and_gzip_parquet(monkeypatch):
+    """Test that raw payloads are not exportable and Parquet is not double-compressed"""
+    client, _ = _client(monkeypatch, [])
+
+    assert client.get("/exports/awards?fields=raw_data").status_code == 400
+    assert client.get("/exports/awards?format=parquet&gzip=true").status_code == 400
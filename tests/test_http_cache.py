@@ -0,0 +1,109 @@
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import cache, http_cache
+from app.core.http_cache import ConditionalResponseMiddleware, parse_if_none_match
+
+def _patch_cache(monkeypatch):
+    store = {}
+
+    async def fake_get(key):
+        return store.get(key)
+
+    async def fake_set(key, value, expire=None, tags=None):
+        store[key] = value
+
+    async def fake_acquire(key):
+        return "token"
+
+    async def fake_release(key, token):
+        pass
+
+    async def fake_versions(tags):
+        return [3 for _ in tags]
+
+    monkeypatch.setattr(cache, "get_cache", fake_get)
+    monkeypatch.setattr(cache, "set_cache", fake_set)
+    monkeypatch.setattr(cache, "_acquire_lock", fake_acquire)
+    monkeypatch.setattr(cache, "_release_lock", fake_release)
+    monkeypatch.setattr(http_cache, "data_versions", fake_versions)
+
+def _app(monkeypatch):
+    _patch_cache(monkeypatch)
+    calls = []
+
+    app = FastAPI()
+    app.add_middleware(ConditionalResponseMiddleware, policies=(
+        ("/debt", "public, max-age=60", ()),
+        ("/filings", "public, max-age=300", ("source:sec",)),
+    ))
+
+    @app.get("/debt")
+    @cache.cached("http_test_debt", soft_ttl=60)
+    async def debt():
+        calls.append("debt")
+        return {"total": 1}
+
+    @app.get("/filings")
+    async def filings():
+        calls.append("filings")
+        return [{"cik": "1"}]
+
+    return TestClient(app), calls
+
+def test_cached_route_answers_matching_etag_with_304(monkeypatch):
+    """Test ETag from the cached payload hash and the 304 fast path"""
+    client, calls = _app(monkeypatch)
+
+    first = client.get("/debt")
+    etag = first.headers["etag"]
+    second = client.get("/debt", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert first.headers["cache-control"] == "public, max-age=60"
+    assert "last-modified" in first.headers
+    assert second.status_code == 304
+    assert second.headers["etag"] == etag
+    assert second.content == b""
+    assert calls == ["debt"]
+
+def test_versioned_route_skips_handler_on_match(monkeypatch):
+    """Test data-version ETags answer 304 before the route runs"""
+    client, calls = _app(monkeypatch)
+
+    first = client.get("/filings?cik=1")
+    second = client.get("/filings?cik=1", headers={"If-None-Match": f'W/{first.headers["etag"]}'})
+    other = client.get("/filings?cik=2", headers={"If-None-Match": first.headers["etag"]})
+
+    assert second.status_code == 304
+    assert other.status_code == 200
+    assert calls == ["filings", "filings"]
+
+def test_parse_if_none_match():
+    """Test entity tag list parsing"""
+    assert parse_if_none_match('"a", W/"b"') == {"a", "b"}
+    assert parse_if_none_match(None) == set()
+
+def test_policies_apply_to_mounted_routes(monkeypatch):
+    """Test that every policy prefix matches a route of the real app, and debt responses get validators"""
+    main = pytest.importorskip("app.main")
+    from app.api.v1 import treasury
+
+    _patch_cache(monkeypatch)
+
+    class FakeTreasuryClient:
+        async def get_debt_to_penny(self):
+            return {"total": 1}
+
+    monkeypatch.setattr(treasury, "TreasuryClient", FakeTreasuryClient)
+    paths = list(main.app.openapi()["paths"])
+
+    for prefix, _, _ in http_cache.ROUTE_POLICIES:
+        assert any(path.startswith(prefix) for path in paths), prefix
+    assert "/api/v1/usaspending/awards/recent" in paths
+
+    response = TestClient(main.app).get("/api/v1/treasury/debt/current")
+    assert response.status_code == 200
+    assert response.headers["cache-control"].startswith("public, max-age=60")
+    assert "etag" in response.headers
@@ -0,0 +1,49 @@
+import operator
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.services.search.awards import ingestion_window, is_window_ingested
+
+class FakeWindowTable:
+    """Session stand-in that evaluates is_window_ingested's filters against recorded windows"""
+
+    def __init__(self, windows):
+        self.windows = windows
+
+    async def execute(self, statement):
+        matches = [
+            window.award_types for window in self.windows
+            if all(self._matches(window, criterion) for criterion in statement._where_criteria)
+        ]
+        return FakeResult(matches)
+
+    def _matches(self, window, criterion):
+        compare = {operator.le: operator.le, operator.ge: operator.ge}[criterion.operator]
+        return compare(getattr(window, criterion.left.key), criterion.right.value)
+
+class FakeResult:
+    def __init__(self, values):
+        self.values = values
+
+    def scalars(self):
+        return self.values
+
+NOW = datetime(2026, 10, 19, 14, 30)
+
+@pytest.mark.asyncio
+async def test_recorded_window_covers_a_search_of_the_same_length():
+    """Test that a 30-day ingestion answers the default 30-day search locally"""
+    db = FakeWindowTable([ingestion_window(30, 1000000, 120, ["A", "B", "C", "D"], now=NOW)])
+
+    assert await is_window_ingested(db, NOW - timedelta(days=30), NOW, ["A", "B"], 1000000)
+    assert await is_window_ingested(db, NOW - timedelta(days=7), NOW, ["A"], 5000000)
+
+@pytest.mark.asyncio
+async def test_recorded_window_does_not_cover_wider_searches():
+    """Test longer windows, lower minimums and types never collected are sent upstream"""
+    db = FakeWindowTable([ingestion_window(30, 1000000, 120, ["A", "B", "C", "D"], now=NOW)])
+
+    assert not await is_window_ingested(db, NOW - timedelta(days=31), NOW, ["A"], 1000000)
+    assert not await is_window_ingested(db, NOW - timedelta(days=30), NOW, ["A"], 0)
+    assert not await is_window_ingested(db, NOW - timedelta(days=30), NOW, ["IDV_A"], 1000000)
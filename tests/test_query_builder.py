@@ -0,0 +1,46 @@
+from app.db.query_builder import FilteredQuery
+from app.models.government_data import Subaward
+
+def _subaward_query(max_size=256):
+    return FilteredQuery(Subaward, {
+        "prime_award_id": (Subaward.prime_award_id, "eq"),
+        "recipient_name": (Subaward.recipient_name, "contains"),
+        "min_amount": (Subaward.amount, "gte"),
+    }, max_size=max_size)
+
+def test_same_filter_shape_reuses_statement():
+    """Test that requests with the same active filters share one statement"""
+    filtered = _subaward_query()
+    columns = [Subaward.subaward_id, Subaward.amount]
+
+    first, first_params = filtered.build(columns, {"prime_award_id": "A1", "min_amount": 10})
+    second, second_params = filtered.build(columns, {"prime_award_id": "B2", "min_amount": 99})
+
+    assert first is second
+    assert first_params == {"prime_award_id": "A1", "min_amount": 10}
+    assert second_params == {"prime_award_id": "B2", "min_amount": 99}
+    assert filtered.cache_size() == 1
+
+def test_contains_wraps_pattern_and_operator_override():
+    """Test substring parameters and per-request operator overrides"""
+    filtered = _subaward_query()
+    columns = [Subaward.recipient_name]
+
+    substring, params = filtered.build(columns, {"recipient_name": "acme"})
+    fuzzy, fuzzy_params = filtered.build(columns, {"recipient_name": "acme"}, {"recipient_name": "similar"})
+
+    assert params == {"recipient_name": "%acme%"}
+    assert fuzzy_params == {"recipient_name": "acme"}
+    assert substring is not fuzzy
+    assert "similarity" in str(fuzzy)
+
+def test_statement_cache_is_bounded():
+    """Test that the least recently used statement shapes are evicted"""
+    filtered = _subaward_query(max_size=2)
+    columns = [Subaward.subaward_id]
+
+    filtered.build(columns, {"prime_award_id": "A1"})
+    filtered.build(columns, {"min_amount": 1})
+    filtered.build(columns, {"recipient_name": "x"})
+
+    assert filtered.cache_size() == 2
@@ -0,0 +1,119 @@
+import pytest
+
+from app.services.ai import query_cache, smart_search
+from app.services.ai.query_cache import normalize_query
+
+class FakePipeline:
+    """Queues commands and runs them against FakeRedis on execute"""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args) for name, args in self.commands]
+
+class FakeRedis:
+    """In-memory sorted set standing in for the LRU index"""
+
+    def __init__(self):
+        self.scores = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def zadd(self, key, mapping):
+        self.scores.update(mapping)
+
+    async def zremrangebyscore(self, key, low, high):
+        expired = [member for member, score in self.scores.items() if low <= score <= high]
+        for member in expired:
+            del self.scores[member]
+        return len(expired)
+
+    async def zrange(self, key, start, end):
+        ranked = sorted(self.scores, key=self.scores.get)
+        return ranked[start:end + 1 if end != -1 else None]
+
+    async def zrem(self, key, *members):
+        for member in members:
+            self.scores.pop(member, None)
+
+    async def expire(self, key, seconds):
+        pass
+
+    async def zcard(self, key):
+        return len(self.scores)
+
+@pytest.fixture
+def memory_cache(monkeypatch):
+    values = {}
+
+    async def fake_get(key):
+        return values.get(key)
+
+    async def fake_set(key, value, expire=None, tags=None):
+        values[key] = value
+
+    monkeypatch.setattr(query_cache, "redis", FakeRedis())
+    monkeypatch.setattr(query_cache, "get_cache", fake_get)
+    monkeypatch.setattr(query_cache, "set_cache", fake_set)
+    monkeypatch.setattr(query_cache, "_stats", query_cache.defaultdict(lambda: {"hits": 0, "misses": 0}))
+    return values
+
+def test_normalize_query_ignores_case_stopwords_and_number_formats():
+    """Test that trivially different queries share a normalized form"""
+    assert normalize_query("Show me  DOD contracts over $10,000,000") == "dod over 10000000"
+    assert normalize_query("dod awards over 10 million") == "dod over 10000000"
+    assert normalize_query("DOD Contracts over 10M") == "dod over 10000000"
+    assert normalize_query("contracts in VA") != normalize_query("VA contracts")
+
+@pytest.mark.asyncio
+async def test_cached_responses_count_hits(memory_cache):
+    """Test lookups are served after a store and reflected in the hit rate"""
+    assert await query_cache.get_cached_response("search_params", "Lockheed awards") is None
+    await query_cache.set_cache(query_cache._key("search_params", "lockheed"), {"keyword": "Lockheed"})
+
+    assert await query_cache.get_cached_response("search_params", "LOCKHEED contracts") == {"keyword": "Lockheed"}
+    stats = await query_cache.query_cache_stats()
+    assert stats["kinds"]["search_params"] == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+@pytest.mark.asyncio
+async def test_model_errors_are_not_cached(monkeypatch, memory_cache):
+    """Test that failed suggestion calls leave nothing behind to be served later"""
+    def failing_client():
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(smart_search, "get_xai_client", failing_client)
+
+    result = await smart_search.get_search_suggestions("why did spending increase?")
+
+    assert result == {"suggestions": [], "original_query": "why did spending increase?"}
+    assert memory_cache == {}
+
+@pytest.mark.asyncio
+async def test_store_drops_expired_keys_from_the_index(monkeypatch, memory_cache):
+    """Test that index members past the TTL are trimmed on store and not counted as entries"""
+    evicted = []
+
+    async def fake_delete_many(keys):
+        evicted.extend(keys)
+
+    monkeypatch.setattr(query_cache, "delete_many", fake_delete_many)
+    expired_key = query_cache._key("search_params", "old query")
+    query_cache.redis.scores[expired_key] = query_cache.time.time() - query_cache.settings.SMART_SEARCH_CACHE_TTL - 1
+
+    await query_cache.store_response("search_params", "new query", {"keyword": "new"})
+
+    assert list(query_cache.redis.scores) == [query_cache._key("search_params", "new query")]
+    assert (await query_cache.query_cache_stats())["entries"] == 1
+    assert evicted == []
@@ -0,0 +1,64 @@
+from datetime import date
+
+import pytest
+
+from app.services.ai import smart_search
+from app.services.ai.query_parser import max_amount_bucket, min_amount_bucket, parse_query
+
+TODAY = date(2024, 5, 10)
+
+def test_parse_agency_amount_and_window():
+    """Test that a typical structured query needs no model call"""
+    params, confidence = parse_query("DOD contracts over 10 million last 90 days", TODAY)
+
+    assert params == {"agency": "DOD", "min_amount": "10m+", "days": 90, "keyword": ""}
+    assert confidence == 1.0
+
+def test_parse_states_categories_and_sorting():
+    """Test state names and codes, categories and ordering phrases"""
+    params, _ = parse_query("top 10 largest Cybersecurity contracts in Virginia", TODAY)
+    assert params["state"] == "VA"
+    assert params["category"] == "technology"
+    assert (params["sort_by"], params["sort_order"]) == ("amount", "desc")
+    assert params["keyword"] == "Cybersecurity"
+
+    params, _ = parse_query("VA hospital awards in tx this year", TODAY)
+    assert params["agency"] == "VA"
+    assert params["state"] == "TX"
+    assert params["days"] == 131
+
+def test_parse_amount_ranges():
+    """Test that amounts map onto the schema buckets"""
+    params, _ = parse_query("NASA research between $5m and $50 million", TODAY)
+
+    assert params["min_amount"] == "1m+"
+    assert params["max_amount"] == "100m"
+    assert min_amount_bucket(2.5e9) == "1b+"
+    assert min_amount_bucket(500000) == "all"
+    assert max_amount_bucket(5e6) == "10m"
+
+def test_unparsed_constraints_lower_confidence():
+    """Test that queries the rules cannot express are left to the model"""
+    _, negated = parse_query("contracts not awarded to Lockheed before 2020", TODAY)
+    _, question = parse_query("why did spending increase?", TODAY)
+
+    assert negated < 0.8
+    assert question < 0.8
+
+@pytest.mark.asyncio
+async def test_confident_parse_skips_the_model(monkeypatch):
+    """Test that process_search_query only calls the model for low-confidence parses"""
+    calls = []
+
+    def fake_client():
+        calls.append(True)
+        raise RuntimeError("model unavailable")
+
+    monkeypatch.setattr(smart_search, "get_xai_client", fake_client)
+
+    assert (await smart_search.process_search_query("Boeing contracts in the last year"))["keyword"] == "Boeing"
+    assert calls == []
+
+    fallback = await smart_search.process_search_query("contracts not awarded to Lockheed before 2020")
+    assert calls == [True]
+    assert fallback["keyword"] == "Lockheed"
@@ -0,0 +1,100 @@
+from datetime import date
+
+import pytest
+
+from app.services.search import result_cache
+
+ROWS = [
+    {"Award ID": "A1", "Award Amount": 5000000, "Start Date": "2024-03-01", "End Date": "2025-03-01",
+     "Awarding Agency": "Department of Defense"},
+    {"Award ID": "A2", "Award Amount": 2000000, "Start Date": "2024-06-01", "End Date": "2024-07-01",
+     "Awarding Agency": "Department of Energy"},
+    {"Award ID": "A3", "Award Amount": 500000, "Start Date": "2023-01-01", "End Date": "2023-06-01",
+     "Awarding Agency": "Department of Defense"},
+]
+
+@pytest.fixture
+def store(monkeypatch):
+    values = {}
+
+    async def fake_get(key):
+        return values.get(key)
+
+    async def fake_set(key, value, expire=None, tags=None):
+        values[key] = value
+
+    monkeypatch.setattr(result_cache, "get_cache", fake_get)
+    monkeypatch.setattr(result_cache, "set_cache", fake_set)
+    return values
+
+def counting_fetch(rows):
+    calls = []
+
+    async def fetch(limit):
+        calls.append(limit)
+        return {"results": rows[:limit], "page_metadata": {"hasNext": False}}
+    return fetch, calls
+
+async def search(fetch, **filters):
+    options = {
+        "keyword": "radar",
+        "award_types": ["A", "B"],
+        "start_date": date(2023, 1, 1),
+        "end_date": date(2024, 12, 31),
+        "limit": 10,
+    }
+    options.update(filters)
+    return await result_cache.search_with_subsumption(fetch, **options)
+
+@pytest.mark.asyncio
+async def test_narrower_filters_are_answered_locally(store):
+    """Test that a higher minimum, shorter window or one agency reuse a complete result"""
+    fetch, calls = counting_fetch(ROWS)
+    first = await search(fetch)
+    assert first["source"] == "upstream"
+    assert calls == [result_cache.FETCH_LIMIT]
+
+    by_amount = await search(fetch, min_amount=1000000)
+    by_window = await search(fetch, start_date=date(2024, 1, 1))
+    by_agency = await search(fetch, agency="department of defense", award_types=["B", "A"])
+
+    assert len(calls) == 1
+    assert by_amount["source"] == "upstream_cache"
+    assert [row["Award ID"] for row in by_amount["results"]] == ["A1", "A2"]
+    assert [row["Award ID"] for row in by_window["results"]] == ["A1", "A2"]
+    assert [row["Award ID"] for row in by_agency["results"]] == ["A1", "A3"]
+
+@pytest.mark.asyncio
+async def test_wider_filters_go_upstream(store):
+    """Test that a search outside every cached result is a true miss"""
+    fetch, calls = counting_fetch(ROWS)
+    await search(fetch, min_amount=1000000, agency="Department of Defense")
+
+    await search(fetch, min_amount=0, agency="Department of Defense")
+    await search(fetch, min_amount=1000000)
+
+    assert len(calls) == 3
+
+@pytest.mark.asyncio
+async def test_incomplete_results_only_answer_the_same_filters(store):
+    """Test that a truncated result is not filtered for narrower searches"""
+    async def fetch(limit):
+        return {"results": ROWS, "page_metadata": {"hasNext": True}}
+
+    await search(fetch, limit=2)
+
+    assert result_cache.answer_from_entries(
+        next(iter(store.values())), "2023-01-01", "2024-12-31", 0, None, 2
+    ) == ROWS[:2]
+    assert result_cache.answer_from_entries(
+        next(iter(store.values())), "2023-01-01", "2024-12-31", 1000000, None, 2
+    ) is None
+
+@pytest.mark.asyncio
+async def test_upstream_errors_are_not_stored(store):
+    """Test that failed searches leave the result cache untouched"""
+    async def fetch(limit):
+        return {"results": [], "error": "API Error (500)"}
+
+    assert (await search(fetch))["error"] == "API Error (500)"
+    assert store == {}
@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+
+from app.services.ai import smart_search
+
+@pytest.mark.asyncio
+async def test_slow_model_falls_back_to_local_parse(monkeypatch):
+    """Test that a model call overrunning its budget does not hold up the search"""
+    finished = asyncio.Event()
+
+    async def slow_model(query):
+        await asyncio.sleep(0.05)
+        finished.set()
+        return {"keyword": "from the model"}
+
+    monkeypatch.setattr(smart_search, "process_search_query", slow_model)
+
+    params = await smart_search.process_search_query_within("DOD contracts over 10 million", 0.01)
+
+    assert params == {"agency": "DOD", "min_amount": "10m+", "keyword": ""}
+    # The overrunning call keeps going so its answer can be cached
+    await asyncio.wait_for(finished.wait(), 1)
+
+@pytest.mark.asyncio
+async def test_result_within_returns_finished_results():
+    """Test that results arriving in time are returned and late ones are not awaited"""
+    async def value(delay):
+        await asyncio.sleep(delay)
+        return {"suggestions": []}
+
+    assert await smart_search.result_within(asyncio.create_task(value(0)), 0.5) == {"suggestions": []}
+    late = asyncio.create_task(value(0.05))
+    assert await smart_search.result_within(late, 0.01) is None
+    assert late in smart_search._overrun
+    await late